@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Measure how the anytime search trades path cost for expansions: for each expansion
+budget, the share of random queries answered within it, and the mean path cost and
+suboptimality bound relative to the optimal cost found by A*.
+
+Usage:
+    python benchmarks/bench_anytime.py [--sizes 40 160] [--budgets 10 25 50 100 200] [--fastest]
+"""
+
+import argparse
+import random
+
+from shapely.geometry import Point
+
+from pathfind.path_strategy import FastestPathStrategy, ShortestPathStrategy
+from pathfind.pathfinder import Pathfinder
+from utils.graph_factory import build_obstacle_graph, link_endpoints
+from utils.scene_generator import generate_scene
+
+
+def path_cost(strategy, path, mass, max_acceleration):
+    return sum(strategy.calculate_travel_cost(a, b, mass, max_acceleration)
+               for a, b in zip(path, path[1:]))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the anytime search under expansion budgets')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[40, 160],
+                        help='Obstacle counts to benchmark')
+    parser.add_argument('--budgets', type=int, nargs='+', default=[10, 25, 50, 100, 200],
+                        help='Expansion budgets of the anytime search')
+    parser.add_argument('--queries', type=int, default=20,
+                        help='Number of random queries per scene')
+    parser.add_argument('--fastest', action='store_true',
+                        help='Flag to search fastest paths rather than shortest paths')
+    args = parser.parse_args()
+
+    strategy = FastestPathStrategy() if args.fastest else ShortestPathStrategy()
+    mass, max_acceleration = 1.0, 12.0
+    pathfinder = Pathfinder(strategy, 'astar')
+    print(f"{'obstacles':>9} {'astar nodes':>11} " +
+          " ".join(f"{f'{budget} answered cost bound':>26}" for budget in args.budgets))
+    for size in args.sizes:
+        _, _, obstacles = generate_scene(size, 6, concave_fraction=0.25)
+        base = build_obstacle_graph(obstacles, 100, 100, 'vectorized')
+        rng = random.Random(size)
+        queries = []
+        while len(queries) < args.queries:
+            start, goal = (rng.uniform(0, 100), rng.uniform(0, 100)), (rng.uniform(0, 100), rng.uniform(0, 100))
+            if not any(obstacle.intersects(Point(point)) for obstacle in obstacles
+                       for point in (start, goal)):
+                queries.append((start, goal))
+        graphs = [link_endpoints(base, query, obstacles) for query in queries]
+
+        optimal_costs = []
+        nodes = 0
+        for (start, goal), graph in zip(queries, graphs):
+            optimal_costs.append(path_cost(
+                strategy, pathfinder.find_path(graph, start, goal, mass, max_acceleration),
+                mass, max_acceleration))
+            nodes += pathfinder.nodes_expanded
+
+        columns = []
+        for budget in args.budgets:
+            ratios = []
+            bounds = []
+            for (start, goal), graph, optimal_cost in zip(queries, graphs, optimal_costs):
+                try:
+                    path, bound = pathfinder.find_path_anytime(
+                        graph, start, goal, mass, max_acceleration, expansion_budget=budget)
+                except Exception:
+                    continue
+                ratios.append(path_cost(strategy, path, mass, max_acceleration) / optimal_cost)
+                bounds.append(bound)
+            if not ratios:
+                columns.append(f"{0:>7.0%} {'':>18}")
+                continue
+            columns.append(f"{len(ratios) / len(queries):>7.0%} {sum(ratios) / len(ratios):>8.3f}x "
+                           f"{sum(bounds) / len(bounds):>8.3f}x")
+        print(f"{size:>9} {nodes / len(queries):>11.1f} " + " ".join(f"{column:>26}" for column in columns))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Compare the planning engines on generated scenes of growing size: the visibility graph
+engine, which builds the exact graph once and searches it, the grid engine at several
+resolutions, which rasterizes the obstacles and runs Lazy Theta* on the cells, and the
+tiled engine at several tile sizes, which builds the graphs of the tiles a query
+crosses. Each grid column shows the setup time, the query time and the path cost
+relative to the optimal cost of the visibility graph; each tiled column the time of
+the first query, building the tiles, the time of a second query on the built tiles
+and the path cost.
+
+Usage:
+    python benchmarks/bench_engines.py [--sizes 10 40 160] [--resolutions 2 1 0.5]
+        [--tile-sizes 50 25 12.5] [--fastest]
+"""
+
+import argparse
+import time
+
+from common import best_time
+from pathfind.grid_planner import GridPlanner
+from pathfind.path_strategy import FastestPathStrategy, ShortestPathStrategy
+from pathfind.pathfinder import Pathfinder
+from pathfind.tiled_planner import TiledPlanner
+from utils.graph_factory import build_graph
+from utils.occupancy_grid import rasterize_obstacles
+from utils.scene_generator import generate_scene
+from utils.tile_map import TileMap
+
+
+def path_cost(strategy, path, mass, max_acceleration):
+    return sum(strategy.calculate_travel_cost(a, b, mass, max_acceleration)
+               for a, b in zip(path, path[1:]))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the visibility graph, grid and tiled planning engines')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 40, 160],
+                        help='Obstacle counts to benchmark')
+    parser.add_argument('--resolutions', type=float, nargs='+', default=[2.0, 1.0, 0.5],
+                        help='Cell sizes of the occupancy grids')
+    parser.add_argument('--tile-sizes', type=float, nargs='+', default=[50.0, 25.0, 12.5],
+                        help='Tile sizes of the tiled engine')
+    parser.add_argument('--builder', default='vectorized',
+                        help='Visibility graph builder')
+    parser.add_argument('--fastest', action='store_true',
+                        help='Flag to compare fastest paths rather than shortest paths')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of timed runs per measurement')
+    args = parser.parse_args()
+
+    strategy = FastestPathStrategy() if args.fastest else ShortestPathStrategy()
+    mass, max_acceleration = 1.0, 12.0
+    print(f"{'obstacles':>9} {'visibility build+search':>24} " +
+          " ".join(f"{f'grid {resolution:g} build+search cost':>32}"
+                   for resolution in args.resolutions) + " " +
+          " ".join(f"{f'tiled {tile_size:g} first+next cost':>32}"
+                   for tile_size in args.tile_sizes))
+    for size in args.sizes:
+        start, goal, obstacles = generate_scene(size, 6, concave_fraction=0.25)
+        start, goal = tuple(start), tuple(goal)
+        build_seconds, graph = best_time(
+            build_graph, start, goal, obstacles, 100, 100, args.builder, repeat=args.repeat)
+        pathfinder = Pathfinder(strategy, 'astar')
+        search_seconds, path = best_time(
+            pathfinder.find_path, graph, start, goal, mass, max_acceleration, repeat=args.repeat)
+        optimal_cost = path_cost(strategy, path, mass, max_acceleration)
+        columns = [f"{build_seconds:>10.4f}s + {search_seconds:>10.4f}s"]
+
+        for resolution in args.resolutions:
+            raster_seconds, grid = best_time(
+                rasterize_obstacles, obstacles, 100, 100, resolution, repeat=args.repeat)
+            planner = GridPlanner(strategy)
+            try:
+                search_seconds, path = best_time(
+                    planner.find_path, grid, start, goal, mass, max_acceleration,
+                    repeat=args.repeat)
+            except Exception:
+                columns.append(f"{raster_seconds:>8.4f}s + {'no path':>9} {'':>7}")
+                continue
+            ratio = path_cost(strategy, path, mass, max_acceleration) / optimal_cost
+            columns.append(f"{raster_seconds:>8.4f}s + {search_seconds:>8.4f}s {ratio:>6.3f}x")
+
+        for tile_size in args.tile_sizes:
+            tile_map = TileMap(obstacles, 100, 100, tile_size)
+            planner = TiledPlanner(Pathfinder(strategy, 'astar'))
+            # The first query builds the tiles it crosses, so it is timed once
+            first_seconds = time.perf_counter()
+            try:
+                path = planner.find_path(tile_map, start, goal, mass, max_acceleration)
+            except Exception:
+                columns.append(f"{'no path':>9} {'':>20}")
+                continue
+            first_seconds = time.perf_counter() - first_seconds
+            search_seconds, path = best_time(
+                planner.find_path, tile_map, start, goal, mass, max_acceleration,
+                repeat=args.repeat)
+            ratio = path_cost(strategy, path, mass, max_acceleration) / optimal_cost
+            columns.append(f"{first_seconds:>8.4f}s + {search_seconds:>8.4f}s {ratio:>6.3f}x")
+        print(f"{size:>9} " + " ".join(f"{column:>32}" for column in columns))
+
+
+if __name__ == '__main__':
+    main()
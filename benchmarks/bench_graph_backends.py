@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Compare the networkx graph with the compact CSR graph searched by `Pathfinder` on random
+scenes of growing size: memory held by the graph and search time.
+
+The networkx search is the dictionary based Dijkstra loop that `Pathfinder` ran before
+the compact graph, kept here as the reference.
+
+Usage:
+    python benchmarks/bench_graph_backends.py [--sizes 20 80 200]
+"""
+
+import argparse
+import tracemalloc
+from heapq import heappop, heappush
+
+from common import best_time
+from pathfind.path_strategy import FastestPathStrategy
+from pathfind.pathfinder import Pathfinder
+from utils.graph_factory import build_graph
+from utils.scene_generator import generate_scene
+
+
+def measure_memory(function, *args):
+    """
+    Measure the memory still allocated by the result of a function call.
+
+    Parameters:
+    - function (callable): The function to call.
+    - args: The positional arguments passed to the function.
+
+    Returns:
+    - tuple: The allocated size in bytes and the result.
+    """
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    result = function(*args)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return after - before, result
+
+
+def networkx_search(graph, start, goal, strategy, mass, max_acceleration):
+    """
+    Run Dijkstra on a networkx graph, reading the travel costs from edge attributes.
+    """
+    adjacency = graph.adj
+    pq = [(0, start)]
+    costs = {start: 0}
+    came_from = {}
+    expanded = set()
+    while pq:
+        current_cost, current_node = heappop(pq)
+        if current_node in expanded:
+            continue
+        expanded.add(current_node)
+        if current_node == goal:
+            return current_cost
+        for neighbor, edge in adjacency[current_node].items():
+            estimated_cost = current_cost + edge[strategy.cost_attribute]
+            if neighbor not in costs or estimated_cost < costs[neighbor]:
+                came_from[neighbor] = current_node
+                costs[neighbor] = estimated_cost
+                heappush(pq, (estimated_cost, neighbor))
+    raise Exception("No valid path found")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the networkx and compact graph backends')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 80, 200],
+                        help='Obstacle counts to benchmark')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of timed runs per measurement')
+    args = parser.parse_args()
+
+    strategy = FastestPathStrategy()
+    print(f"{'obstacles':>9} {'edges':>7} {'networkx MB':>12} {'compact MB':>11} "
+          f"{'networkx search':>16} {'compact search':>15}")
+    for size in args.sizes:
+        start, goal, obstacles = generate_scene(size)
+        start, goal = tuple(start), tuple(goal)
+        # Warm up the imports so that they do not count as graph memory
+        build_graph(start, goal, obstacles, 100, 100, 'vectorized').to_networkx()
+        compact_bytes, compact = measure_memory(
+            build_graph, start, goal, obstacles, 100, 100, 'vectorized')
+        networkx_bytes, graph = measure_memory(compact.to_networkx)
+
+        costs = strategy.calculate_travel_costs(
+            [weight for _, _, weight in graph.edges(data='weight')], 1.0, 1.0)
+        for (_, _, data), cost in zip(graph.edges(data=True), costs.tolist()):
+            data[strategy.cost_attribute] = cost
+        networkx_seconds, _ = best_time(networkx_search, graph, start, goal, strategy,
+                                        1.0, 1.0, repeat=args.repeat)
+        pathfinder = Pathfinder(strategy)
+        pathfinder.find_path(compact, start, goal, 1.0, 1.0)
+        compact_seconds, _ = best_time(pathfinder.find_path, compact, start, goal,
+                                       1.0, 1.0, repeat=args.repeat)
+
+        print(f"{size:>9} {compact.number_of_edges():>7} {networkx_bytes / 2**20:>12.2f} "
+              f"{compact_bytes / 2**20:>11.2f} {networkx_seconds:>15.4f}s {compact_seconds:>14.4f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""
+Compare the visibility graph builders of `utils.graph_factory` on random scenes of
+growing size, and the vectorized builder with several threads.
+
+Usage:
+    python benchmarks/bench_graph_builders.py [--sizes 5 10 20 40] [--builders ...] [--threads 2 4]
+"""
+
+import argparse
+
+from common import best_time
+from utils.graph_factory import GRAPH_BUILDERS, build_graph, collect_nodes
+from utils.scene_generator import generate_scene
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the visibility graph builders')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5, 10, 20, 40, 80],
+                        help='Obstacle counts to benchmark')
+    parser.add_argument('--builders', nargs='+', default=list(GRAPH_BUILDERS),
+                        choices=list(GRAPH_BUILDERS), help='Builders to compare')
+    parser.add_argument('--threads', type=int, nargs='*', default=[],
+                        help='Thread counts to benchmark the vectorized builder with, timing the compact graph '
+                             'without the networkx export of the builder columns')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of timed runs per measurement')
+    args = parser.parse_args()
+
+    baseline = args.builders[0]
+    columns = args.builders + [f'{threads} threads' for threads in args.threads]
+    print(f"{'obstacles':>9} {'nodes':>6} {'edges':>7} " +
+          " ".join(f"{name:>12}" for name in columns) + f"  speedup vs {baseline}")
+    for size in args.sizes:
+        start, goal, obstacles = generate_scene(size)
+        nodes = collect_nodes(start, goal, obstacles, 100, 100)
+        timings = {}
+        edge_count = None
+        for name in args.builders:
+            timings[name], graph = best_time(
+                GRAPH_BUILDERS[name], start, goal, obstacles, 100, 100, repeat=args.repeat)
+            edge_count = graph.number_of_edges()
+        for threads in args.threads:
+            timings[f'{threads} threads'], _ = best_time(
+                build_graph, start, goal, obstacles, 100, 100, 'vectorized', False, threads,
+                repeat=args.repeat)
+        speedups = " ".join(f"{name}={timings[baseline] / timings[name]:.1f}x"
+                            for name in columns[1:])
+        print(f"{size:>9} {len(nodes):>6} {edge_count:>7} " +
+              " ".join(f"{timings[name]:>11.4f}s" for name in columns) + f"  {speedups}")
+
+
+if __name__ == '__main__':
+    main()
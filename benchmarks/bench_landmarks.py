@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Measure the preprocessing time of the landmark (ALT) index and compare the per-query
+latency and settled nodes of ALT with Dijkstra and A*, on random scenes of growing size
+and random queries linked into the obstacle graph.
+
+Usage:
+    python benchmarks/bench_landmarks.py [--sizes 20 80 200] [--queries 50]
+"""
+
+import argparse
+import random
+import time
+
+from shapely.geometry import Point
+
+from common import best_time
+from pathfind.path_strategy import FastestPathStrategy, ShortestPathStrategy
+from pathfind.pathfinder import Pathfinder
+from utils.graph_factory import build_obstacle_graph, link_endpoints
+from utils.scene_generator import generate_scene
+
+ALGORITHMS = ('dijkstra', 'astar', 'alt')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the landmark index')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 80, 200],
+                        help='Obstacle counts to benchmark')
+    parser.add_argument('--queries', type=int, default=50,
+                        help='Number of random queries per scene')
+    parser.add_argument('--landmarks', type=int, default=8,
+                        help='Number of landmarks')
+    args = parser.parse_args()
+
+    print(f"{'obstacles':>9} {'edges':>7} {'strategy':>9} {'preprocess':>10} " +
+          " ".join(f"{name + ' query':>14} {name + ' nodes':>14}" for name in ALGORITHMS))
+    for size in args.sizes:
+        _, _, obstacles = generate_scene(size)
+        base = build_obstacle_graph(obstacles, 100, 100, 'vectorized')
+        rng = random.Random(size)
+        queries = []
+        while len(queries) < args.queries:
+            start, goal = (rng.uniform(0, 100), rng.uniform(0, 100)), (rng.uniform(0, 100), rng.uniform(0, 100))
+            if not any(obstacle.intersects(Point(point)) for obstacle in obstacles
+                       for point in (start, goal)):
+                queries.append((start, goal))
+        graphs = [link_endpoints(base, query, obstacles) for query in queries]
+
+        for strategy in (ShortestPathStrategy(), FastestPathStrategy()):
+            columns = []
+            preprocess_seconds = 0.0
+            for algorithm in ALGORITHMS:
+                pathfinder = Pathfinder(strategy, algorithm)
+                if algorithm == 'alt':
+                    preprocess_seconds, _ = best_time(pathfinder.prepare_landmarks, base, 1.0, 1.0,
+                                                      args.landmarks, repeat=1)
+                query_seconds = 0.0
+                nodes = 0
+                for (start, goal), graph in zip(queries, graphs):
+                    strategy.prepare_graph(graph, 1.0, 1.0)
+                    started = time.perf_counter()
+                    pathfinder.find_path(graph, start, goal, 1.0, 1.0)
+                    query_seconds += time.perf_counter() - started
+                    nodes += pathfinder.nodes_expanded
+                columns.append(f"{query_seconds / len(queries) * 1e3:>12.3f}ms "
+                               f"{nodes / len(queries):>14.1f}")
+            name = type(strategy).__name__.removesuffix('PathStrategy')
+            print(f"{size:>9} {base.number_of_edges():>7} {name:>9} {preprocess_seconds:>9.3f}s " +
+                  " ".join(columns))
+
+
+if __name__ == '__main__':
+    main()
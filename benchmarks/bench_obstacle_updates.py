@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+"""
+Compare the cost of adding and removing one obstacle by updating the obstacle graph
+with the cost of rebuilding it, on random scenes of growing size.
+
+Usage:
+    python benchmarks/bench_obstacle_updates.py [--sizes 20 80 200]
+"""
+
+import argparse
+
+from common import best_time
+from utils.graph_factory import add_obstacle_to_graph, build_obstacle_graph, remove_obstacle_from_graph
+from utils.scene_generator import generate_scene
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark incremental obstacle updates')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 80, 200],
+                        help='Obstacle counts to benchmark')
+    parser.add_argument('--builder', default='sweep',
+                        help='Graph builder used for the rebuilds')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of timed runs per measurement')
+    args = parser.parse_args()
+
+    print(f"{'obstacles':>9} {'edges':>7} {'rebuild':>9} {'add':>9} {'remove':>9}")
+    for size in args.sizes:
+        _, _, obstacles = generate_scene(size)
+        graph = build_obstacle_graph(obstacles[:-1], 100, 100, args.builder)
+        rebuild_seconds, full_graph = best_time(
+            build_obstacle_graph, obstacles, 100, 100, args.builder, repeat=args.repeat)
+        add_seconds, _ = best_time(add_obstacle_to_graph, graph, obstacles[-1], obstacles,
+                                   100, 100, repeat=args.repeat)
+        remove_seconds, _ = best_time(remove_obstacle_from_graph, full_graph, obstacles[-1],
+                                      obstacles[:-1], 100, 100, repeat=args.repeat)
+        print(f"{size:>9} {full_graph.number_of_edges():>7} {rebuild_seconds:>8.3f}s "
+              f"{add_seconds:>8.3f}s {remove_seconds:>8.3f}s")
+
+
+if __name__ == '__main__':
+    main()
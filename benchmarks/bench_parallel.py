@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+"""
+Measure how batch queries against one random scene scale with the number of worker
+processes, and compare with the serial batch.
+
+Usage:
+    python benchmarks/bench_parallel.py [--obstacles 100] [--queries 2000] [--workers 1 2 4 8]
+"""
+
+import argparse
+import io
+import os
+import random
+import time
+from types import SimpleNamespace
+
+from pathfind.batch import run_batch
+from pathfind.obstacle_course import ObstacleCourse
+from utils.scene_generator import generate_scene
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark parallel batch queries')
+    parser.add_argument('--obstacles', type=int, default=100,
+                        help='Number of obstacles of the scene')
+    parser.add_argument('--queries', type=int, default=2000,
+                        help='Number of random queries')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+                        help='Worker counts to benchmark')
+    args = parser.parse_args()
+
+    start, goal, obstacles = generate_scene(args.obstacles)
+    config = SimpleNamespace(
+        start=start, goal=goal, x_space_size=100, y_space_size=100, mass=None,
+        max_acceleration=None, obstacles=[polygon.exterior.coords[:-1] for polygon in obstacles],
+        graph_builder='sweep', reduced_graph=True, search_algorithm='astar', cache_dir=None,
+        validation='full', threads=1, engine='visibility', grid_resolution=1.0, tile_size=25.0,
+        max_tiles=None, time_budget=None, expansion_budget=None)
+    rng = random.Random(0)
+    queries = [([rng.uniform(0, 100), rng.uniform(0, 100)], [rng.uniform(0, 100), rng.uniform(0, 100)])
+               for _ in range(args.queries)]
+
+    print(f"{'workers':>7} {'seconds':>8} {'queries/s':>10} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        obstacle_course = ObstacleCourse(config)
+        obstacle_course.get_obstacle_graph()
+        started = time.perf_counter()
+        run_batch(obstacle_course, queries, io.StringIO(), workers)
+        seconds = time.perf_counter() - started
+        baseline = baseline or seconds
+        print(f"{workers:>7} {seconds:>8.2f} {args.queries / seconds:>10.1f} "
+              f"{baseline / seconds:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
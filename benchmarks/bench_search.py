@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""
+Compare the search algorithms of `Pathfinder` on random scenes of growing size, and on
+the scenes of configuration files, for both path strategies: nodes expanded (settled)
+and search time.
+
+Usage:
+    python benchmarks/bench_search.py [--sizes 20 80 200] [--configs example/config.yaml]
+"""
+
+import argparse
+
+from shapely.geometry import Polygon
+
+from common import best_time
+from pathfind.configuration import Configuration
+from pathfind.path_strategy import FastestPathStrategy, ShortestPathStrategy
+from pathfind.pathfinder import SEARCH_ALGORITHMS, Pathfinder
+from utils.graph_factory import build_graph
+from utils.scene_generator import generate_scene
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the search algorithms')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20, 80, 200],
+                        help='Obstacle counts to benchmark')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of timed runs per measurement')
+    parser.add_argument('--configs', nargs='*', default=[],
+                        help='Configuration files whose scenes to benchmark too')
+    args = parser.parse_args()
+
+    print(f"{'scene':>20} {'edges':>7} {'strategy':>9} " +
+          " ".join(f"{name + ' nodes':>28} {name + ' time':>28}" for name in SEARCH_ALGORITHMS))
+    scenes = [(f'{size} obstacles', *generate_scene(size), 100, 100) for size in args.sizes]
+    for config_path in args.configs:
+        config = Configuration(config_path)
+        scenes.append((config_path, config.start, config.goal,
+                       [Polygon(obstacle) for obstacle in config.obstacles],
+                       config.x_space_size, config.y_space_size))
+
+    for scene, start, goal, obstacles, x_space_size, y_space_size in scenes:
+        graph = build_graph(start, goal, obstacles, x_space_size, y_space_size, 'vectorized')
+        for strategy in (ShortestPathStrategy(), FastestPathStrategy()):
+            columns = []
+            for algorithm in SEARCH_ALGORITHMS:
+                pathfinder = Pathfinder(strategy, algorithm)
+                seconds, _ = best_time(pathfinder.find_path, graph, tuple(start), tuple(goal),
+                                       1.0, 1.0, repeat=args.repeat)
+                columns.append(
+                    f"{pathfinder.nodes_expanded:>28} {seconds:>27.4f}s")
+            name = type(strategy).__name__.removesuffix('PathStrategy')
+            print(f"{scene[-20:]:>20} {graph.number_of_edges():>7} {name:>9} " + " ".join(columns))
+
+
+if __name__ == '__main__':
+    main()
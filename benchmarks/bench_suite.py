@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+"""
+Time the graph construction, the search with both path strategies, the obstacle
+validation and the end-to-end command over a ladder of generated scenes, and store the
+results as JSON, so that runs can be compared across commits.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 10 40 160] [--output results.json]
+    python benchmarks/bench_suite.py --compare previous.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import best_time
+from pathfind.path_strategy import FastestPathStrategy, ShortestPathStrategy
+from pathfind.pathfinder import Pathfinder
+from utils.graph_factory import GRAPH_BUILDERS, build_graph
+from utils.scene_generator import generate_scene, write_scene_config
+from utils.validation import check_for_overlaps_and_exceeding_bounds, validate_obstacles
+
+MAIN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'pathfind', 'main.py')
+
+
+def validate(obstacles, space_size):
+    validate_obstacles(obstacles)
+    check_for_overlaps_and_exceeding_bounds(obstacles, space_size, space_size)
+
+
+def run_cli(config_path, output_path):
+    """
+    Run the command line on a scene, without the graph cache.
+    """
+    subprocess.run([sys.executable, MAIN_PATH, config_path, output_path, '--no-cache'],
+                   check=True)
+
+
+def current_commit():
+    """
+    Return the commit of the working tree, or None outside a git checkout.
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(MAIN_PATH)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark_scene(size, args, directory):
+    """
+    Time every measurement of the suite on one generated scene.
+
+    Returns:
+    - dict: The scene size, its graph size and the best time of each measurement in seconds.
+    """
+    start, goal, obstacles = generate_scene(size, args.vertices, args.space_size, args.seed,
+                                            args.concave_fraction)
+    seconds = {}
+    seconds['create_graph'], _ = best_time(
+        GRAPH_BUILDERS[args.builder], start, goal, obstacles, args.space_size, args.space_size,
+        repeat=args.repeat)
+    graph = build_graph(start, goal, obstacles, args.space_size, args.space_size, args.builder)
+    for name, strategy in (('shortest', ShortestPathStrategy()), ('fastest', FastestPathStrategy())):
+        pathfinder = Pathfinder(strategy, args.search)
+        seconds[f'find_path_{name}'], _ = best_time(
+            pathfinder.find_path, graph, tuple(start), tuple(goal), 1.0, 12.0, repeat=args.repeat)
+    seconds['validation'], _ = best_time(validate, obstacles, args.space_size, repeat=args.repeat)
+
+    config_path = os.path.join(directory, f'scene-{size}.yaml')
+    write_scene_config(config_path, start, goal, obstacles, args.space_size,
+                       graph_builder=args.builder, search_algorithm=args.search)
+    seconds['cli'], _ = best_time(run_cli, config_path, os.path.join(directory, 'solution.txt'),
+                                  repeat=args.repeat)
+    return {
+        'obstacles': size,
+        'vertices': sum(len(obstacle.exterior.coords) - 1 for obstacle in obstacles),
+        'nodes': graph.number_of_nodes(),
+        'edges': graph.number_of_edges(),
+        'seconds': {name: round(value, 6) for name, value in seconds.items()},
+    }
+
+
+def compare(results, previous):
+    """
+    Print the ratio of each time to the time of the same measurement in a previous run.
+    """
+    previous_results = {result['obstacles']: result for result in previous['results']}
+    print(f"\ncompared with {previous.get('commit') or 'the previous run'} "
+          "(new time / previous time)")
+    for result in results:
+        before = previous_results.get(result['obstacles'])
+        if before is None:
+            continue
+        ratios = " ".join(f"{name} {seconds / before['seconds'][name]:.2f}x"
+                          for name, seconds in result['seconds'].items()
+                          if before['seconds'].get(name))
+        print(f"{result['obstacles']:>9} {ratios}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run the benchmark suite over a ladder of generated scenes')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 40, 160],
+                        help='Obstacle counts of the scenes')
+    parser.add_argument('--vertices', type=int, default=4,
+                        help='Number of vertices of each obstacle')
+    parser.add_argument('--concave-fraction', type=float, default=0.25,
+                        help='Share of concave obstacles')
+    parser.add_argument('--space-size', type=int, default=100,
+                        help='Width and height of the scenes')
+    parser.add_argument('--builder', choices=list(GRAPH_BUILDERS), default='vectorized',
+                        help='Visibility graph builder')
+    parser.add_argument('--search', default='dijkstra',
+                        help='Search algorithm')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Random seed of the scenes')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of timed runs per measurement')
+    parser.add_argument('--output', default='bench-results.json',
+                        help='JSON file to store the results in')
+    parser.add_argument('--compare',
+                        help='JSON results of a previous run to compare with')
+    args = parser.parse_args()
+
+    print(f"{'obstacles':>9} {'vertices':>8} {'edges':>7} {'create_graph':>12} "
+          f"{'shortest':>9} {'fastest':>9} {'validation':>10} {'cli':>8}")
+    results = []
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            result = benchmark_scene(size, args, directory)
+            results.append(result)
+            seconds = result['seconds']
+            print(f"{size:>9} {result['vertices']:>8} {result['edges']:>7} "
+                  f"{seconds['create_graph']:>11.3f}s {seconds['find_path_shortest']:>8.4f}s "
+                  f"{seconds['find_path_fastest']:>8.4f}s {seconds['validation']:>9.4f}s "
+                  f"{seconds['cli']:>7.3f}s")
+
+    report = {
+        'commit': current_commit(),
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {name: value for name, value in vars(args).items()
+                     if name not in ('output', 'compare')},
+        'duration': round(time.perf_counter() - started, 3),
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nresults written to {args.output}")
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
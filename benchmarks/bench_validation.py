@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""
+Measure the time of the obstacle validation on random scenes of growing size, in each
+validation mode, against the former check of all obstacle pairs.
+
+Usage:
+    python benchmarks/bench_validation.py [--sizes 100 1000 10000]
+"""
+
+import argparse
+
+from common import best_time
+from utils.scene_generator import generate_scene
+from utils.validation import (VALIDATION_MODES, check_for_overlaps_and_exceeding_bounds,
+                              select_obstacles_to_validate, validate_obstacles)
+
+
+def validate(obstacles, mode):
+    indices = select_obstacles_to_validate(len(obstacles), mode)
+    validate_obstacles([obstacles[i] for i in indices.tolist()])
+    check_for_overlaps_and_exceeding_bounds(obstacles, 100, 100, indices)
+
+
+def validate_all_pairs(obstacles):
+    for polygon in obstacles:
+        polygon.is_valid
+    for i in range(len(obstacles)):
+        for j in range(i + 1, len(obstacles)):
+            obstacles[i].intersects(obstacles[j])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the obstacle validation')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000],
+                        help='Obstacle counts to benchmark')
+    parser.add_argument('--pairs-limit', type=int, default=2000,
+                        help='Largest obstacle count timed with the all-pairs check')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of timed runs per measurement')
+    args = parser.parse_args()
+
+    print(f"{'obstacles':>9} {'all pairs':>10} " + " ".join(f"{mode:>9}" for mode in VALIDATION_MODES))
+    for size in args.sizes:
+        _, _, obstacles = generate_scene(size)
+        if size <= args.pairs_limit:
+            pairs_seconds, _ = best_time(validate_all_pairs, obstacles, repeat=args.repeat)
+            columns = [f"{pairs_seconds:>9.3f}s"]
+        else:
+            columns = [f"{'-':>10}"]
+        for mode in VALIDATION_MODES:
+            seconds, _ = best_time(validate, obstacles, mode, repeat=args.repeat)
+            columns.append(f"{seconds:>8.3f}s")
+        print(f"{size:>9} " + " ".join(columns))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+import math
+import time
+
+
+def best_time(function, *args, repeat=3):
+    """
+    Measure the best wall time of several calls of a function.
+
+    Parameters:
+    - function (callable): The function to time.
+    - args: The positional arguments passed to the function.
+    - repeat (int): The number of calls.
+
+    Returns:
+    - tuple: The best time in seconds and the result of the last call.
+    """
+    best = math.inf
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+Load test the path-planning server: send random start and goal queries from concurrent
+keep-alive connections and report the latency percentiles and the throughput. Without
+--url, a local server is started on the given scene and stopped afterwards.
+
+Usage:
+    python benchmarks/run_load.py example/config.yaml [--requests 1000] [--concurrency 8]
+    python benchmarks/run_load.py example/config.yaml --url http://127.0.0.1:8080
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+from shapely.geometry import Point, Polygon
+
+from pathfind.configuration import Configuration
+
+
+async def run_client(host, port, scene, queries, latencies, statuses):
+    """
+    Send queries one at a time over a keep-alive connection, recording each latency.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for start, goal in queries:
+            body = json.dumps({'start': start, 'goal': goal}).encode()
+            started = time.perf_counter()
+            writer.write(f"POST /scenes/{scene}/path HTTP/1.1\r\nHost: {host}\r\n"
+                         f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while (line := await reader.readline()) != b'\r\n':
+                name, _, value = line.decode().partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+            statuses.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, scene, queries, concurrency):
+    """
+    Spread the queries over concurrent clients.
+
+    Returns:
+    - tuple: The latency of each query in seconds, their HTTP statuses and the total time.
+    """
+    latencies = []
+    statuses = []
+    started = time.perf_counter()
+    await asyncio.gather(*(run_client(host, port, scene, queries[client::concurrency],
+                                      latencies, statuses)
+                           for client in range(concurrency)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+def start_local_server(scene_path, workers):
+    """
+    Start a server on a free port and wait for its address.
+
+    Returns:
+    - tuple: The server process, host and port.
+    """
+    main_path = os.path.join(os.path.dirname(__file__), '..', 'src', 'pathfind', 'main.py')
+    process = subprocess.Popen(
+        [sys.executable, main_path, 'serve', scene_path, '--port', '0', '--workers', str(workers)],
+        stdout=subprocess.PIPE, text=True)
+    banner = process.stdout.readline()
+    if not banner:
+        raise RuntimeError('The server failed to start.')
+    address = urlsplit(banner.split()[-1])
+    return process, address.hostname, address.port
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Load test the path-planning server')
+    parser.add_argument('scene', help='YAML configuration file of the scene')
+    parser.add_argument('--url',
+                        help='Address of a running server, serving the scene; a local one is started otherwise')
+    parser.add_argument('--requests', type=int, default=1000,
+                        help='Number of queries')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='Number of concurrent connections')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of worker processes of the local server')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Random seed of the queries')
+    args = parser.parse_args()
+
+    config = Configuration(args.scene)
+    obstacles = [Polygon(obstacle) for obstacle in config.obstacles]
+    rng = random.Random(args.seed)
+    points = []
+    # Sample points outside the obstacles, which have no path
+    while len(points) < 2 * args.requests:
+        point = [rng.uniform(0, config.x_space_size), rng.uniform(0, config.y_space_size)]
+        if not any(obstacle.intersects(Point(point)) for obstacle in obstacles):
+            points.append(point)
+    queries = list(zip(points[::2], points[1::2]))
+    scene = os.path.splitext(os.path.basename(args.scene))[0]
+
+    process = None
+    if args.url is None:
+        process, host, port = start_local_server(args.scene, args.workers)
+    else:
+        address = urlsplit(args.url)
+        host, port = address.hostname, address.port
+    try:
+        # Warm up the scene in the workers before measuring
+        asyncio.run(run_load(host, port, scene, queries[:args.concurrency], args.concurrency))
+        latencies, statuses, seconds = asyncio.run(
+            run_load(host, port, scene, queries, args.concurrency))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    latencies = np.array(latencies) * 1e3
+    answered = statuses.count(200)
+    print(f"requests {len(latencies)}, answered {answered}, failed {len(latencies) - answered}, "
+          f"{len(latencies) / seconds:.0f} requests/s")
+    print(f"latency p50 {np.percentile(latencies, 50):.2f} ms, "
+          f"p90 {np.percentile(latencies, 90):.2f} ms, "
+          f"p99 {np.percentile(latencies, 99):.2f} ms, max {latencies.max():.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
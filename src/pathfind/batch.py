@@ -0,0 +1,126 @@
+import csv
+import json
+import logging
+import os
+
+LOGGER = logging.getLogger('batch')
+
+# Keys of a query, as CSV columns or JSONL object keys
+QUERY_KEYS = ('x_start', 'y_start', 'x_goal', 'y_goal')
+
+
+def read_queries(queries_path):
+    """
+    Read (start, goal) queries from a CSV file with a header row or a JSONL file with
+    one object per line, both using the keys `QUERY_KEYS`. The queries are read lazily,
+    one at a time.
+
+    Parameters:
+    - queries_path (str): The path to the queries file, ending in .csv or .jsonl.
+
+    Yields:
+    - tuple: The start and goal points of each query.
+
+    Raises:
+    - ValueError: If the file type is not supported or a query is malformed.
+    """
+    extension = os.path.splitext(queries_path)[1].lower()
+    if extension == '.csv':
+        with open(queries_path, 'r', newline='') as file:
+            for line_number, row in enumerate(csv.DictReader(file), start=2):
+                yield parse_query(row, queries_path, line_number)
+    elif extension in ('.jsonl', '.ndjson'):
+        with open(queries_path, 'r') as file:
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(
+                        f"Invalid JSON in '{queries_path}' at line {line_number}. {e}")
+                yield parse_query(row, queries_path, line_number)
+    else:
+        raise ValueError(
+            f"Unsupported queries file '{queries_path}'. Use a .csv or .jsonl file.")
+
+
+def parse_query(row, queries_path, line_number):
+    """
+    Parse one query record.
+
+    Parameters:
+    - row (dict): The record, mapping the keys `QUERY_KEYS` to coordinates.
+    - queries_path (str): The path to the queries file, for error messages.
+    - line_number (int): The line of the record, for error messages.
+
+    Returns:
+    - tuple: The start and goal points.
+
+    Raises:
+    - ValueError: If a key is missing or a coordinate is not a number.
+    """
+    try:
+        x_start, y_start, x_goal, y_goal = (float(row[key]) for key in QUERY_KEYS)
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(
+            f"Invalid query in '{queries_path}' at line {line_number}, expected the keys "
+            f"{', '.join(QUERY_KEYS)}. {e}")
+    return [x_start, y_start], [x_goal, y_goal]
+
+
+def run_batch(obstacle_course, queries, output, workers=1):
+    """
+    Answer queries against one obstacle course and write one JSON line per query as
+    soon as it is answered, in query order. A query without a valid path gets an error
+    line instead of stopping the batch.
+
+    Parameters:
+    - obstacle_course (ObstacleCourse): The obstacle course shared by all queries.
+    - queries (iterable): The (start, goal) point pairs.
+    - output (file): The text file receiving the JSON lines.
+    - workers (int): The number of worker processes, see `pathfind.parallel`.
+
+    Returns:
+    - tuple: The numbers of answered and failed queries.
+    """
+    if workers > 1:
+        from pathfind.parallel import answer_queries_in_parallel
+        results = answer_queries_in_parallel(obstacle_course, queries, workers)
+    else:
+        results = (answer_query(obstacle_course, index, start, goal)
+                   for index, (start, goal) in enumerate(queries))
+
+    answered = 0
+    failed = 0
+    for result in results:
+        if 'path' in result:
+            answered += 1
+        else:
+            failed += 1
+        output.write(json.dumps(result) + '\n')
+        output.flush()
+
+    LOGGER.info(f"Answered {answered} queries, {failed} failed.")
+    return answered, failed
+
+
+def answer_query(obstacle_course, index, start, goal):
+    """
+    Answer one query, catching the errors of queries without a valid path.
+
+    Parameters:
+    - obstacle_course (ObstacleCourse): The obstacle course.
+    - index (int): The position of the query in the batch.
+    - start (tuple): The starting point coordinates.
+    - goal (tuple): The goal point coordinates.
+
+    Returns:
+    - dict: The index, start and goal of the query, with either its path or an error.
+    """
+    result = {'index': index, 'start': start, 'goal': goal}
+    try:
+        result['path'] = obstacle_course.find_path_between(start, goal)
+    except Exception as e:
+        result['error'] = str(e)
+    return result
@@ -27,6 +27,25 @@ class Configuration:
         - obstacles (list): A list of obstacles, each defined by a list of points.
         - mass (float): The mass of the robot.
         - max_acceleration (float): The maximum acceleration of the robot.
+        - graph_builder (str): The name of the visibility graph builder to use.
+        - reduced_graph (bool): Whether to build the reduced (tangent-only) visibility graph.
+        - search_algorithm (str): The search algorithm, 'dijkstra', 'astar', 'bidirectional_dijkstra',
+          'bidirectional_astar' or 'alt'.
+        - cache_dir (str): The directory caching the built obstacle graphs, or None to build the
+          graphs without caching them. The `pathfinder` command defaults it to the user cache
+          directory.
+        - validation (str): How many obstacles to validate, 'full', 'sample' or 'skip'.
+        - threads (int): The number of threads building the visibility graph with the
+          vectorized builder.
+        - engine (str): The planning engine, 'visibility' for the exact visibility graph,
+          'grid' for any-angle search on an occupancy grid or 'tiled' for hierarchical
+          search on the visibility graphs of square tiles.
+        - grid_resolution (float): The cell size of the occupancy grid of the grid engine.
+        - tile_size (float): The width and height of the tiles of the tiled engine.
+        - max_tiles (int): The number of tiles the tiled engine keeps built in memory, None
+          for no limit.
+        - time_budget (float): The wall time in seconds a search may take, None for no limit.
+        - expansion_budget (int): The number of nodes a search may expand, None for no limit.
         """
         with open(config_path, 'r') as file:
             config = yaml.safe_load(file)
@@ -41,3 +60,27 @@ class Configuration:
         # Default max acceleration to 1.0 if not specified
         self.max_acceleration = config.get(
             'max_acceleration')
+        # Default to the brute-force graph builder if not specified
+        self.graph_builder = config.get('graph_builder', 'brute_force')
+        # Default to the full visibility graph if not specified
+        self.reduced_graph = config.get('reduced_graph', False)
+        # Default to Dijkstra search if not specified
+        self.search_algorithm = config.get('search_algorithm', 'dijkstra')
+        # Default to no graph cache if not specified, the command line resolving the user cache
+        # directory instead
+        self.cache_dir = config.get('cache_dir')
+        # Default to validating every obstacle if not specified
+        self.validation = config.get('validation', 'full')
+        # Default to building the graph in the calling thread if not specified
+        self.threads = config.get('threads', 1)
+        # Default to planning on the visibility graph if not specified
+        self.engine = config.get('engine', 'visibility')
+        # Default to cells of one unit if not specified
+        self.grid_resolution = config.get('grid_resolution', 1.0)
+        # Default to tiles of 25 units if not specified
+        self.tile_size = config.get('tile_size', 25.0)
+        # Default to keeping every built tile if not specified
+        self.max_tiles = config.get('max_tiles')
+        # Default to searches without a budget if not specified
+        self.time_budget = config.get('time_budget')
+        self.expansion_budget = config.get('expansion_budget')
@@ -0,0 +1,198 @@
+from heapq import heappush, heappop
+
+import numpy as np
+
+from pathfind.path_strategy import PathStrategy
+
+
+class GridPlanner:
+    def __init__(self, pathStrategy: PathStrategy):
+        """
+        Initialize the any-angle grid planner with a specific path strategy.
+
+        The planner runs Lazy Theta* over the cells of an `OccupancyGrid`: A* over the 8
+        neighbours of each cell, where a cell reached from a neighbour takes the parent
+        of that neighbour instead whenever the straight segment from that parent is free.
+        Paths therefore turn at arbitrary cells rather than follow the grid directions.
+        The line of sight to the parent is only checked when a cell is expanded, so
+        there is one check per expanded cell rather than one per neighbour.
+
+        The paths are found on a conservative approximation of the obstacles: cells
+        partly covered by an obstacle are blocked, so paths keep up to one cell away
+        from obstacles, cost a little more than the optimal paths of the visibility
+        graph and may miss passages narrower than two cells.
+
+        Parameters:
+        - pathStrategy (PathStrategy): The strategy for calculating the path.
+        """
+        self.pathStrategy = pathStrategy
+        # Number of cells expanded by the last search
+        self.nodes_expanded = 0
+        # Number of queue entries pushed and popped by the last search, including the
+        # entries superseded by a cheaper one
+        self.nodes_pushed = 0
+        self.nodes_popped = 0
+
+    def find_path(self, grid, start, goal, mass, max_acceleration):
+        """
+        Find the fastest path from start to goal on an occupancy grid considering the
+        robot's mass and maximum acceleration.
+
+        The path starts and ends at the exact start and goal points; the points between
+        are cell centers.
+
+        Parameters:
+        - grid (OccupancyGrid): The rasterized obstacles.
+        - start (tuple): The starting point coordinates.
+        - goal (tuple): The goal point coordinates.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+
+        Returns:
+        - list: The fastest path as a list of points.
+
+        Raises:
+        - Exception: If no valid path is found, including when the start or goal lies
+          in a blocked cell.
+        """
+        source = grid.cell_of(start)
+        target = grid.cell_of(goal)
+        self.nodes_expanded = self.nodes_pushed = self.nodes_popped = 0
+        if not (grid.free[source] and grid.free[target]):
+            raise Exception("No valid path found")
+        if source == target:
+            return [list(map(float, start)), list(map(float, goal))]
+
+        # The points standing for the cells: the exact start and goal for their cells,
+        # the cell center for the others
+        points = grid.points.copy()
+        points[source] = start
+        points[target] = goal
+        parents = self.search(grid, source, target, points, mass, max_acceleration)
+        if parents[target] == -1:
+            raise Exception("No valid path found")
+        return self.reconstruct_path(source, target, parents, points)
+
+    def search(self, grid, source, target, points, mass, max_acceleration):
+        """
+        Run Lazy Theta* from the source cell until the target cell is expanded or no
+        reachable cell is left.
+
+        Parameters:
+        - grid (OccupancyGrid): The rasterized obstacles.
+        - source (int): The cell of the start.
+        - target (int): The cell of the goal.
+        - points (np.ndarray): The (cells, 2) point standing for each cell.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+
+        Returns:
+        - np.ndarray: The parent cell of each reached cell, -1 for the target if it was
+          not reached.
+        """
+        cell_count = len(grid.free)
+        costs = np.full(cell_count, np.inf)
+        parents = np.full(cell_count, -1, dtype=np.intp)
+        expanded = np.zeros(cell_count, dtype=bool)
+        goal = points[target]
+
+        costs[source] = 0
+        parents[source] = source
+        pq = [(float(self.pathStrategy.heuristic(points[source], goal, mass, max_acceleration)),
+               source)]
+        self.nodes_pushed = 1
+        while pq:
+            _, current_cell = heappop(pq)
+            # Skip queue entries superseded by a cheaper one
+            if expanded[current_cell]:
+                continue
+            point = points[current_cell]
+            parent = parents[current_cell]
+            if parent != current_cell and not grid.is_segment_free(points[parent], point):
+                # The assumed line of sight does not hold: come from the cheapest
+                # expanded neighbour instead, which is always in sight
+                neighbors = self.find_neighbors(grid, current_cell)
+                neighbors = neighbors[expanded[neighbors]]
+                neighbor_costs = costs[neighbors] + self.travel_costs(
+                    points[neighbors], point, mass, max_acceleration)
+                best = int(np.argmin(neighbor_costs))
+                parent = parents[current_cell] = neighbors[best]
+                costs[current_cell] = neighbor_costs[best]
+            expanded[current_cell] = True
+            self.nodes_expanded += 1
+            if current_cell == target:
+                break
+
+            # Every neighbour is reached from the parent of the current cell, assuming
+            # the parent is in sight
+            neighbors = self.find_neighbors(grid, current_cell)
+            neighbors = neighbors[~expanded[neighbors]]
+            if len(neighbors) == 0:
+                continue
+            neighbor_points = points[neighbors]
+            estimated_costs = costs[parent] + self.travel_costs(
+                neighbor_points, points[parent], mass, max_acceleration)
+            improved = estimated_costs < costs[neighbors]
+            if not improved.any():
+                continue
+            neighbors = neighbors[improved]
+            estimated_costs = estimated_costs[improved]
+            costs[neighbors] = estimated_costs
+            parents[neighbors] = parent
+            estimated_costs = estimated_costs + self.pathStrategy.heuristics(
+                neighbor_points[improved], goal, mass, max_acceleration)
+            for priority, neighbor in zip(estimated_costs.tolist(), neighbors.tolist()):
+                heappush(pq, (priority, neighbor))
+            self.nodes_pushed += len(neighbors)
+
+        self.nodes_popped = self.nodes_pushed - len(pq)
+        if not expanded[target]:
+            parents[target] = -1
+        return parents
+
+    def find_neighbors(self, grid, cell):
+        """
+        Return the neighbours a cell can move to.
+
+        Parameters:
+        - grid (OccupancyGrid): The rasterized obstacles.
+        - cell (int): The cell.
+
+        Returns:
+        - np.ndarray: The neighbour cells.
+        """
+        return cell + grid.neighbor_offsets[grid.neighbor_mask[cell]]
+
+    def travel_costs(self, points, point, mass, max_acceleration):
+        """
+        Calculate the travel costs of the straight segments from many points to one.
+
+        Parameters:
+        - points (np.ndarray): The (N, 2) first ends of the segments.
+        - point (np.ndarray): The common second end.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+
+        Returns:
+        - np.ndarray: The travel cost of each segment.
+        """
+        distances = np.hypot(points[:, 0] - point[0], points[:, 1] - point[1])
+        return self.pathStrategy.calculate_travel_costs(distances, mass, max_acceleration)
+
+    def reconstruct_path(self, source, target, parents, points):
+        """
+        Reconstruct the path from the source to the target cell using the parent cells.
+
+        Parameters:
+        - source (int): The cell of the start.
+        - target (int): The cell of the goal.
+        - parents (np.ndarray): The parent cell of each reached cell.
+        - points (np.ndarray): The (cells, 2) point standing for each cell.
+
+        Returns:
+        - list: The reconstructed path as a list of points.
+        """
+        cells = [target]
+        while cells[-1] != source:
+            cells.append(int(parents[cells[-1]]))
+        return points[cells[::-1]].tolist()
@@ -0,0 +1,126 @@
+import numpy as np
+
+# Number of landmarks of an index, each costing one array of travel costs per node
+DEFAULT_LANDMARK_COUNT = 8
+
+
+class LandmarkIndex:
+    def __init__(self, graph, distances, cost_key):
+        """
+        Initialize a landmark (ALT) index: the travel costs from a few landmark nodes to
+        every node of a graph, which bound the remaining cost of a search from below by
+        the triangle inequality.
+
+        Parameters:
+        - graph (CompactGraph): The indexed graph, typically the obstacle graph.
+        - distances (np.ndarray): The (L, N) travel costs from each landmark to each node,
+          infinite for unreachable nodes.
+        - cost_key (tuple): The travel costs the distances are measured in, see
+          `PathStrategy.cost_key`.
+        """
+        self.graph = graph
+        self.distances = distances
+        self.cost_key = cost_key
+
+    @classmethod
+    def build(cls, graph, cost_key, find_costs, landmark_count=DEFAULT_LANDMARK_COUNT):
+        """
+        Build a landmark index, picking each landmark as the node farthest from the
+        landmarks already picked. The first landmark is the node farthest from the first
+        node. Nodes unreachable from every landmark so far are picked first, so every
+        connected part of the graph gets a landmark.
+
+        Parameters:
+        - graph (CompactGraph): The graph to index.
+        - cost_key (tuple): The travel costs the distances are measured in.
+        - find_costs (callable): A function mapping a node id to the array of the travel
+          costs from that node to every node.
+        - landmark_count (int): The maximum number of landmarks.
+
+        Returns:
+        - LandmarkIndex: The built index.
+        """
+        node_count = graph.number_of_nodes()
+        distances = []
+        if node_count > 0:
+            offsets = graph.coordinates - graph.coordinates[0]
+            landmark = int(np.argmax(np.hypot(offsets[:, 0], offsets[:, 1])))
+            proximity = np.full(node_count, np.inf)
+            for _ in range(min(landmark_count, node_count)):
+                distances.append(find_costs(landmark))
+                proximity = np.minimum(proximity, distances[-1])
+                proximity[landmark] = -1
+                landmark = int(np.argmax(proximity))
+                if proximity[landmark] <= 0:
+                    break
+        return cls(graph, np.array(distances, dtype=float).reshape(-1, node_count), cost_key)
+
+    def covers(self, graph, cost_key):
+        """
+        Check whether the index holds the travel costs of a graph, or of the graph it
+        was linked from.
+
+        Parameters:
+        - graph (CompactGraph): The searched graph.
+        - cost_key (tuple): The travel costs of the search.
+
+        Returns:
+        - bool: Whether the index applies to the search.
+        """
+        return self.cost_key == cost_key and (graph is self.graph or graph.base is self.graph)
+
+    def lower_bounds(self, graph, source, target, edge_costs):
+        """
+        Bound the remaining cost from every node to the target from below.
+
+        A linked target has no landmark distances, so the bounds go through its
+        neighbours: with d the costs from a landmark, the cost from a node v to the
+        target is at least min(d(n) + c(n, t)) - d(v) and at least
+        d(v) - max(d(n) - c(n, t)) over the neighbours n of the target. The source is
+        never entered again, so paths through it do not count. This holds as long as
+        every edge linked into the indexed graph ends at the source or the target. The
+        bounds are consistent and can be combined with other consistent estimates by
+        their maximum.
+
+        Parameters:
+        - graph (CompactGraph): The searched graph, the indexed one or linked from it.
+        - source (int): The id of the starting node.
+        - target (int): The id of the target node.
+        - edge_costs (np.ndarray): The travel cost of each edge of `graph`.
+
+        Returns:
+        - np.ndarray: The lower bound of the remaining cost of each node, or None if
+          the graph has linked nodes or edges away from the source and target.
+        """
+        indexed_count = self.distances.shape[1]
+        target_linked = False
+        if graph is not self.graph:
+            if set(range(indexed_count, graph.number_of_nodes())) - {source, target}:
+                return None
+            added = graph.added_edges.copy()
+            for node in (source, target):
+                added[graph.indptr[node]:graph.indptr[node + 1]] = False
+            if not np.isin(graph.indices[added], (source, target)).all():
+                return None
+            target_linked = target >= indexed_count or \
+                graph.added_edges[graph.indptr[target]:graph.indptr[target + 1]].any()
+
+        if not target_linked:
+            reach = leave = self.distances[:, target]
+        else:
+            first, last = graph.indptr[target], graph.indptr[target + 1]
+            neighbors = graph.indices[first:last]
+            indexed = neighbors < indexed_count
+            costs = np.asarray(edge_costs[first:last])[indexed]
+            landmark_costs = self.distances[:, neighbors[indexed]]
+            reach = np.min(landmark_costs + costs, axis=1, initial=np.inf)
+            leave = np.max(landmark_costs - costs, axis=1, initial=-np.inf)
+
+        with np.errstate(invalid='ignore'):
+            bounds = np.fmax(reach[:, None] - self.distances, self.distances - leave[:, None])
+            bounds = np.fmax.reduce(bounds, axis=0, initial=0.0)
+
+        remaining_costs = np.zeros(graph.number_of_nodes())
+        remaining_costs[:indexed_count] = bounds
+        remaining_costs[target] = 0
+        return remaining_costs
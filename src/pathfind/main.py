@@ -1,11 +1,18 @@
 #!/usr/bin/env python
 
 import argparse
+import json
 import logging
 import os
 import sys
-from pathfind.obstacle_course import ObstacleCourse
+from pathfind.batch import read_queries, run_batch
+from pathfind.obstacle_course import PLANNING_ENGINES, ObstacleCourse
 from pathfind.configuration import Configuration
+from pathfind.pathfinder import SEARCH_ALGORITHMS
+from utils.graph_cache import default_cache_dir
+from utils.graph_factory import GRAPH_BUILDERS
+from utils.stats import RunStats, timed, timed_iter
+from utils.validation import VALIDATION_MODES
 
 # Configure logging
 logging.basicConfig(level=logging.WARNING)
@@ -13,16 +20,59 @@ LOGGER = logging.getLogger('main')
 
 
 def main():
+    if sys.argv[1:2] == ['serve']:
+        from pathfind.server import main as serve
+        serve(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
-        prog='shortestPathFinding', description='Find the Shortest Path that avoids obstacles')
+        prog='shortestPathFinding', description='Find the Shortest Path that avoids obstacles',
+        epilog="Run 'pathfinder serve --help' for the path-planning server.")
     parser.add_argument(
         'inputyaml', help='Path to the input YAML configuration file')
     parser.add_argument('output', nargs='?', default='solution.txt',
                         help='Path to the output solution file')
     parser.add_argument('--plot', action='store_true',
                         help='Flag to generate plot images')
+    parser.add_argument('--queries',
+                        help='CSV or JSONL file of start and goal queries to answer against the scene, '
+                             'writing one JSON line per query to the output file (- for stdout)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of worker processes answering the batch queries')
+    parser.add_argument('--stats', nargs='?', const='-', metavar='PATH',
+                        help='Write the time spent in each phase, the visibility tests, the search '
+                             'queue operations and the peak memory as JSON to the file (- or no '
+                             'value for stdout)')
+    parser.add_argument('--profile', metavar='PATH',
+                        help='Profile the run with cProfile, writing the profile to the file')
+    add_scene_arguments(parser)
     args = parser.parse_args()
 
+    stats = RunStats() if args.stats is not None else None
+    profiler = None
+    if args.profile is not None:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        with timed(stats, 'total'):
+            run(args, stats)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+        if stats is not None:
+            write_stats(stats, args.stats)
+
+
+def run(args, stats=None):
+    """
+    Find the path of the scene, or answer the batch queries against it.
+
+    Parameters:
+    - args (argparse.Namespace): The parsed command line options.
+    - stats (RunStats): Optional run statistics, recording the time spent in each phase.
+    """
     # Validate input YAML file
     if not os.path.isfile(args.inputyaml):
         LOGGER.error(f"The input YAML file '{args.inputyaml}' does not exist.")
@@ -30,23 +80,40 @@ def main():
 
     # Load configuration
     try:
-        config = Configuration(args.inputyaml)
+        with timed(stats, 'load_config'):
+            config = Configuration(args.inputyaml)
     except Exception as e:
         LOGGER.error(f"Failed to load configuration from '{
                      args.inputyaml}'. {e}")
         sys.exit(1)
 
+    apply_scene_arguments(config, args)
+
+    if args.workers < 1:
+        LOGGER.error("The number of workers must be at least 1.")
+        sys.exit(1)
+    if args.queries is not None:
+        run_batch_mode(config, args.queries, args.output, args.workers, stats)
+        return
+
     # Find fastest path
     try:
-        obstacle_course = ObstacleCourse(config)
+        obstacle_course = ObstacleCourse(config, stats)
         path = obstacle_course.find_path()
+        searcher = {'grid': obstacle_course.grid_planner,
+                    'tiled': obstacle_course.tiled_planner}.get(obstacle_course.engine,
+                                                               obstacle_course.pathfinder)
+        LOGGER.info(f"The search expanded {searcher.nodes_expanded} nodes.")
+        if obstacle_course.suboptimality_bound is not None:
+            LOGGER.info(f"The path costs at most {obstacle_course.suboptimality_bound:.3f} "
+                        f"times the optimal cost.")
     except Exception as e:
         LOGGER.error(f"{e}")
         sys.exit(1)
 
     # Save solution to file
     try:
-        with open(args.output, 'w') as f:
+        with timed(stats, 'write_solution'), open(args.output, 'w') as f:
             f.write(str(path))
     except Exception as e:
         LOGGER.error(f"Failed to write solution to '{args.output}'. {e}")
@@ -55,12 +122,143 @@ def main():
     # Plot and save results if needed
     try:
         if args.plot:
-            obstacle_course.plot(path)
+            with timed(stats, 'plot'):
+                obstacle_course.plot(path)
     except Exception as e:
         LOGGER.error(f"Failed to plot the scene. {e}")
         sys.exit(1)
 
 
+def add_scene_arguments(parser):
+    """
+    Add the options overriding the scene configuration, shared by the commands.
+
+    Parameters:
+    - parser (argparse.ArgumentParser): The command line parser.
+    """
+    parser.add_argument('--builder', choices=list(GRAPH_BUILDERS),
+                        help='Visibility graph builder, overriding the configuration file')
+    parser.add_argument('--reduced', action='store_true',
+                        help='Flag to build the reduced (tangent-only) visibility graph')
+    parser.add_argument('--search', choices=SEARCH_ALGORITHMS,
+                        help='Search algorithm, overriding the configuration file')
+    parser.add_argument('--cache-dir',
+                        help='Directory caching the built obstacle graphs, overriding the configuration file')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Flag to neither load nor store cached obstacle graphs')
+    parser.add_argument('--validation', choices=VALIDATION_MODES,
+                        help='Obstacle validation: all obstacles, a random sample of them, or none, '
+                             'overriding the configuration file')
+    parser.add_argument('--threads', type=int,
+                        help='Number of threads building the visibility graph with the vectorized '
+                             'builder, overriding the configuration file')
+    parser.add_argument('--engine', choices=PLANNING_ENGINES,
+                        help='Planning engine: the exact visibility graph, any-angle search on an '
+                             'occupancy grid, or hierarchical search over tiles, overriding the '
+                             'configuration file')
+    parser.add_argument('--grid-resolution', type=float,
+                        help='Cell size of the occupancy grid of the grid engine, overriding the '
+                             'configuration file')
+    parser.add_argument('--tile-size', type=float,
+                        help='Width and height of the tiles of the tiled engine, overriding the '
+                             'configuration file')
+    parser.add_argument('--max-tiles', type=int,
+                        help='Number of tiles the tiled engine keeps built in memory, overriding '
+                             'the configuration file')
+    parser.add_argument('--time-budget', type=float,
+                        help='Wall time in seconds a search may take before returning its best '
+                             'path so far, overriding the configuration file')
+    parser.add_argument('--expansion-budget', type=int,
+                        help='Number of nodes a search may expand before returning its best path '
+                             'so far, overriding the configuration file')
+
+
+def apply_scene_arguments(config, args):
+    """
+    Override the scene configuration with the options of `add_scene_arguments`.
+
+    Parameters:
+    - config (Configuration): The configuration of the scene.
+    - args (argparse.Namespace): The parsed command line options.
+    """
+    if args.builder is not None:
+        config.graph_builder = args.builder
+    if args.reduced:
+        config.reduced_graph = True
+    if args.search is not None:
+        config.search_algorithm = args.search
+    if args.validation is not None:
+        config.validation = args.validation
+    if args.threads is not None:
+        config.threads = args.threads
+    if args.engine is not None:
+        config.engine = args.engine
+    if args.grid_resolution is not None:
+        config.grid_resolution = args.grid_resolution
+    if args.tile_size is not None:
+        config.tile_size = args.tile_size
+    if args.max_tiles is not None:
+        config.max_tiles = args.max_tiles
+    if args.time_budget is not None:
+        config.time_budget = args.time_budget
+    if args.expansion_budget is not None:
+        config.expansion_budget = args.expansion_budget
+    if args.no_cache:
+        config.cache_dir = None
+    elif args.cache_dir is not None:
+        config.cache_dir = args.cache_dir
+    elif config.cache_dir is None:
+        config.cache_dir = default_cache_dir()
+
+
+def write_stats(stats, stats_path):
+    """
+    Write the run statistics as JSON.
+
+    Parameters:
+    - stats (RunStats): The run statistics.
+    - stats_path (str): The path to the JSON file, - for stdout.
+    """
+    try:
+        if stats_path == '-':
+            print(json.dumps(stats.to_dict(), indent=2))
+        else:
+            with open(stats_path, 'w') as f:
+                json.dump(stats.to_dict(), f, indent=2)
+    except Exception as e:
+        LOGGER.error(f"Failed to write the statistics to '{stats_path}'. {e}")
+
+
+def run_batch_mode(config, queries_path, output_path, workers, stats=None):
+    """
+    Answer all queries of a queries file against the scene of the configuration.
+
+    Parameters:
+    - config (Configuration): The configuration of the scene.
+    - queries_path (str): The path to the CSV or JSONL queries file.
+    - output_path (str): The path to the JSONL output file, - for stdout.
+    - workers (int): The number of worker processes.
+    - stats (RunStats): Optional run statistics. The links and searches of worker
+      processes are not recorded.
+    """
+    if not os.path.isfile(queries_path):
+        LOGGER.error(f"The queries file '{queries_path}' does not exist.")
+        sys.exit(1)
+
+    try:
+        obstacle_course = ObstacleCourse(config, stats)
+        # The queries are read lazily while they are answered, so each one is timed
+        queries = timed_iter(stats, 'read_queries', read_queries(queries_path))
+        if output_path == '-':
+            run_batch(obstacle_course, queries, sys.stdout, workers)
+        else:
+            with open(output_path, 'w') as f:
+                run_batch(obstacle_course, queries, f, workers)
+    except Exception as e:
+        LOGGER.error(f"Failed to run the batch queries. {e}")
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     try:
         main()
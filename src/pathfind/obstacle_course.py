@@ -1,20 +1,29 @@
+import numpy as np
 from shapely.geometry import Polygon
 
+from pathfind.landmarks import LandmarkIndex
 from pathfind.pathfinder import Pathfinder
 from pathfind.path_strategy import FastestPathStrategy, ShortestPathStrategy
-from utils.graph_factory import create_graph
-from utils.plotter import plot_scene
-from utils.validation import check_for_overlaps_and_exceeding_bounds, is_point_in_bounds, validate_obstacles
+from utils.graph_cache import load_graph, load_landmarks, scene_key, store_graph, store_landmarks
+from utils.graph_factory import (add_obstacle_to_graph, build_obstacle_graph, get_graph_builder,
+                                 link_endpoints, remove_obstacle_from_graph)
+from utils.obstacle_index import ObstacleIndex
+from utils.stats import timed
+from utils.validation import (check_for_overlaps_and_exceeding_bounds, is_point_in_bounds,
+                              select_obstacles_to_validate, validate_obstacles)
+
+PLANNING_ENGINES = ('visibility', 'grid', 'tiled')
 
 
 class ObstacleCourse:
-    def __init__(self, config):
+    def __init__(self, config, stats=None):
         """
         Initialize the obstacle course with start and goal points, space size, and obstacles.
 
         Parameters:
         - config (Configuration): The configuration object.
-        - path_finding_strategy (PathStrategy): The pathfinding strategy to use.
+        - stats (RunStats): Optional run statistics, recording the time spent validating,
+          building the graph, linking and searching, and the work done in each.
         """
         self.start = config.start
         self.goal = config.goal
@@ -23,37 +32,490 @@ class ObstacleCourse:
         self.mass = config.mass
         self.max_acceleration = config.max_acceleration
         self.obstacles = [Polygon(obstacle) for obstacle in config.obstacles]
+        get_graph_builder(config.graph_builder)
+        if config.reduced_graph and self.mass is not None and self.max_acceleration is not None:
+            raise ValueError("The reduced graph only keeps the shortest paths, not the fastest paths.")
+        self.graph_builder = config.graph_builder
+        self.reduced_graph = config.reduced_graph
+        self.cache_dir = config.cache_dir
+        self.validation = config.validation
+        if config.threads < 1:
+            raise ValueError("The number of threads must be at least 1.")
+        self.threads = config.threads
+        if config.engine not in PLANNING_ENGINES:
+            raise ValueError(
+                f"Unknown planning engine '{config.engine}'. Choose one of: {', '.join(PLANNING_ENGINES)}.")
+        if config.engine == 'grid' and config.grid_resolution <= 0:
+            raise ValueError("The grid resolution must be positive.")
+        if config.engine == 'tiled' and config.tile_size <= 0:
+            raise ValueError("The tile size must be positive.")
+        if config.engine == 'tiled' and config.max_tiles is not None and config.max_tiles < 1:
+            raise ValueError("At least one tile must be kept in memory.")
+        if config.time_budget is not None and config.time_budget <= 0:
+            raise ValueError("The time budget must be positive.")
+        if config.expansion_budget is not None and config.expansion_budget < 1:
+            raise ValueError("The expansion budget must be at least 1.")
+        if config.engine != 'visibility' and (
+                config.time_budget is not None or config.expansion_budget is not None):
+            raise ValueError("Search budgets require the visibility engine.")
+        self.engine = config.engine
+        self.grid_resolution = config.grid_resolution
+        self.tile_size = config.tile_size
+        self.max_tiles = config.max_tiles
+        self.time_budget = config.time_budget
+        self.expansion_budget = config.expansion_budget
+        # The bound on the cost of the last path found within a search budget relative
+        # to the optimal cost
+        self.suboptimality_bound = None
+        # The visibility graph between the obstacle vertices, shared by all queries
+        self.obstacle_graph = None
+        # The prepared obstacles, shared by the graph build, the links and the updates
+        self.obstacle_index = None
+        # The rasterized obstacles searched by the grid engine, shared by all queries
+        self.occupancy_grid = None
+        # The tiling of the space searched by the tiled engine, building its tiles on
+        # first use
+        self.tile_map = None
+        self.stats = stats
 
-        self.validate_course()
+        with timed(self.stats, 'validate'):
+            self.validate_course()
         self.strategy = self.determine_path_finiding_startegy(config)
+        self.pathfinder = Pathfinder(self.strategy, config.search_algorithm)
+        # The searchers of the other engines, only imported for their engine
+        self.grid_planner = None
+        self.tiled_planner = None
+        if self.engine == 'grid':
+            from pathfind.grid_planner import GridPlanner
+            self.grid_planner = GridPlanner(self.strategy)
+        elif self.engine == 'tiled':
+            from pathfind.tiled_planner import TiledPlanner
+            self.tiled_planner = TiledPlanner(self.pathfinder)
 
     def validate_course(self):
         """
         Validate the obstacle course by checking start and goal points, obstacles, and bounds.
+        The obstacle checks cover all obstacles, a random sample of them or none,
+        depending on the validation mode.
         """
         if not is_point_in_bounds(self.start, self.x_space_size, self.y_space_size):
             raise ValueError("Start point is out of bounds.")
         if not is_point_in_bounds(self.goal, self.x_space_size, self.y_space_size):
             raise ValueError("Goal point is out of bounds.")
 
-        validate_obstacles(self.obstacles)
+        indices = select_obstacles_to_validate(len(self.obstacles), self.validation)
+        if len(indices) == 0:
+            return
+        validate_obstacles([self.obstacles[i] for i in indices.tolist()])
         check_for_overlaps_and_exceeding_bounds(
-            self.obstacles, self.x_space_size, self.y_space_size)
+            self.obstacles, self.x_space_size, self.y_space_size, indices)
 
     def find_path(self):
         """
-        Find the shortest path from start to goal using the A* algorithm.
+        Find the shortest path from start to goal using Dijkstra or the A* algorithm.
+
+        Returns:
+        - list: The shortest path as a list of points.
+
+        Raises:
+        - Exception: If no valid path is found.
+        """
+        return self.find_path_between(self.start, self.goal)
+
+    def find_paths(self, queries):
+        """
+        Find the shortest paths for many queries against this obstacle course. The
+        visibility graph of the obstacles is built once and each query only links its
+        start and goal into it.
+
+        Parameters:
+        - queries (list): The (start, goal) point pairs.
+
+        Returns:
+        - list: The shortest path of each query as a list of points.
+
+        Raises:
+        - ValueError: If a start or goal point is out of bounds.
+        - Exception: If no valid path is found for a query.
+        """
+        return [self.find_path_between(start, goal) for start, goal in queries]
+
+    def find_path_between(self, start, goal):
+        """
+        Find the shortest path between two points of the obstacle course, on the
+        visibility graph or, with the grid engine, on the occupancy grid or, with the
+        tiled engine, on the graphs of the tiles between them. With a search budget, the
+        visibility graph search returns the best path found within it, see
+        `Pathfinder.find_path_anytime`.
+
+        Parameters:
+        - start (tuple): The starting point coordinates.
+        - goal (tuple): The goal point coordinates.
 
         Returns:
         - list: The shortest path as a list of points.
 
         Raises:
+        - ValueError: If the start or goal point is out of bounds.
         - Exception: If no valid path is found.
         """
-        graph = create_graph(self.start, self.goal, self.obstacles,
-                             self.x_space_size, self.y_space_size)
-        pathfinder = Pathfinder(self.strategy)
-        return pathfinder.find_path(graph, tuple(self.start), tuple(self.goal), self.mass, self.max_acceleration)
+        self.prepare_queries()
+        if self.engine == 'grid':
+            self.check_points_in_bounds([start, goal])
+            with timed(self.stats, 'search'):
+                path = self.grid_planner.find_path(
+                    self.occupancy_grid, tuple(start), tuple(goal), self.mass, self.max_acceleration)
+            self.count_search(self.grid_planner)
+            return path
+        if self.engine == 'tiled':
+            self.check_points_in_bounds([start, goal])
+            with timed(self.stats, 'search'):
+                path = self.tiled_planner.find_path(
+                    self.tile_map, tuple(start), tuple(goal), self.mass, self.max_acceleration)
+            self.count_search(self.tiled_planner)
+            if self.stats is not None:
+                self.stats.count('tiles_built', self.tiled_planner.tiles_built)
+            return path
+
+        graph = self.link_points([start, goal])
+        if self.time_budget is None and self.expansion_budget is None:
+            with timed(self.stats, 'search'):
+                path = self.pathfinder.find_path(
+                    graph, tuple(start), tuple(goal), self.mass, self.max_acceleration)
+            self.count_search()
+            return path
+
+        with timed(self.stats, 'search'):
+            path, self.suboptimality_bound = self.pathfinder.find_path_anytime(
+                graph, tuple(start), tuple(goal), self.mass, self.max_acceleration,
+                self.time_budget, self.expansion_budget)
+        self.count_search()
+        if self.stats is not None:
+            self.stats.count('anytime_iterations', self.pathfinder.anytime_iterations)
+        return path
+
+    def find_paths_from(self, start, goals):
+        """
+        Find the shortest paths from one start to many goals with a single search, which
+        stops as soon as every goal is reached.
+
+        Parameters:
+        - start (tuple): The starting point coordinates.
+        - goals (list): The goal point coordinates.
+
+        Returns:
+        - tuple: The array of the travel cost to each goal, infinite for unreachable
+          goals, and the list of the path to each goal, None for unreachable goals.
+
+        Raises:
+        - ValueError: If the start or a goal point is out of bounds, or with the grid or
+          tiled engine.
+        """
+        self.check_visibility_engine()
+        graph = self.link_points([start] + list(goals))
+        with timed(self.stats, 'search'):
+            result = self.pathfinder.find_paths_from(
+                graph, tuple(start), goals, self.mass, self.max_acceleration)
+        self.count_search()
+        return result
+
+    def cost_matrix(self, points, workers=1):
+        """
+        Find the travel costs between all pairs of points, with one single-source search
+        per point. The points are linked into the obstacle graph once and, as the costs
+        are symmetric, the search from each point only settles the points after it.
+
+        Parameters:
+        - points (list): The point coordinates.
+        - workers (int): The number of worker processes sharing the searches, see
+          `pathfind.parallel`.
+
+        Returns:
+        - np.ndarray: The (n, n) matrix of the travel costs, infinite between points
+          without a valid path.
+
+        Raises:
+        - ValueError: If a point is out of bounds, or with the grid or tiled engine.
+        """
+        self.check_visibility_engine()
+        points = [tuple(map(float, point)) for point in points]
+        graph = self.link_points(points)
+        if workers > 1:
+            from pathfind.parallel import find_cost_matrix_in_parallel
+            with timed(self.stats, 'search'):
+                return find_cost_matrix_in_parallel(self.pathfinder, graph, points, self.mass,
+                                                    self.max_acceleration, workers)
+
+        matrix = np.zeros((len(points), len(points)))
+        for index, point in enumerate(points):
+            with timed(self.stats, 'search'):
+                costs = self.pathfinder.find_costs_from(
+                    graph, point, points[index:], self.mass, self.max_acceleration)
+            self.count_search()
+            matrix[index, index:] = costs
+            matrix[index:, index] = costs
+        return matrix
+
+    def link_points(self, points):
+        """
+        Link points into the obstacle graph, after checking that they are in bounds.
+
+        Parameters:
+        - points (list): The point coordinates.
+
+        Returns:
+        - CompactGraph: The obstacle graph with the points linked in.
+
+        Raises:
+        - ValueError: If a point is out of bounds.
+        """
+        self.check_points_in_bounds(points)
+        unique_points = list(dict.fromkeys(tuple(map(float, point)) for point in points))
+        obstacle_graph = self.get_obstacle_graph()
+        with timed(self.stats, 'link'):
+            graph = link_endpoints(obstacle_graph, unique_points, self.obstacles,
+                                   self.reduced_graph, self.get_obstacle_index())
+        if self.stats is not None:
+            self.stats.count('link_visibility_tests', graph.graph['link_visibility_tests'])
+        return graph
+
+    def check_points_in_bounds(self, points):
+        """
+        Check that query points are in bounds.
+
+        Parameters:
+        - points (list): The point coordinates, the start first.
+
+        Raises:
+        - ValueError: If a point is out of bounds.
+        """
+        for index, point in enumerate(points):
+            if not is_point_in_bounds(point, self.x_space_size, self.y_space_size):
+                name = "Start" if index == 0 else "Goal"
+                raise ValueError(f"{name} point is out of bounds.")
+
+    def check_visibility_engine(self):
+        """
+        Check that the course plans on the visibility graph, which the searches from one
+        start to many goals require.
+
+        Raises:
+        - ValueError: With the grid or tiled engine.
+        """
+        if self.engine != 'visibility':
+            raise ValueError("Searches to many goals require the visibility engine.")
+
+    def count_search(self, searcher=None):
+        """
+        Add the work of the last search to the run statistics, if any.
+
+        Parameters:
+        - searcher (Pathfinder, GridPlanner or TiledPlanner): The searcher that ran the search,
+          defaults to the pathfinder.
+        """
+        if self.stats is not None:
+            searcher = self.pathfinder if searcher is None else searcher
+            self.stats.count('searches')
+            self.stats.count('nodes_pushed', searcher.nodes_pushed)
+            self.stats.count('nodes_popped', searcher.nodes_popped)
+            self.stats.count('nodes_expanded', searcher.nodes_expanded)
+
+    def get_obstacle_graph(self):
+        """
+        Return the visibility graph between the obstacle vertices, built or loaded from
+        the graph cache on first use.
+
+        Returns:
+        - CompactGraph: The obstacle graph.
+        """
+        if self.obstacle_graph is None:
+            with timed(self.stats, 'graph'):
+                self.obstacle_graph = self.load_or_build_obstacle_graph()
+            if self.stats is not None:
+                self.stats.counters['graph_nodes'] = self.obstacle_graph.number_of_nodes()
+                self.stats.counters['graph_edges'] = self.obstacle_graph.number_of_edges()
+        return self.obstacle_graph
+
+    def get_obstacle_index(self):
+        """
+        Return the line-crossing index of the obstacles, preparing them on first use.
+
+        Returns:
+        - ObstacleIndex: The obstacle index.
+        """
+        if self.obstacle_index is None:
+            self.obstacle_index = ObstacleIndex(self.obstacles)
+        return self.obstacle_index
+
+    def get_occupancy_grid(self):
+        """
+        Return the occupancy grid of the obstacles, rasterized on first use.
+
+        Returns:
+        - OccupancyGrid: The occupancy grid.
+        """
+        if self.occupancy_grid is None:
+            from utils.occupancy_grid import rasterize_obstacles
+            with timed(self.stats, 'grid'):
+                self.occupancy_grid = rasterize_obstacles(
+                    self.obstacles, self.x_space_size, self.y_space_size, self.grid_resolution)
+            if self.stats is not None:
+                self.stats.counters['grid_cells'] = int(self.occupancy_grid.shape[0] *
+                                                        self.occupancy_grid.shape[1])
+        return self.occupancy_grid
+
+    def get_tile_map(self):
+        """
+        Return the tiling of the space, whose tiles are built on first use.
+
+        Returns:
+        - TileMap: The tile map.
+        """
+        if self.tile_map is None:
+            from utils.tile_map import TileMap
+            self.tile_map = TileMap(self.obstacles, self.x_space_size, self.y_space_size,
+                                    self.tile_size, self.get_obstacle_index(), self.max_tiles)
+        return self.tile_map
+
+    def prepare_queries(self):
+        """
+        Build, or load from the graph cache, what all queries share: the obstacle graph
+        and, for ALT searches, its landmark index, the occupancy grid with the grid
+        engine, or the tile map with the tiled engine.
+        """
+        if self.engine == 'grid':
+            self.get_occupancy_grid()
+            return
+        if self.engine == 'tiled':
+            self.get_tile_map()
+            return
+        graph = self.get_obstacle_graph()
+        if self.pathfinder.algorithm == 'alt':
+            with timed(self.stats, 'landmarks'):
+                self.get_landmark_index(graph)
+
+    def get_landmark_index(self, graph):
+        """
+        Return the landmark index of the obstacle graph for the travel costs of the
+        course, loaded from the graph cache or built and stored there on first use.
+
+        Parameters:
+        - graph (CompactGraph): The obstacle graph.
+
+        Returns:
+        - LandmarkIndex: The landmark index.
+        """
+        cost_key = self.strategy.cost_key(self.mass, self.max_acceleration)
+        index = self.pathfinder.landmark_index
+        if index is not None and index.covers(graph, cost_key):
+            return index
+        if self.cache_dir is None:
+            return self.pathfinder.prepare_landmarks(graph, self.mass, self.max_acceleration)
+
+        key = self.graph_cache_key()
+        distances = load_landmarks(self.cache_dir, key, cost_key)
+        if distances is not None and distances.shape[1:] == (graph.number_of_nodes(),):
+            self.pathfinder.landmark_index = LandmarkIndex(graph, distances, cost_key)
+            return self.pathfinder.landmark_index
+        index = self.pathfinder.prepare_landmarks(graph, self.mass, self.max_acceleration)
+        store_landmarks(self.cache_dir, key, cost_key, index.distances)
+        return index
+
+    def add_obstacle(self, obstacle):
+        """
+        Add an obstacle to the course. An already built obstacle graph is updated rather
+        than rebuilt: only the edges crossing the new obstacle are removed and only its
+        vertices are linked in.
+
+        Parameters:
+        - obstacle (list): The obstacle, as a list of points or a shapely Polygon.
+
+        Returns:
+        - int: The index of the new obstacle.
+
+        Raises:
+        - ValueError: If the obstacle is not a valid polygon.
+        """
+        polygon = obstacle if isinstance(obstacle, Polygon) else Polygon(obstacle)
+        validate_obstacles([polygon])
+        self.obstacles.append(polygon)
+        self.occupancy_grid = None
+        self.tile_map = None
+        # The other obstacles stay prepared, so only the new one and the spatial index
+        # are built again
+        self.obstacle_index = None
+        if self.obstacle_graph is not None:
+            self.obstacle_graph = add_obstacle_to_graph(
+                self.obstacle_graph, polygon, self.obstacles, self.x_space_size,
+                self.y_space_size, self.reduced_graph, self.get_obstacle_index())
+        return len(self.obstacles) - 1
+
+    def remove_obstacle(self, index):
+        """
+        Remove an obstacle from the course. An already built obstacle graph is updated
+        rather than rebuilt: only the lines of sight the obstacle blocked are tested again.
+
+        Parameters:
+        - index (int): The index of the obstacle.
+
+        Returns:
+        - Polygon: The removed obstacle.
+
+        Raises:
+        - IndexError: If there is no obstacle at the index.
+        """
+        polygon = self.obstacles.pop(index)
+        self.obstacle_index = None
+        self.occupancy_grid = None
+        self.tile_map = None
+        if self.obstacle_graph is not None:
+            self.obstacle_graph = remove_obstacle_from_graph(
+                self.obstacle_graph, polygon, self.obstacles, self.x_space_size,
+                self.y_space_size, self.reduced_graph, self.get_obstacle_index())
+        return polygon
+
+    def load_or_build_obstacle_graph(self):
+        """
+        Load the obstacle graph from the graph cache, or build it and store it there.
+
+        Returns:
+        - CompactGraph: The obstacle graph.
+        """
+        if self.cache_dir is None:
+            return self.build_obstacle_graph()
+
+        key = self.graph_cache_key()
+        graph = load_graph(self.cache_dir, key)
+        if graph is None:
+            graph = self.build_obstacle_graph()
+            store_graph(self.cache_dir, key, graph)
+        elif self.stats is not None:
+            self.stats.count('graph_cache_hits')
+        return graph
+
+    def build_obstacle_graph(self):
+        """
+        Build the obstacle graph, counting its visibility tests in the run statistics.
+
+        Returns:
+        - CompactGraph: The obstacle graph.
+        """
+        graph = build_obstacle_graph(self.obstacles, self.x_space_size, self.y_space_size,
+                                     self.graph_builder, self.reduced_graph, self.threads,
+                                     self.get_obstacle_index())
+        if self.stats is not None and 'visibility_tests' in graph.graph:
+            self.stats.count('visibility_tests', graph.graph['visibility_tests'])
+        return graph
+
+    def graph_cache_key(self):
+        """
+        Return the key of the obstacle graph in the graph cache.
+
+        Returns:
+        - str: The cache key of the scene.
+        """
+        return scene_key(self.obstacles, self.x_space_size, self.y_space_size,
+                         self.graph_builder, self.reduced_graph)
 
     def plot(self, path):
         """
@@ -62,6 +524,10 @@ class ObstacleCourse:
         Parameters:
         - path (list): The computed path as a list of points.
         """
+        # matplotlib takes longer to import than a whole query takes to answer, so it is
+        # only loaded when plotting
+        from utils.plotter import plot_scene
+
         plot_scene(path, self.start, self.goal,
                            self.obstacles, self.x_space_size, self.y_space_size)
 
@@ -0,0 +1,148 @@
+import multiprocessing
+
+import numpy as np
+
+from pathfind.batch import answer_query
+
+# Number of queries sent to a worker at a time
+QUERY_CHUNK_SIZE = 16
+
+# The shared state of the worker processes, such as the obstacle course, set before
+# the pool is created so that forked workers inherit it, with its prebuilt graph,
+# instead of receiving it per task
+_worker_state = None
+
+
+def get_pool_context():
+    """
+    Return the multiprocessing context for the worker pools: fork where available, so
+    that the workers share the parent's memory copy-on-write.
+
+    Returns:
+    - tuple: The context and whether it forks.
+    """
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork'), True
+    return multiprocessing.get_context(), False
+
+
+def map_with_shared_state(state, function, items, workers, chunk_size):
+    """
+    Apply a function to items in a pool of worker processes sharing a read-only state.
+
+    With the fork start method the workers inherit the state; otherwise it is sent
+    once to each worker when it starts. Only the items and results travel between the
+    processes.
+
+    Parameters:
+    - state (object): The state shared by all workers.
+    - function (callable): A module level function of the state and an item.
+    - items (iterable): The items.
+    - workers (int): The number of worker processes.
+    - chunk_size (int): The number of items sent to a worker at a time.
+
+    Yields:
+    - object: The result of each item, in order.
+    """
+    global _worker_state
+    context, forks = get_pool_context()
+    _worker_state = state
+    try:
+        with context.Pool(workers, initializer=None if forks else _set_worker_state,
+                          initargs=() if forks else (state,)) as pool:
+            yield from pool.imap(_call_with_worker_state,
+                                 ((function, item) for item in items), chunk_size)
+    finally:
+        _worker_state = None
+
+
+def answer_queries_in_parallel(obstacle_course, queries, workers, chunk_size=QUERY_CHUNK_SIZE):
+    """
+    Answer queries against one obstacle course in a pool of worker processes.
+
+    The obstacle graph, and the landmark index of ALT searches, are built once in the
+    parent process before the pool starts and shared with the workers, see
+    `map_with_shared_state`.
+
+    Parameters:
+    - obstacle_course (ObstacleCourse): The obstacle course shared by all queries.
+    - queries (iterable): The (start, goal) point pairs.
+    - workers (int): The number of worker processes.
+    - chunk_size (int): The number of queries sent to a worker at a time.
+
+    Yields:
+    - dict: The result of each query, see `answer_query`, in query order.
+    """
+    obstacle_course.prepare_queries()
+    yield from map_with_shared_state(obstacle_course, _answer_indexed_query,
+                                     enumerate(queries), workers, chunk_size)
+
+
+def find_cost_matrix_in_parallel(pathfinder, graph, points, mass, max_acceleration, workers):
+    """
+    Find the travel costs between all pairs of points of a graph, with one single-source
+    search per point spread over a pool of worker processes.
+
+    The costs are symmetric, so the search from each point only settles the points
+    after it.
+
+    Parameters:
+    - pathfinder (Pathfinder): The pathfinder.
+    - graph (CompactGraph): The graph, holding all points as nodes.
+    - points (list): The point coordinates.
+    - mass (float): The mass of the robot.
+    - max_acceleration (float): The maximum acceleration of the robot.
+    - workers (int): The number of worker processes.
+
+    Returns:
+    - np.ndarray: The (n, n) matrix of the travel costs, infinite between unconnected points.
+    """
+    state = (pathfinder, graph, points, mass, max_acceleration)
+    matrix = np.zeros((len(points), len(points)))
+    rows = map_with_shared_state(state, _find_cost_row, range(len(points)), workers, 1)
+    for index, costs in enumerate(rows):
+        matrix[index, index:] = costs
+        matrix[index:, index] = costs
+    return matrix
+
+
+def find_paths_for_courses(obstacle_courses, workers):
+    """
+    Find the path from start to goal of many obstacle courses in a pool of worker
+    processes, one course per task.
+
+    Parameters:
+    - obstacle_courses (list): The obstacle courses.
+    - workers (int): The number of worker processes.
+
+    Returns:
+    - list: The result of each course, see `answer_query`, in order.
+    """
+    context, _ = get_pool_context()
+    with context.Pool(workers) as pool:
+        return pool.map(_answer_course, enumerate(obstacle_courses), 1)
+
+
+def _set_worker_state(state):
+    global _worker_state
+    _worker_state = state
+
+
+def _call_with_worker_state(task):
+    function, item = task
+    return function(_worker_state, item)
+
+
+def _answer_indexed_query(obstacle_course, indexed_query):
+    index, (start, goal) = indexed_query
+    return answer_query(obstacle_course, index, start, goal)
+
+
+def _find_cost_row(state, index):
+    pathfinder, graph, points, mass, max_acceleration = state
+    return pathfinder.find_costs_from(graph, points[index], points[index:], mass, max_acceleration)
+
+
+def _answer_course(indexed_course):
+    index, obstacle_course = indexed_course
+    return answer_query(obstacle_course, index, obstacle_course.start, obstacle_course.goal)
@@ -1,8 +1,13 @@
 import math
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 
 class PathStrategy(ABC):
+    # Name under which the precomputed travel costs of the graph edges are cached
+    cost_attribute = 'weight'
+
     def euclidean_distance(self, start_node, end_node):
         """
         Calculate the Euclidean distance between two points.
@@ -20,8 +25,95 @@ class PathStrategy(ABC):
     def calculate_travel_cost(self, start, goal, mass, max_acceleration):
         pass
 
+    def calculate_travel_costs(self, distances, mass, max_acceleration):
+        """
+        Calculate the travel costs of many straight segments at once.
+
+        Strategies whose cost only depends on the length of a segment should override
+        this with a vectorized computation; the default calls `calculate_travel_cost`
+        once per segment.
+
+        Parameters:
+        - distances (np.ndarray): The lengths of the segments.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+
+        Returns:
+        - np.ndarray: The travel cost of each segment.
+        """
+        return np.array([self.calculate_travel_cost((0, 0), (distance, 0), mass, max_acceleration)
+                         for distance in np.asarray(distances, dtype=float).tolist()], dtype=float)
+
+    def cost_key(self, mass, max_acceleration):
+        """
+        Identify the travel costs of this strategy with the given parameters, to cache
+        what is derived from them.
+
+        Parameters:
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+
+        Returns:
+        - tuple: The cost attribute and the parameters.
+        """
+        return (self.cost_attribute, mass, max_acceleration)
+
+    def prepare_graph(self, graph, mass, max_acceleration):
+        """
+        Precompute the travel cost of every graph edge in one vectorized pass, so that
+        the search only reads an array of edge costs. The costs are cached on the graph
+        per strategy and parameters.
+
+        Parameters:
+        - graph (CompactGraph): The graph whose `weights` hold the edge lengths.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+
+        Returns:
+        - np.ndarray: The travel cost of each edge, aligned with `graph.indices`.
+        """
+        return graph.edge_cost_array(
+            self.cost_key(mass, max_acceleration),
+            lambda distances: self.calculate_travel_costs(distances, mass, max_acceleration))
+
+    def heuristic(self, node, goal, mass, max_acceleration):
+        """
+        Estimate the remaining travel cost from a node to the goal for A* search.
+
+        The estimate must never exceed the true cost of any path to the goal. The default
+        of zero is always admissible and makes A* behave like Dijkstra.
+
+        Parameters:
+        - node (tuple): The node coordinates.
+        - goal (tuple): The goal point coordinates.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+
+        Returns:
+        - float: A lower bound of the travel cost from the node to the goal.
+        """
+        return 0
+
+    def heuristics(self, points, goal, mass, max_acceleration):
+        """
+        Vectorized `heuristic` over an array of nodes.
+
+        Parameters:
+        - points (np.ndarray): The (N, 2) node coordinates.
+        - goal (tuple): The goal point coordinates.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+
+        Returns:
+        - np.ndarray: A lower bound of the travel cost from each node to the goal.
+        """
+        return np.array([self.heuristic(point, goal, mass, max_acceleration)
+                         for point in np.asarray(points, dtype=float).tolist()], dtype=float)
+
 
 class FastestPathStrategy(PathStrategy):
+    cost_attribute = 'travel_time'
+
     def calculate_travel_cost(self, start_node, end_node, mass, a_max):
         """
         Calculate the travel time between two points considering the robot's mass and maximum acceleration.
@@ -58,6 +150,68 @@ class FastestPathStrategy(PathStrategy):
 
         return t_acc + t_const + t_dec
 
+    def calculate_travel_costs(self, distances, mass, a_max):
+        """
+        Vectorized `calculate_travel_cost` over the lengths of many segments.
+
+        Parameters:
+        - distances (np.ndarray): The lengths of the segments.
+        - mass (float): The mass of the robot.
+        - a_max (float): The maximum acceleration of the robot.
+
+        Returns:
+        - np.ndarray: The travel time of each segment.
+        """
+        distances = np.asarray(distances, dtype=float)
+
+        # Time and distance to accelerate to maximum velocity, and to decelerate
+        t_acc = np.sqrt(2 * distances / a_max) / 2
+        d_acc = 0.5 * a_max * t_acc**2
+
+        # If the total distance is less than twice the acceleration distance
+        short = d_acc + d_acc >= distances
+        t_short = np.sqrt(distances / a_max)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_const = (distances - (d_acc + d_acc)) / (a_max * t_acc)
+
+        travel_times = np.where(short, t_short + t_short,
+                                t_acc + t_const + t_acc)
+        return np.where(distances == 0, 0.0, travel_times)
+
+    def heuristic(self, node, goal, mass, a_max):
+        """
+        Estimate the remaining travel time as the time to travel straight to the goal.
+
+        The travel time grows with the distance and the time of a path is at least the
+        time of a single segment as long as the whole path, so this never overestimates.
+
+        Parameters:
+        - node (tuple): The node coordinates.
+        - goal (tuple): The goal point coordinates.
+        - mass (float): The mass of the robot.
+        - a_max (float): The maximum acceleration of the robot.
+
+        Returns:
+        - float: The straight-line travel time from the node to the goal.
+        """
+        return self.calculate_travel_cost(node, goal, mass, a_max)
+
+    def heuristics(self, points, goal, mass, a_max):
+        """
+        Vectorized `heuristic` over an array of nodes.
+
+        Parameters:
+        - points (np.ndarray): The (N, 2) node coordinates.
+        - goal (tuple): The goal point coordinates.
+        - mass (float): The mass of the robot.
+        - a_max (float): The maximum acceleration of the robot.
+
+        Returns:
+        - np.ndarray: The straight-line travel time from each node to the goal.
+        """
+        distances = np.hypot(points[:, 0] - goal[0], points[:, 1] - goal[1])
+        return self.calculate_travel_costs(distances, mass, a_max)
+
 
 class ShortestPathStrategy(PathStrategy):
     def calculate_travel_cost(self, start, goal, mass=1, max_acceleration=1):
@@ -73,4 +227,75 @@ class ShortestPathStrategy(PathStrategy):
         Returns:
         - float: The Euclidean distance between the points.
         """
-        return self.euclidean_distance(start, goal)
\ No newline at end of file
+        return self.euclidean_distance(start, goal)
+
+    def calculate_travel_costs(self, distances, mass=1, max_acceleration=1):
+        """
+        Calculate the travel costs of many segments, which are their lengths.
+
+        Parameters:
+        - distances (np.ndarray): The lengths of the segments.
+        - mass (float, optional): The mass of the robot. Defaults to 1.
+        - max_acceleration (float, optional): The maximum acceleration of the robot. Defaults to 1.
+
+        Returns:
+        - np.ndarray: The travel cost of each segment.
+        """
+        return np.asarray(distances, dtype=float)
+
+    def cost_key(self, mass=1, max_acceleration=1):
+        """
+        Identify the travel costs, which are the lengths and do not depend on the parameters.
+
+        Parameters:
+        - mass (float, optional): The mass of the robot. Defaults to 1.
+        - max_acceleration (float, optional): The maximum acceleration of the robot. Defaults to 1.
+
+        Returns:
+        - tuple: The cost attribute.
+        """
+        return (self.cost_attribute,)
+
+    def prepare_graph(self, graph, mass=1, max_acceleration=1):
+        """
+        Return the edge lengths of the graph, which are the travel costs.
+
+        Parameters:
+        - graph (CompactGraph): The graph whose `weights` hold the edge lengths.
+        - mass (float, optional): The mass of the robot. Defaults to 1.
+        - max_acceleration (float, optional): The maximum acceleration of the robot. Defaults to 1.
+
+        Returns:
+        - np.ndarray: The travel cost of each edge, aligned with `graph.indices`.
+        """
+        return graph.weights
+
+    def heuristic(self, node, goal, mass=1, max_acceleration=1):
+        """
+        Estimate the remaining travel cost as the straight-line distance to the goal.
+
+        Parameters:
+        - node (tuple): The node coordinates.
+        - goal (tuple): The goal point coordinates.
+        - mass (float, optional): The mass of the robot. Defaults to 1.
+        - max_acceleration (float, optional): The maximum acceleration of the robot. Defaults to 1.
+
+        Returns:
+        - float: The Euclidean distance from the node to the goal.
+        """
+        return self.euclidean_distance(node, goal)
+
+    def heuristics(self, points, goal, mass=1, max_acceleration=1):
+        """
+        Vectorized `heuristic` over an array of nodes.
+
+        Parameters:
+        - points (np.ndarray): The (N, 2) node coordinates.
+        - goal (tuple): The goal point coordinates.
+        - mass (float, optional): The mass of the robot. Defaults to 1.
+        - max_acceleration (float, optional): The maximum acceleration of the robot. Defaults to 1.
+
+        Returns:
+        - np.ndarray: The Euclidean distance from each node to the goal.
+        """
+        return np.hypot(points[:, 0] - goal[0], points[:, 1] - goal[1])
\ No newline at end of file
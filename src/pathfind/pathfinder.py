@@ -1,22 +1,60 @@
+import time
+from pathfind.landmarks import DEFAULT_LANDMARK_COUNT, LandmarkIndex
 from pathfind.path_strategy import PathStrategy
-from heapq import heappush, heappop
+from heapq import heapify, heappush, heappop
+
+import numpy as np
+
+from utils.compact_graph import CompactGraph
+
+SEARCH_ALGORITHMS = ('dijkstra', 'astar', 'bidirectional_dijkstra', 'bidirectional_astar', 'alt')
+
+# The heuristic weight of the first anytime search, and its decrease between searches
+DEFAULT_INITIAL_WEIGHT = 3.0
+DEFAULT_WEIGHT_STEP = 0.5
+
 
 class Pathfinder:
-    def __init__(self, pathStrategy: PathStrategy):
+    def __init__(self, pathStrategy: PathStrategy, algorithm='dijkstra'):
         """
         Initialize the Pathfinder with a specific path strategy.
 
         Parameters:
         - pathStrategy (PathStrategy): The strategy for calculating the path.
+        - algorithm (str): The search algorithm, 'dijkstra', 'astar',
+          'bidirectional_dijkstra', 'bidirectional_astar' or 'alt'. A* is guided by the
+          heuristic of the path strategy. The bidirectional variants search from the
+          start and from the goal at once and meet in the middle. ALT is A* further
+          guided by the landmark index of the graph, see `prepare_landmarks`.
+
+        Raises:
+        - ValueError: If the search algorithm is unknown.
         """
+        if algorithm not in SEARCH_ALGORITHMS:
+            raise ValueError(
+                f"Unknown search algorithm '{algorithm}'. Choose one of: {', '.join(SEARCH_ALGORITHMS)}.")
         self.pathStrategy = pathStrategy
+        self.algorithm = algorithm
+        # Number of nodes expanded by the last search
+        self.nodes_expanded = 0
+        # Number of queue entries pushed and popped by the last search, including the
+        # entries superseded by a cheaper one
+        self.nodes_pushed = 0
+        self.nodes_popped = 0
+        # Number of weighted searches run by the last anytime search
+        self.anytime_iterations = 0
+        # The landmark index used by ALT searches
+        self.landmark_index = None
 
     def find_path(self, graph, start, goal, mass, max_acceleration):
         """
         Find the fastest path from start to goal considering the robot's mass and maximum acceleration.
 
+        The search runs on the CSR arrays of a `CompactGraph` and relaxes all edges of an
+        expanded node at once. A networkx graph is converted first.
+
         Parameters:
-        - graph (nx.Graph): The graph with nodes and edges.
+        - graph (CompactGraph or nx.Graph): The graph with nodes and edges, weighted by their length.
         - start (tuple): The starting point coordinates.
         - goal (tuple): The goal point coordinates.
         - mass (float): The mass of the robot.
@@ -28,45 +66,522 @@ class Pathfinder:
         Raises:
         - Exception: If no valid path is found.
         """
-        pq = []
-        costs = dict()
-        came_from = dict()
+        if not isinstance(graph, CompactGraph):
+            graph = CompactGraph.from_networkx(graph)
+        try:
+            source = graph.node_id(start)
+            target = graph.node_id(goal)
+        except KeyError:
+            raise Exception("No valid path found")
+
+        edge_costs = self.pathStrategy.prepare_graph(
+            graph, mass, max_acceleration)
+        if self.algorithm.startswith('bidirectional'):
+            potentials = self.estimate_potentials(
+                graph, start, goal, mass, max_acceleration)
+            cost, path = self.bidirectional_search(
+                graph, source, target, edge_costs, potentials)
+            if cost == np.inf:
+                raise Exception("No valid path found")
+            return graph.coordinates[path].tolist()
+
+        remaining_costs = self.estimate_remaining_costs(
+            graph, goal, mass, max_acceleration)
+        if self.algorithm == 'alt':
+            landmark_costs = self.get_landmark_index(graph, mass, max_acceleration).lower_bounds(
+                graph, source, target, edge_costs)
+            if landmark_costs is not None:
+                remaining_costs = np.maximum(remaining_costs, landmark_costs)
+        costs, parents = self.search(
+            graph, source, [target], edge_costs, remaining_costs)
+        if costs[target] == np.inf:
+            raise Exception("No valid path found")
+        return self.reconstruct_path(graph, source, target, parents)
+
+    def find_path_anytime(self, graph, start, goal, mass, max_acceleration, time_budget=None,
+                          expansion_budget=None, initial_weight=DEFAULT_INITIAL_WEIGHT,
+                          weight_step=DEFAULT_WEIGHT_STEP):
+        """
+        Find a path from start to goal within a time or expansion budget with ARA*, and
+        return the best path found when the budget runs out.
+
+        ARA* runs weighted A*, whose heuristic is inflated by a weight, so that a first
+        path is found after few expansions, then searches again with smaller weights
+        until the weight reaches 1 and the path is optimal. Each search reuses the costs
+        of the previous ones and only expands the nodes whose cost has improved since.
+        The heuristic is the one of the path strategy, tightened by the landmark index
+        with ALT; the other search algorithms run the same search.
+
+        The suboptimality bound compares the cost of the path with the least cost
+        estimate of the nodes still to expand, which bounds the optimal cost from below,
+        so it holds whenever the search stops.
+
+        Parameters:
+        - graph (CompactGraph or nx.Graph): The graph with nodes and edges, weighted by their length.
+        - start (tuple): The starting point coordinates.
+        - goal (tuple): The goal point coordinates.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+        - time_budget (float): The wall time in seconds the search may take, None for no limit.
+        - expansion_budget (int): The number of nodes the search may expand, None for no limit.
+        - initial_weight (float): The heuristic weight of the first search.
+        - weight_step (float): The decrease of the weight between searches.
+
+        Returns:
+        - tuple: The path as a list of points, and the bound on its cost relative to the
+          optimal cost, 1.0 if the path is optimal.
+
+        Raises:
+        - ValueError: If a budget is not positive, or the weights are less than 1 or do
+          not decrease.
+        - Exception: If no valid path is found, or none within the budget.
+        """
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError("The time budget must be positive.")
+        if expansion_budget is not None and expansion_budget < 1:
+            raise ValueError("The expansion budget must be at least 1.")
+        if initial_weight < 1 or weight_step <= 0:
+            raise ValueError("The heuristic weight must be at least 1 and decrease between searches.")
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        if not isinstance(graph, CompactGraph):
+            graph = CompactGraph.from_networkx(graph)
+        try:
+            source = graph.node_id(start)
+            target = graph.node_id(goal)
+        except KeyError:
+            raise Exception("No valid path found")
+
+        edge_costs = self.pathStrategy.prepare_graph(graph, mass, max_acceleration)
+        remaining_costs = self.pathStrategy.heuristics(graph.coordinates, goal, mass, max_acceleration)
+        if self.algorithm == 'alt':
+            landmark_costs = self.get_landmark_index(graph, mass, max_acceleration).lower_bounds(
+                graph, source, target, edge_costs)
+            if landmark_costs is not None:
+                remaining_costs = np.maximum(remaining_costs, landmark_costs)
 
-        costs[start] = 0
-        heappush(pq, (0, start))
+        indptr = graph.indptr_list()
+        indices = graph.indices
+        costs = np.full(graph.number_of_nodes(), np.inf)
+        parents = np.full(graph.number_of_nodes(), -1, dtype=np.intp)
+        # The nodes to expand in the current search, and the nodes expanded by it whose
+        # cost has improved since, to expand in the next search
+        queued = np.zeros(graph.number_of_nodes(), dtype=bool)
+        inconsistent = np.zeros(graph.number_of_nodes(), dtype=bool)
+        self.nodes_expanded = self.nodes_pushed = self.nodes_popped = 0
+        self.anytime_iterations = 0
 
-        while pq:
-            current_cost, current_node = heappop(pq)
+        costs[source] = 0
+        queued[source] = True
+        weight = float(initial_weight)
+        path, path_cost, bound = None, np.inf, np.inf
+        while True:
+            nodes = np.flatnonzero(queued | inconsistent)
+            queued[nodes] = True
+            inconsistent[:] = False
+            expanded = np.zeros(graph.number_of_nodes(), dtype=bool)
+            pq = list(zip((costs[nodes] + weight * remaining_costs[nodes]).tolist(), nodes.tolist()))
+            heapify(pq)
+            self.nodes_pushed += len(pq)
+            self.anytime_iterations += 1
+            out_of_budget = False
+            while pq:
+                priority, current_node = pq[0]
+                # Skip queue entries of nodes expanded since they were pushed
+                if not queued[current_node]:
+                    heappop(pq)
+                    self.nodes_popped += 1
+                    continue
+                if priority >= costs[target]:
+                    break
+                if ((expansion_budget is not None and self.nodes_expanded >= expansion_budget) or
+                        (deadline is not None and time.perf_counter() >= deadline)):
+                    out_of_budget = True
+                    break
+                heappop(pq)
+                self.nodes_popped += 1
+                queued[current_node] = False
+                expanded[current_node] = True
+                self.nodes_expanded += 1
 
-            if current_node == goal:
-                return self.reconstruct_path(start, current_node, came_from)
+                first, last = indptr[current_node], indptr[current_node + 1]
+                neighbors = indices[first:last]
+                estimated_costs = costs[current_node] + edge_costs[first:last]
+                improved = estimated_costs < costs[neighbors]
+                if not improved.any():
+                    continue
+                neighbors = neighbors[improved]
+                estimated_costs = estimated_costs[improved]
+                costs[neighbors] = estimated_costs
+                parents[neighbors] = current_node
+                # Nodes expanded by this search wait for the next one
+                reexpanded = expanded[neighbors]
+                inconsistent[neighbors[reexpanded]] = True
+                neighbors = neighbors[~reexpanded]
+                queued[neighbors] = True
+                priorities = estimated_costs[~reexpanded] + weight * remaining_costs[neighbors]
+                for priority, neighbor in zip(priorities.tolist(), neighbors.tolist()):
+                    heappush(pq, (priority, neighbor))
+                self.nodes_pushed += len(neighbors)
 
-            for neighbor in graph.neighbors(current_node):
-                travel_cost = self.pathStrategy.calculate_travel_cost(
-                    current_node, neighbor, mass, max_acceleration)
-                estimated_cost = current_cost + travel_cost
-                if neighbor not in costs or estimated_cost < costs[neighbor]:
-                    came_from[neighbor] = current_node
-                    costs[neighbor] = estimated_cost
-                    heappush(pq, (estimated_cost, neighbor))
+            if costs[target] < path_cost:
+                path_cost = costs[target]
+                path = self.reconstruct_path(graph, source, target, parents)
+            if path is not None:
+                pending = queued | inconsistent
+                lower_bound = (costs[pending] + remaining_costs[pending]).min() if pending.any() else np.inf
+                bound = 1.0 if path_cost <= lower_bound else float(path_cost / lower_bound)
+            if out_of_budget or bound == 1.0 or (not pq and path is None) or weight == 1:
+                break
+            weight = max(1.0, weight - weight_step)
 
-        raise Exception("No valid path found")
+        if path is None:
+            if out_of_budget:
+                raise Exception("No path found within the search budget")
+            raise Exception("No valid path found")
+        return path, bound
 
-    def reconstruct_path(self, start, node, parents):
+    def find_paths_from(self, graph, start, goals, mass, max_acceleration):
         """
-        Reconstruct the path from start to node using the parent nodes.
+        Find the fastest paths from one start to many goals with a single Dijkstra search,
+        stopped as soon as every goal is settled.
+
+        Parameters:
+        - graph (CompactGraph or nx.Graph): The graph with nodes and edges, weighted by their length.
+        - start (tuple): The starting point coordinates.
+        - goals (list): The goal point coordinates.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+
+        Returns:
+        - tuple: The array of the travel cost to each goal, infinite for unreachable
+          goals, and the list of the path to each goal, None for unreachable goals.
+
+        Raises:
+        - Exception: If the start is not a node of the graph.
+        """
+        if not isinstance(graph, CompactGraph):
+            graph = CompactGraph.from_networkx(graph)
+        source, targets = self.find_goal_nodes(graph, start, goals)
+        costs, parents = self.search(graph, source, targets[targets >= 0],
+                                     self.pathStrategy.prepare_graph(graph, mass, max_acceleration))
+
+        goal_costs = np.where(targets >= 0, costs[targets], np.inf)
+        paths = [self.reconstruct_path(graph, source, target, parents) if cost < np.inf else None
+                 for target, cost in zip(targets.tolist(), goal_costs.tolist())]
+        return goal_costs, paths
+
+    def find_costs_from(self, graph, start, goals, mass, max_acceleration):
+        """
+        Find the travel costs from one start to many goals with a single Dijkstra search,
+        stopped as soon as every goal is settled.
+
+        Parameters:
+        - graph (CompactGraph or nx.Graph): The graph with nodes and edges, weighted by their length.
+        - start (tuple): The starting point coordinates.
+        - goals (list): The goal point coordinates.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+
+        Returns:
+        - np.ndarray: The travel cost to each goal, infinite for unreachable goals.
+
+        Raises:
+        - Exception: If the start is not a node of the graph.
+        """
+        if not isinstance(graph, CompactGraph):
+            graph = CompactGraph.from_networkx(graph)
+        source, targets = self.find_goal_nodes(graph, start, goals)
+        costs, _ = self.search(graph, source, targets[targets >= 0],
+                               self.pathStrategy.prepare_graph(graph, mass, max_acceleration))
+        return np.where(targets >= 0, costs[targets], np.inf)
+
+    def find_goal_nodes(self, graph, start, goals):
+        """
+        Look up the nodes of a start and many goals.
+
+        Parameters:
+        - graph (CompactGraph): The searched graph.
+        - start (tuple): The starting point coordinates.
+        - goals (list): The goal point coordinates.
+
+        Returns:
+        - tuple: The id of the start node and the array of the goal node ids, -1 for
+          goals that are not nodes of the graph.
+
+        Raises:
+        - Exception: If the start is not a node of the graph.
+        """
+        try:
+            source = graph.node_id(start)
+        except KeyError:
+            raise Exception("No valid path found")
+        targets = []
+        for goal in goals:
+            try:
+                targets.append(graph.node_id(goal))
+            except KeyError:
+                targets.append(-1)
+        return source, np.array(targets, dtype=np.intp)
+
+    def search(self, graph, source, targets, edge_costs, remaining_costs=None):
+        """
+        Run Dijkstra, or A* when remaining costs are given, from the source until every
+        target is settled or no reachable node is left.
+
+        The search runs on the CSR arrays of a `CompactGraph` and relaxes all edges of an
+        expanded node at once.
 
         Parameters:
+        - graph (CompactGraph): The searched graph.
+        - source (int): The id of the starting node.
+        - targets (list): The ids of the target nodes.
+        - edge_costs (np.ndarray): The travel cost of each edge, aligned with `graph.indices`.
+        - remaining_costs (np.ndarray): The estimated remaining cost of each node, or None.
+
+        Returns:
+        - tuple: The arrays of the travel cost of each node, final for the targets and
+          infinite for the nodes not reached, and of the parent id of each reached node.
+        """
+        indptr = graph.indptr_list()
+        indices = graph.indices
+        costs = np.full(graph.number_of_nodes(), np.inf)
+        parents = np.full(graph.number_of_nodes(), -1, dtype=np.intp)
+        expanded = np.zeros(graph.number_of_nodes(), dtype=bool)
+        is_target = np.zeros(graph.number_of_nodes(), dtype=bool)
+        is_target[targets] = True
+        pending_targets = int(np.count_nonzero(is_target))
+        self.nodes_expanded = 0
+
+        costs[source] = 0
+        pq = [(0.0 if remaining_costs is None else float(remaining_costs[source]), source)]
+        self.nodes_pushed = 1
+        while pq and pending_targets > 0:
+            _, current_node = heappop(pq)
+            # Skip queue entries superseded by a cheaper one
+            if expanded[current_node]:
+                continue
+            expanded[current_node] = True
+            self.nodes_expanded += 1
+
+            if is_target[current_node]:
+                pending_targets -= 1
+                if pending_targets == 0:
+                    break
+
+            first, last = indptr[current_node], indptr[current_node + 1]
+            neighbors = indices[first:last]
+            estimated_costs = costs[current_node] + edge_costs[first:last]
+            improved = estimated_costs < costs[neighbors]
+            if not improved.any():
+                continue
+            neighbors = neighbors[improved]
+            estimated_costs = estimated_costs[improved]
+            costs[neighbors] = estimated_costs
+            parents[neighbors] = current_node
+            if remaining_costs is not None:
+                estimated_costs = estimated_costs + remaining_costs[neighbors]
+            for priority, neighbor in zip(estimated_costs.tolist(), neighbors.tolist()):
+                heappush(pq, (priority, neighbor))
+            self.nodes_pushed += len(neighbors)
+
+        self.nodes_popped = self.nodes_pushed - len(pq)
+        # Nodes reached but not settled hold no final cost
+        costs[~expanded] = np.inf
+        return costs, parents
+
+    def prepare_landmarks(self, graph, mass, max_acceleration, landmark_count=DEFAULT_LANDMARK_COUNT):
+        """
+        Build the landmark index of a graph for ALT searches, with one full Dijkstra
+        search per landmark. Graphs linked from the indexed graph, such as the obstacle
+        graph with a query's start and goal, share its index.
+
+        Parameters:
+        - graph (CompactGraph): The graph to index.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+        - landmark_count (int): The maximum number of landmarks.
+
+        Returns:
+        - LandmarkIndex: The built index, also used by the next ALT searches.
+        """
+        edge_costs = self.pathStrategy.prepare_graph(graph, mass, max_acceleration)
+        nodes = np.arange(graph.number_of_nodes())
+        self.landmark_index = LandmarkIndex.build(
+            graph, self.pathStrategy.cost_key(mass, max_acceleration),
+            lambda landmark: self.search(graph, landmark, nodes, edge_costs)[0], landmark_count)
+        return self.landmark_index
+
+    def get_landmark_index(self, graph, mass, max_acceleration):
+        """
+        Return the landmark index covering a graph, building it if the current index
+        does not apply to the graph or the travel costs.
+
+        Parameters:
+        - graph (CompactGraph): The searched graph.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+
+        Returns:
+        - LandmarkIndex: The landmark index.
+        """
+        cost_key = self.pathStrategy.cost_key(mass, max_acceleration)
+        if self.landmark_index is None or not self.landmark_index.covers(graph, cost_key):
+            self.prepare_landmarks(graph if graph.base is None else graph.base,
+                                   mass, max_acceleration)
+        return self.landmark_index
+
+    def bidirectional_search(self, graph, source, target, edge_costs, potentials=None):
+        """
+        Run Dijkstra, or A* when potentials are given, from the source and from the
+        target at once, always expanding the side with the smaller queue key. The
+        edge costs must be symmetric, so both searches share them.
+
+        Each expanded node checks its edges towards nodes reached by the other side,
+        keeping the cheapest connection found. The search stops once the smallest keys
+        of both queues add up to at least that cost: with potentials p for the forward
+        and -p for the backward search, any path not found yet costs at least as much.
+
+        Parameters:
+        - graph (CompactGraph): The searched graph.
+        - source (int): The id of the starting node.
+        - target (int): The id of the target node.
+        - edge_costs (np.ndarray): The travel cost of each edge, aligned with `graph.indices`.
+        - potentials (np.ndarray): The potential of each node for the forward search, see
+          `estimate_potentials`, or None.
+
+        Returns:
+        - tuple: The travel cost from source to target, infinite if there is no path,
+          and the list of the node ids on the path.
+        """
+        indptr = graph.indptr_list()
+        indices = graph.indices
+        node_count = graph.number_of_nodes()
+        costs = (np.full(node_count, np.inf), np.full(node_count, np.inf))
+        parents = (np.full(node_count, -1, dtype=np.intp), np.full(node_count, -1, dtype=np.intp))
+        expanded = (np.zeros(node_count, dtype=bool), np.zeros(node_count, dtype=bool))
+        if potentials is None:
+            potentials = np.zeros(node_count)
+        potentials = (potentials, -potentials)
+        self.nodes_expanded = 0
+        self.nodes_pushed = self.nodes_popped = 0
+        if source == target:
+            return 0.0, [source]
+
+        costs[0][source] = 0
+        costs[1][target] = 0
+        queues = ([(float(potentials[0][source]), source)],
+                  [(float(potentials[1][target]), target)])
+        self.nodes_pushed = 2
+        best_cost = np.inf
+        meeting = None
+        # Once a queue is empty, its side has settled the target or there is no path
+        while queues[0] and queues[1]:
+            if queues[0][0][0] + queues[1][0][0] >= best_cost:
+                break
+            side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+            _, current_node = heappop(queues[side])
+            # Skip queue entries superseded by a cheaper one
+            if expanded[side][current_node]:
+                continue
+            expanded[side][current_node] = True
+            self.nodes_expanded += 1
+
+            first, last = indptr[current_node], indptr[current_node + 1]
+            neighbors = indices[first:last]
+            if len(neighbors) == 0:
+                continue
+            estimated_costs = costs[side][current_node] + edge_costs[first:last]
+            connections = estimated_costs + costs[1 - side][neighbors]
+            closest = int(np.argmin(connections))
+            if connections[closest] < best_cost:
+                best_cost = float(connections[closest])
+                meeting = (current_node, int(neighbors[closest]))
+                if side == 1:
+                    meeting = meeting[::-1]
+
+            improved = estimated_costs < costs[side][neighbors]
+            if not improved.any():
+                continue
+            neighbors = neighbors[improved]
+            estimated_costs = estimated_costs[improved]
+            costs[side][neighbors] = estimated_costs
+            parents[side][neighbors] = current_node
+            estimated_costs = estimated_costs + potentials[side][neighbors]
+            for priority, neighbor in zip(estimated_costs.tolist(), neighbors.tolist()):
+                heappush(queues[side], (priority, neighbor))
+            self.nodes_pushed += len(neighbors)
+
+        self.nodes_popped = self.nodes_pushed - len(queues[0]) - len(queues[1])
+        if meeting is None:
+            return np.inf, []
+        forward_node, backward_node = meeting
+        path = []
+        while forward_node != -1:
+            path.append(forward_node)
+            forward_node = parents[0][forward_node]
+        path.reverse()
+        while backward_node != -1:
+            path.append(backward_node)
+            backward_node = parents[1][backward_node]
+        return best_cost, [int(node) for node in path]
+
+    def estimate_potentials(self, graph, start, goal, mass, max_acceleration):
+        """
+        Estimate the potential of every node for a bidirectional search: half the
+        difference of the heuristics to the goal and to the start for A*, None (zero
+        everywhere) for Dijkstra. The backward search uses the opposite potentials, so
+        both searches see the same non-negative reduced edge costs.
+
+        Parameters:
+        - graph (CompactGraph): The searched graph.
         - start (tuple): The starting point coordinates.
-        - node (tuple): The ending point coordinates.
-        - parents (dict): A dictionary of node-parent relationships.
+        - goal (tuple): The goal point coordinates.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+
+        Returns:
+        - np.ndarray: The forward potential of each node, or None.
+        """
+        if self.algorithm == 'bidirectional_astar':
+            to_goal = self.pathStrategy.heuristics(graph.coordinates, goal, mass, max_acceleration)
+            to_start = self.pathStrategy.heuristics(graph.coordinates, start, mass, max_acceleration)
+            return (to_goal - to_start) / 2
+        return None
+
+    def estimate_remaining_costs(self, graph, goal, mass, max_acceleration):
+        """
+        Estimate the remaining cost from every node to the goal: the heuristic of the
+        path strategy for A* and ALT, None (zero everywhere) for Dijkstra.
+
+        Parameters:
+        - graph (CompactGraph): The searched graph.
+        - goal (tuple): The goal point coordinates.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+
+        Returns:
+        - np.ndarray: The estimated remaining cost of each node, or None.
+        """
+        if self.algorithm in ('astar', 'alt'):
+            return self.pathStrategy.heuristics(graph.coordinates, goal, mass, max_acceleration)
+        return None
+
+    def reconstruct_path(self, graph, start, node, parents):
+        """
+        Reconstruct the path from start to node using the parent nodes.
+
+        Parameters:
+        - graph (CompactGraph): The searched graph.
+        - start (int): The id of the starting node.
+        - node (int): The id of the ending node.
+        - parents (np.ndarray): The parent id of each reached node.
 
         Returns:
         - list: The reconstructed path as a list of points.
         """
         path = []
-        while node in parents:
-            path.append(list(map(float, node)))
+        while node != start:
+            path.append(graph.coordinates[node].tolist())
             node = parents[node]
-        path.append(list(map(float, start)))
-        return path[::-1]
\ No newline at end of file
+        path.append(graph.coordinates[start].tolist())
+        return path[::-1]
@@ -0,0 +1,402 @@
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from pathfind.configuration import Configuration
+from pathfind.main import add_scene_arguments, apply_scene_arguments
+from pathfind.obstacle_course import ObstacleCourse
+
+LOGGER = logging.getLogger('server')
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+
+# Default number of scenes each worker keeps built in memory
+DEFAULT_MAX_SCENES = 16
+
+# Bound of the size of a request body, in bytes
+MAX_BODY_SIZE = 1 << 20
+
+HTTP_REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Content Too Large',
+    422: 'Unprocessable Content',
+    500: 'Internal Server Error',
+    503: 'Service Unavailable',
+}
+
+# The scenes of a worker process, set when the worker starts
+_scene_cache = None
+
+
+class SceneCache:
+    def __init__(self, scene_paths, max_scenes=DEFAULT_MAX_SCENES, scene_arguments=None):
+        """
+        Initialize a least recently used cache of obstacle courses, each loaded from its
+        configuration file with its obstacle graph built on first use.
+
+        Parameters:
+        - scene_paths (dict): The path to the configuration file of each scene name.
+        - max_scenes (int): The number of obstacle courses kept in memory.
+        - scene_arguments (argparse.Namespace): The command line options overriding the
+          configurations, see `pathfind.main.add_scene_arguments`, or None.
+        """
+        self.scene_paths = scene_paths
+        self.max_scenes = max_scenes
+        self.scene_arguments = scene_arguments
+        self.obstacle_courses = OrderedDict()
+
+    def get(self, name):
+        """
+        Return the obstacle course of a scene, loading it if it is not cached and
+        evicting the least recently used course if the cache is full.
+
+        Parameters:
+        - name (str): The scene name.
+
+        Returns:
+        - ObstacleCourse: The obstacle course, ready for queries.
+
+        Raises:
+        - KeyError: If the scene is unknown.
+        """
+        if name in self.obstacle_courses:
+            self.obstacle_courses.move_to_end(name)
+            return self.obstacle_courses[name]
+
+        obstacle_course = self.load(name)
+        self.obstacle_courses[name] = obstacle_course
+        if len(self.obstacle_courses) > self.max_scenes:
+            evicted, _ = self.obstacle_courses.popitem(last=False)
+            LOGGER.info(f"Evicted the scene '{evicted}'.")
+        return obstacle_course
+
+    def load(self, name):
+        """
+        Load the obstacle course of a scene and build, or load from the graph cache,
+        what its queries share.
+
+        Parameters:
+        - name (str): The scene name.
+
+        Returns:
+        - ObstacleCourse: The obstacle course.
+
+        Raises:
+        - KeyError: If the scene is unknown.
+        """
+        config = Configuration(self.scene_paths[name])
+        if self.scene_arguments is not None:
+            apply_scene_arguments(config, self.scene_arguments)
+        obstacle_course = ObstacleCourse(config)
+        obstacle_course.prepare_queries()
+        return obstacle_course
+
+
+class PathServer:
+    def __init__(self, scene_paths, workers=1, max_scenes=DEFAULT_MAX_SCENES, scene_arguments=None):
+        """
+        Initialize a path-planning server answering start and goal queries over HTTP.
+
+        The event loop only parses requests; the searches run in a pool of worker
+        processes, each keeping its own `SceneCache`. With the graph cache enabled, the
+        workers memory-map the graphs built once at startup.
+
+        Parameters:
+        - scene_paths (dict): The path to the configuration file of each scene name.
+        - workers (int): The number of worker processes.
+        - max_scenes (int): The number of obstacle courses each worker keeps in memory.
+        - scene_arguments (argparse.Namespace): The command line options overriding the
+          configurations, or None.
+        """
+        self.scene_paths = scene_paths
+        self.workers = workers
+        self.max_scenes = max_scenes
+        self.scene_arguments = scene_arguments
+        self.executor = None
+
+    def load_scenes(self):
+        """
+        Load every scene once, validating its configuration and storing its obstacle
+        graph in the graph cache, so that workers start from the cache.
+
+        Raises:
+        - Exception: If a scene fails to load.
+        """
+        scene_cache = SceneCache(self.scene_paths, 1, self.scene_arguments)
+        for name in self.scene_paths:
+            scene_cache.load(name)
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_socket=None):
+        """
+        Start the worker pool and listen for connections.
+
+        Parameters:
+        - host (str): The host to listen on.
+        - port (int): The TCP port to listen on, 0 for any free port.
+        - unix_socket (str): The path of a Unix socket to listen on instead of TCP.
+
+        Returns:
+        - asyncio.Server: The listening server.
+        """
+        self.start_workers()
+        if unix_socket is not None:
+            return await asyncio.start_unix_server(self.handle_connection, unix_socket)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def start_workers(self):
+        """
+        Start a new worker pool.
+        """
+        # The workers load their scenes themselves, so they need no inherited state
+        self.executor = ProcessPoolExecutor(
+            self.workers, mp_context=multiprocessing.get_context('spawn'),
+            initializer=_set_scene_cache,
+            initargs=(self.scene_paths, self.max_scenes, self.scene_arguments))
+
+    def close(self):
+        """
+        Stop the worker pool.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    async def handle_connection(self, reader, writer):
+        """
+        Answer the HTTP/1.1 requests of a connection, one at a time, until the client
+        closes it or asks to.
+
+        Parameters:
+        - reader (asyncio.StreamReader): The connection input.
+        - writer (asyncio.StreamWriter): The connection output.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self.send(writer, 400, {'error': 'Malformed request line.'}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+
+                try:
+                    length = int(headers.get('content-length', 0))
+                except ValueError:
+                    length = -1
+                if not 0 <= length <= MAX_BODY_SIZE:
+                    await self.send(writer, 413 if length > 0 else 400,
+                                    {'error': 'Invalid request body length.'}, False)
+                    break
+                body = await reader.readexactly(length)
+
+                status, payload = await self.handle_request(method, target, body)
+                await self.send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, method, target, body):
+        """
+        Route a request.
+
+        The routes are `GET /health`, `GET /scenes` and `POST /scenes/<name>/path` with a
+        JSON body holding the `start` and `goal` points.
+
+        Parameters:
+        - method (str): The HTTP method.
+        - target (str): The request target.
+        - body (bytes): The request body.
+
+        Returns:
+        - tuple: The HTTP status and the JSON payload of the response.
+        """
+        parts = target.split('?', 1)[0].strip('/').split('/')
+        if parts == ['health']:
+            return (200, {'status': 'ok'}) if method == 'GET' else (405, {'error': 'Use GET.'})
+        if parts == ['scenes']:
+            return (200, {'scenes': sorted(self.scene_paths)}) if method == 'GET' else \
+                (405, {'error': 'Use GET.'})
+        if len(parts) != 3 or parts[0] != 'scenes' or parts[2] != 'path':
+            return 404, {'error': f"Unknown resource '{target}'."}
+        if method != 'POST':
+            return 405, {'error': 'Use POST.'}
+        if parts[1] not in self.scene_paths:
+            return 404, {'error': f"Unknown scene '{parts[1]}'."}
+
+        try:
+            query = json.loads(body)
+            start, goal = parse_point(query['start']), parse_point(query['goal'])
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {'error': f"Expected a JSON object with the start and goal points. {e}"}
+
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        try:
+            return await loop.run_in_executor(executor, _find_path, parts[1], start, goal)
+        except BrokenProcessPool:
+            # A worker died, failing every pending search of the pool. The first request
+            # to notice replaces the pool, so that later requests are answered again
+            if self.executor is executor:
+                LOGGER.error("A worker process terminated abruptly, restarting the workers.")
+                executor.shutdown(wait=False, cancel_futures=True)
+                self.start_workers()
+            return 503, {'error': 'A worker process terminated abruptly. Retry the query.'}
+
+    async def send(self, writer, status, payload, keep_alive):
+        """
+        Write a JSON response.
+
+        Parameters:
+        - writer (asyncio.StreamWriter): The connection output.
+        - status (int): The HTTP status.
+        - payload (dict): The response content.
+        - keep_alive (bool): Whether the connection stays open.
+        """
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body)
+        await writer.drain()
+
+
+def parse_point(value):
+    """
+    Parse a point of a query.
+
+    Parameters:
+    - value (list): The x and y coordinates.
+
+    Returns:
+    - list: The coordinates as floats.
+
+    Raises:
+    - ValueError: If the value is not a pair of numbers.
+    """
+    if not isinstance(value, list) or len(value) != 2:
+        raise ValueError(f"Invalid point {value!r}.")
+    return [float(coordinate) for coordinate in value]
+
+
+def main(argv=None):
+    """
+    Run the path-planning server until interrupted.
+
+    Parameters:
+    - argv (list): The command line arguments after `serve`.
+    """
+    parser = argparse.ArgumentParser(
+        prog='pathfinder serve', description='Serve shortest path queries over HTTP')
+    parser.add_argument('scenes', nargs='+',
+                        help='YAML configuration files of the scenes, each served under its '
+                             'file name without extension')
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help='Host to listen on')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help='TCP port to listen on, 0 for any free port')
+    parser.add_argument('--unix-socket',
+                        help='Path of a Unix socket to listen on instead of TCP')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of worker processes running the searches')
+    parser.add_argument('--max-scenes', type=int, default=DEFAULT_MAX_SCENES,
+                        help='Number of scenes each worker keeps built in memory')
+    add_scene_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.workers < 1 or args.max_scenes < 1:
+        LOGGER.error("The numbers of workers and scenes must be at least 1.")
+        sys.exit(1)
+    scene_paths = {}
+    for path in args.scenes:
+        name = os.path.splitext(os.path.basename(path))[0]
+        if name in scene_paths:
+            LOGGER.error(f"Two scenes are named '{name}'.")
+            sys.exit(1)
+        scene_paths[name] = path
+
+    server = PathServer(scene_paths, args.workers, args.max_scenes, args)
+    try:
+        server.load_scenes()
+    except Exception as e:
+        LOGGER.error(f"Failed to load the scenes. {e}")
+        sys.exit(1)
+    try:
+        asyncio.run(serve(server, args.host, args.port, args.unix_socket))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+async def serve(server, host, port, unix_socket):
+    """
+    Start a server and serve until SIGTERM or Ctrl-C, announcing its address on stdout.
+
+    Parameters:
+    - server (PathServer): The server.
+    - host (str): The host to listen on.
+    - port (int): The TCP port to listen on.
+    - unix_socket (str): The path of a Unix socket to listen on instead of TCP.
+    """
+    listener = await server.start(host, port, unix_socket)
+    if unix_socket is not None:
+        address = unix_socket
+    else:
+        host, port = listener.sockets[0].getsockname()[:2]
+        address = f'http://{host}:{port}'
+    print(f"Serving {len(server.scene_paths)} scenes on {address}", flush=True)
+    # Stop on SIGTERM as on Ctrl-C, so that the worker pool shuts down cleanly
+    loop = asyncio.get_running_loop()
+    stopped = asyncio.Event()
+    try:
+        loop.add_signal_handler(signal.SIGTERM, stopped.set)
+    except NotImplementedError:
+        pass
+    async with listener:
+        await stopped.wait()
+    loop.remove_signal_handler(signal.SIGTERM)
+
+
+def _set_scene_cache(scene_paths, max_scenes, scene_arguments):
+    global _scene_cache
+    _scene_cache = SceneCache(scene_paths, max_scenes, scene_arguments)
+
+
+def _find_path(scene, start, goal):
+    try:
+        obstacle_course = _scene_cache.get(scene)
+    except Exception as e:
+        return 500, {'error': f"Failed to load the scene '{scene}'. {e}"}
+    try:
+        return 200, {'path': obstacle_course.find_path_between(start, goal)}
+    except ValueError as e:
+        return 400, {'error': str(e)}
+    except Exception as e:
+        return 422, {'error': str(e)}
@@ -0,0 +1,274 @@
+from heapq import heappush, heappop
+
+import numpy as np
+
+from pathfind.pathfinder import Pathfinder
+from utils.graph_factory import link_endpoints
+
+
+class TiledPlanner:
+    def __init__(self, pathfinder: Pathfinder):
+        """
+        Initialize the hierarchical planner over a `TileMap`.
+
+        A query first searches the coarse graph of the portals between tiles, from the
+        start through the portals to the goal. Within a tile whose visibility graph is
+        built, the coarse edges cost the travel between the portals within the tile;
+        within the other tiles they cost the straight-line travel, which never
+        overestimates. The tiles crossed by the coarse path are built and the coarse
+        search repeated until it only crosses built tiles. The path is then refined by
+        searching the merged graphs of these corridor tiles only, so the work of a query
+        grows with the region it crosses rather than the whole space.
+
+        The paths cross the tile borders at portals, which then become path points. The
+        refined path is shortened to its cheapest subsequence of points that see each
+        other, but as every path point costs a stop in the fastest path mode, fastest
+        paths may cost noticeably more than on the visibility graph of the whole space,
+        while shortest paths cost about the same.
+
+        Parameters:
+        - pathfinder (Pathfinder): The pathfinder searching the tile graphs and the
+          corridor, with its path strategy and search algorithm.
+        """
+        self.pathfinder = pathfinder
+        # Number of nodes expanded, and of queue entries pushed and popped, by the
+        # coarse and the corridor searches of the last query
+        self.nodes_expanded = 0
+        self.nodes_pushed = 0
+        self.nodes_popped = 0
+        # Number of tiles built, and of coarse searches, by the last query
+        self.tiles_built = 0
+        self.coarse_searches = 0
+
+    def find_path(self, tile_map, start, goal, mass, max_acceleration):
+        """
+        Find the fastest path from start to goal considering the robot's mass and maximum acceleration.
+
+        Parameters:
+        - tile_map (TileMap): The tiling of the space.
+        - start (tuple): The starting point coordinates.
+        - goal (tuple): The goal point coordinates.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+
+        Returns:
+        - list: The fastest path as a list of points.
+
+        Raises:
+        - Exception: If no valid path is found.
+        """
+        start = tuple(map(float, start))
+        goal = tuple(map(float, goal))
+        tiles_built = tile_map.tiles_built
+        self.nodes_expanded = self.nodes_pushed = self.nodes_popped = 0
+        self.coarse_searches = 0
+        try:
+            corridor = self.find_corridor(tile_map, start, goal, mass, max_acceleration)
+            graph = link_endpoints(tile_map.corridor_graph(corridor), [start, goal],
+                                   tile_map.obstacles, index=tile_map.index)
+            path = self.pathfinder.find_path(graph, start, goal, mass, max_acceleration)
+            self.count_search(self.pathfinder)
+            return self.shorten_path(path, tile_map.index, mass, max_acceleration)
+        finally:
+            self.tiles_built = tile_map.tiles_built - tiles_built
+            tile_map.trim()
+
+    def find_corridor(self, tile_map, start, goal, mass, max_acceleration):
+        """
+        Find the tiles crossed by the cheapest coarse path, building tiles until the
+        coarse path only crosses built tiles.
+
+        Parameters:
+        - tile_map (TileMap): The tiling of the space.
+        - start (tuple): The starting point coordinates.
+        - goal (tuple): The goal point coordinates.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+
+        Returns:
+        - list: The (row, column) of the corridor tiles, from the start to the goal.
+
+        Raises:
+        - Exception: If no valid path is found.
+        """
+        start_tile = tile_map.tile_of(start)
+        goal_tile = tile_map.tile_of(goal)
+        # The travel costs within their tiles from the start to the portals and the goal,
+        # and from the goal to the portals
+        targets = [tuple(portal) for portal in tile_map.get_portals(start_tile)[0].tolist()]
+        if goal_tile == start_tile:
+            targets.append(goal)
+        start_costs = dict(zip(targets, tile_map.get_tile(start_tile).find_costs_from(
+            start, targets, self.pathfinder, mass, max_acceleration).tolist()))
+        self.count_search(self.pathfinder)
+        targets = [tuple(portal) for portal in tile_map.get_portals(goal_tile)[0].tolist()]
+        goal_costs = dict(zip(targets, tile_map.get_tile(goal_tile).find_costs_from(
+            goal, targets, self.pathfinder, mass, max_acceleration).tolist()))
+        self.count_search(self.pathfinder)
+
+        while True:
+            corridor = self.coarse_search(tile_map, start, goal, start_costs, goal_costs,
+                                          mass, max_acceleration)
+            if corridor is None:
+                raise Exception("No valid path found")
+            unbuilt = [tile for tile in corridor if tile not in tile_map.tiles]
+            if not unbuilt:
+                return corridor
+            for tile in unbuilt:
+                tile_map.get_tile(tile)
+
+    def coarse_search(self, tile_map, start, goal, start_costs, goal_costs, mass, max_acceleration):
+        """
+        Run A* on the coarse graph from the start to the goal, guided by the heuristic of
+        the path strategy.
+
+        Parameters:
+        - tile_map (TileMap): The tiling of the space.
+        - start (tuple): The starting point coordinates.
+        - goal (tuple): The goal point coordinates.
+        - start_costs (dict): The travel cost from the start to the portals of its tile,
+          and to the goal if it lies in the same tile.
+        - goal_costs (dict): The travel cost from the goal to the portals of its tile.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+
+        Returns:
+        - list: The (row, column) of the tiles crossed by the coarse path, from the start
+          to the goal, or None if the goal is not reachable.
+        """
+        strategy = self.pathfinder.pathStrategy
+        goal_tile = tile_map.tile_of(goal)
+        costs = {start: 0.0}
+        # The previous node of each reached node and the tile of the edge between them
+        parents = {start: (None, tile_map.tile_of(start))}
+        expanded = set()
+        pq = [(float(strategy.heuristic(start, goal, mass, max_acceleration)), start)]
+        self.coarse_searches += 1
+        self.nodes_pushed += 1
+        popped = 0
+        while pq:
+            _, node = heappop(pq)
+            popped += 1
+            # Skip queue entries superseded by a cheaper one
+            if node in expanded:
+                continue
+            expanded.add(node)
+            self.nodes_expanded += 1
+            if node == goal:
+                break
+
+            for tile, neighbors, edge_costs in self.coarse_edges(
+                    tile_map, node, start, goal, goal_tile, start_costs, goal_costs, mass,
+                    max_acceleration):
+                estimated_costs = costs[node] + edge_costs
+                points = [tuple(point) for point in neighbors.tolist()]
+                improved = [k for k, (point, cost) in enumerate(zip(points, estimated_costs.tolist()))
+                            if cost < costs.get(point, np.inf) and point not in expanded]
+                if not improved:
+                    continue
+                priorities = estimated_costs[improved] + strategy.heuristics(
+                    neighbors[improved], goal, mass, max_acceleration)
+                for k, priority in zip(improved, priorities.tolist()):
+                    costs[points[k]] = float(estimated_costs[k])
+                    parents[points[k]] = (node, tile)
+                    heappush(pq, (priority, points[k]))
+                self.nodes_pushed += len(improved)
+        self.nodes_popped += popped
+
+        if goal not in expanded:
+            return None
+        corridor = []
+        node = goal
+        while node is not None:
+            node, tile = parents[node]
+            if tile not in corridor:
+                corridor.append(tile)
+        return corridor[::-1]
+
+    def coarse_edges(self, tile_map, node, start, goal, goal_tile, start_costs, goal_costs,
+                     mass, max_acceleration):
+        """
+        Generate the coarse edges of a node, grouped by the tile they cross.
+
+        Parameters:
+        - tile_map (TileMap): The tiling of the space.
+        - node (tuple): The start or a portal.
+        - start (tuple): The starting point coordinates.
+        - goal (tuple): The goal point coordinates.
+        - goal_tile (tuple): The tile of the goal.
+        - start_costs (dict): The travel cost from the start to the portals of its tile.
+        - goal_costs (dict): The travel cost from the goal to the portals of its tile.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+
+        Yields:
+        - tuple: The tile, the (K, 2) nodes reached through it and the array of the
+          travel costs to them, infinite for nodes not connected within the tile.
+        """
+        if node == start:
+            points = list(start_costs)
+            yield (tile_map.tile_of(start), np.array(points, dtype=float).reshape(-1, 2),
+                   np.array([start_costs[point] for point in points]))
+            return
+
+        for tile in tile_map.tiles_of_portal(node):
+            portals, portal_ids = tile_map.get_portals(tile)
+            if tile in tile_map.tiles:
+                edge_costs = tile_map.tiles[tile].find_portal_costs(
+                    self.pathfinder, mass, max_acceleration)[portal_ids[node]]
+            else:
+                distances = np.hypot(portals[:, 0] - node[0], portals[:, 1] - node[1])
+                edge_costs = self.pathfinder.pathStrategy.calculate_travel_costs(
+                    distances, mass, max_acceleration)
+            if tile == goal_tile:
+                portals = np.concatenate((portals, [goal]))
+                edge_costs = np.append(edge_costs, goal_costs[node])
+            yield tile, portals, edge_costs
+
+    def shorten_path(self, path, index, mass, max_acceleration):
+        """
+        Shorten a path to its cheapest subsequence of points whose consecutive points see
+        each other. The lines of sight between all pairs of path points are tested at
+        once, and the cheapest subsequence is found in one pass over the points.
+
+        Parameters:
+        - path (list): The path as a list of points.
+        - index (ObstacleIndex): The line-crossing index of the obstacles.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+
+        Returns:
+        - list: The shortened path as a list of points.
+        """
+        points = np.array(path, dtype=float)
+        firsts, seconds = np.triu_indices(len(points), k=2)
+        blocked = index.find_blocked_segments(points[firsts], points[seconds])
+        visible = np.eye(len(points), k=1, dtype=bool)
+        visible[firsts, seconds] = ~blocked
+        distances = np.hypot(*(points[:, None] - points[None]).transpose(2, 0, 1))
+        travel_costs = self.pathfinder.pathStrategy.calculate_travel_costs(
+            distances.ravel(), mass, max_acceleration).reshape(distances.shape)
+        travel_costs[~visible] = np.inf
+
+        costs = np.full(len(points), np.inf)
+        parents = np.zeros(len(points), dtype=np.intp)
+        costs[0] = 0
+        for following in range(1, len(points)):
+            candidates = costs[:following] + travel_costs[:following, following]
+            parents[following] = np.argmin(candidates)
+            costs[following] = candidates[parents[following]]
+        shortened = [len(points) - 1]
+        while shortened[-1] != 0:
+            shortened.append(parents[shortened[-1]])
+        return [path[k] for k in shortened[::-1]]
+
+    def count_search(self, searcher):
+        """
+        Add the work of the last search of a searcher to the work of the query.
+
+        Parameters:
+        - searcher (Pathfinder): The searcher that ran the search.
+        """
+        self.nodes_expanded += searcher.nodes_expanded
+        self.nodes_pushed += searcher.nodes_pushed
+        self.nodes_popped += searcher.nodes_popped
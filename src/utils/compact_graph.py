@@ -0,0 +1,287 @@
+import numpy as np
+
+
+class CompactGraph:
+    def __init__(self, coordinates, indptr, indices, weights, graph=None, corners=None):
+        """
+        Initialize a compact undirected graph stored as CSR adjacency arrays.
+
+        Nodes are identified by integers. The neighbours of node u are
+        `indices[indptr[u]:indptr[u + 1]]` and the lengths of the edges to them are the
+        matching slice of `weights`. Every edge is stored once in each direction.
+
+        Parameters:
+        - coordinates (np.ndarray): The (N, 2) float64 coordinates of the nodes.
+        - indptr (np.ndarray): The (N + 1,) offsets of each node's neighbours.
+        - indices (np.ndarray): The neighbour ids of all nodes, concatenated.
+        - weights (np.ndarray): The float64 lengths of the edges, aligned with `indices`.
+        - graph (dict): Graph level attributes, such as pruning statistics.
+        - corners (np.ndarray): The (N, 2, 2) obstacle corner of each node, NaN for free
+          points, used to link points into a reduced graph.
+        """
+        self.coordinates = coordinates
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.graph = graph if graph is not None else {}
+        self.corners = corners if corners is not None else \
+            np.full((len(coordinates), 2, 2), np.nan)
+        # Travel costs per strategy and parameters, aligned with `indices`
+        self.edge_costs = {}
+        # The graph this one was linked from, and the mask of the edges added to it
+        self.base = None
+        self.added_edges = None
+        self._node_ids = None
+        self._indptr_list = None
+
+    @classmethod
+    def from_edges(cls, points, sources, targets, graph=None, corners=None):
+        """
+        Create a compact graph from a list of points and the pairs of points to connect.
+
+        Points with equal coordinates are merged into a single node, in order of first
+        appearance, and the edges between them are dropped. A merged node has no corner.
+
+        Parameters:
+        - points (list): The node points.
+        - sources (np.ndarray): The indices in `points` of the first ends of the edges.
+        - targets (np.ndarray): The indices in `points` of the second ends of the edges.
+        - graph (dict): Graph level attributes.
+        - corners (np.ndarray): The (len(points), 2, 2) obstacle corner of each point.
+
+        Returns:
+        - CompactGraph: The created graph.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        coordinates, first_index, node_of_point = np.unique(
+            points, axis=0, return_index=True, return_inverse=True)
+        # Number the nodes by first appearance rather than by sorted coordinates
+        appearance = np.argsort(first_index, kind='stable')
+        rank = np.empty_like(appearance)
+        rank[appearance] = np.arange(len(appearance))
+        coordinates = coordinates[appearance]
+        node_of_point = rank[node_of_point.reshape(-1)]
+        if corners is not None:
+            corners = np.array(corners[first_index[appearance]], dtype=float)
+            merged = np.bincount(node_of_point, minlength=len(coordinates)) > 1
+            corners[merged] = np.nan
+
+        sources = node_of_point[np.asarray(sources, dtype=np.intp)]
+        targets = node_of_point[np.asarray(targets, dtype=np.intp)]
+        keep = sources != targets
+        pairs = np.unique(np.sort(np.stack((sources[keep], targets[keep]), axis=1), axis=1),
+                          axis=0).reshape(-1, 2)
+        return cls.from_unique_edges(coordinates, pairs[:, 0], pairs[:, 1], graph, corners)
+
+    @classmethod
+    def from_unique_edges(cls, coordinates, sources, targets, graph=None, corners=None):
+        """
+        Create a compact graph from distinct node coordinates and distinct edges.
+
+        Parameters:
+        - coordinates (np.ndarray): The (N, 2) coordinates of the nodes.
+        - sources (np.ndarray): The ids of the first ends of the edges.
+        - targets (np.ndarray): The ids of the second ends of the edges.
+        - graph (dict): Graph level attributes.
+        - corners (np.ndarray): The (N, 2, 2) obstacle corner of each node.
+
+        Returns:
+        - CompactGraph: The created graph.
+        """
+        coordinates = np.ascontiguousarray(coordinates, dtype=np.float64)
+        node_count = len(coordinates)
+        rows = np.concatenate((sources, targets)).astype(np.int64)
+        columns = np.concatenate((targets, sources)).astype(np.int64)
+        order = np.lexsort((columns, rows))
+        rows, columns = rows[order], columns[order]
+
+        indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=node_count), out=indptr[1:])
+        indices = columns.astype(np.int32 if node_count < 2**31 else np.int64)
+        weights = np.linalg.norm(
+            coordinates[rows] - coordinates[columns], axis=1)
+        return cls(coordinates, indptr, indices, weights, graph, corners)
+
+    @classmethod
+    def from_networkx(cls, G):
+        """
+        Create a compact graph from a networkx graph with point nodes.
+
+        Parameters:
+        - G (nx.Graph): The graph, with nodes given as coordinate tuples.
+
+        Returns:
+        - CompactGraph: The created graph.
+        """
+        points = list(G.nodes)
+        node_ids = {node: index for index, node in enumerate(points)}
+        edges = np.array([(node_ids[u], node_ids[v]) for u, v in G.edges],
+                         dtype=np.intp).reshape(-1, 2)
+        return cls.from_edges(points, edges[:, 0], edges[:, 1], dict(G.graph))
+
+    def link(self, points, sources, targets):
+        """
+        Create a graph extending this one with new nodes and edges, such as the start and
+        goal of a query linked into a cached obstacle graph. This graph is left unchanged
+        and its cached edge costs are reused by the new graph.
+
+        Parameters:
+        - points (np.ndarray): The (K, 2) coordinates of the new nodes, which get the ids
+          N to N + K - 1.
+        - sources (np.ndarray): The ids of the first ends of the new edges.
+        - targets (np.ndarray): The ids of the second ends of the new edges.
+
+        Returns:
+        - CompactGraph: The extended graph.
+        """
+        node_count = self.number_of_nodes()
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        coordinates = np.concatenate((self.coordinates, points))
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        rows = np.concatenate((sources, targets))
+        columns = np.concatenate((targets, sources))
+        order = np.argsort(rows, kind='stable')
+        rows, columns = rows[order], columns[order]
+
+        # Append the new edges of each existing node at the end of its neighbours, and
+        # the neighbours of the new nodes after all the existing ones
+        counts = np.bincount(rows, minlength=len(coordinates))
+        counts[:node_count] += np.diff(self.indptr)
+        indptr = np.zeros(len(coordinates) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        positions = np.append(self.indptr[1:], np.full(
+            len(points), self.indptr[-1]))[rows]
+        indices = np.insert(self.indices, positions,
+                            columns.astype(self.indices.dtype))
+        weights = np.insert(self.weights, positions, np.linalg.norm(
+            coordinates[rows] - coordinates[columns], axis=1))
+
+        G = CompactGraph(coordinates, indptr, indices, weights, dict(self.graph),
+                         np.concatenate((self.corners, np.full((len(points), 2, 2), np.nan))))
+        G.base = self
+        G.added_edges = np.insert(
+            np.zeros(len(self.indices), dtype=bool), positions, True)
+        return G
+
+    def edge_cost_array(self, key, calculate_costs):
+        """
+        Return the travel cost of every edge, calculated from the edge lengths on first
+        use and cached under the given key. A linked graph only calculates the costs of
+        its added edges and takes the others from the graph it was linked from.
+
+        Parameters:
+        - key (tuple): The cache key, identifying the strategy and its parameters.
+        - calculate_costs (callable): A function mapping edge lengths to travel costs.
+
+        Returns:
+        - np.ndarray: The travel cost of each edge, aligned with `indices`.
+        """
+        if key not in self.edge_costs:
+            if self.base is None:
+                costs = calculate_costs(self.weights)
+            else:
+                costs = np.empty_like(self.weights)
+                costs[~self.added_edges] = self.base.edge_cost_array(
+                    key, calculate_costs)
+                costs[self.added_edges] = calculate_costs(
+                    self.weights[self.added_edges])
+            self.edge_costs[key] = costs
+        return self.edge_costs[key]
+
+    def to_networkx(self):
+        """
+        Export the graph as a networkx graph with coordinate tuple nodes and edge lengths
+        as the 'weight' attribute.
+
+        Returns:
+        - nx.Graph: The exported graph.
+        """
+        import networkx as nx
+
+        G = nx.Graph(**self.graph)
+        nodes = [tuple(point) for point in self.coordinates.tolist()]
+        G.add_nodes_from(nodes)
+        sources = np.repeat(np.arange(self.number_of_nodes()),
+                            np.diff(self.indptr))
+        upper = sources < self.indices
+        G.add_weighted_edges_from(
+            (nodes[u], nodes[v], weight) for u, v, weight in
+            zip(sources[upper].tolist(), self.indices[upper].tolist(), self.weights[upper]))
+        return G
+
+    def edge_arrays(self):
+        """
+        Return the undirected edges, each once.
+
+        Returns:
+        - tuple: The arrays (sources, targets) of the edge ends, with sources < targets.
+        """
+        sources = np.repeat(np.arange(self.number_of_nodes()),
+                            np.diff(self.indptr))
+        upper = sources < self.indices
+        return sources[upper], self.indices[upper].astype(np.int64)
+
+    def number_of_nodes(self):
+        """
+        Return the number of nodes.
+        """
+        return len(self.coordinates)
+
+    def number_of_edges(self):
+        """
+        Return the number of undirected edges.
+        """
+        return len(self.indices) // 2
+
+    @property
+    def nbytes(self):
+        """
+        Return the memory used by the graph arrays, in bytes.
+        """
+        return sum(array.nbytes for array in
+                   (self.coordinates, self.indptr, self.indices, self.weights, self.corners))
+
+    def node_id(self, point):
+        """
+        Look up the id of the node at the given coordinates.
+
+        Parameters:
+        - point (tuple): The coordinates of the node.
+
+        Returns:
+        - int: The node id.
+
+        Raises:
+        - KeyError: If there is no node at the coordinates.
+        """
+        point = tuple(map(float, point))
+        # A linked graph only indexes its own nodes and asks its base for the others
+        first_node = 0 if self.base is None else self.base.number_of_nodes()
+        if self._node_ids is None:
+            self._node_ids = {tuple(coordinates): first_node + index for index, coordinates
+                              in enumerate(self.coordinates[first_node:].tolist())}
+        if point in self._node_ids or self.base is None:
+            return self._node_ids[point]
+        return self.base.node_id(point)
+
+    def neighbors(self, node):
+        """
+        Return the ids of the neighbours of a node.
+
+        Parameters:
+        - node (int): The node id.
+
+        Returns:
+        - np.ndarray: The neighbour ids.
+        """
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def indptr_list(self):
+        """
+        Return the neighbour offsets as a Python list, which is faster to index one
+        element at a time than the NumPy array.
+        """
+        if self._indptr_list is None:
+            self._indptr_list = self.indptr.tolist()
+        return self._indptr_list
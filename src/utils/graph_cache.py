@@ -0,0 +1,217 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from utils.compact_graph import CompactGraph
+
+LOGGER = logging.getLogger('graph_cache')
+
+# Version of the cached graph layout and of the builders' output; bump it whenever
+# either changes so that stale entries are never loaded
+GRAPH_FORMAT_VERSION = 1
+
+# Default bound of the total size of a cache directory, in bytes
+DEFAULT_CACHE_SIZE = 1 << 30
+
+# Arrays of a cached graph, each stored as an .npy file
+GRAPH_ARRAYS = ('coordinates', 'indptr', 'indices', 'weights', 'corners')
+
+
+def default_cache_dir():
+    """
+    Return the default cache directory, under $XDG_CACHE_HOME or ~/.cache.
+
+    Returns:
+    - str: The path to the cache directory.
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'pathfinder')
+
+
+def scene_key(obstacles, x_space_size, y_space_size, builder, reduced):
+    """
+    Compute the cache key of the obstacle graph of a scene: a SHA-256 hash over a
+    canonical form of the obstacles, the space size, the builder and the graph version.
+
+    Parameters:
+    - obstacles (list): A list of shapely Polygon objects.
+    - x_space_size (int): The width of the space.
+    - y_space_size (int): The height of the space.
+    - builder (str): The name of the graph builder.
+    - reduced (bool): Whether the graph is the reduced visibility graph.
+
+    Returns:
+    - str: The hexadecimal key.
+    """
+    scene = {
+        'obstacles': [[[float(x), float(y)] for x, y in polygon.exterior.coords[:-1]]
+                      for polygon in obstacles],
+        'x_space_size': float(x_space_size),
+        'y_space_size': float(y_space_size),
+        'builder': builder,
+        'reduced': bool(reduced),
+        'version': GRAPH_FORMAT_VERSION,
+    }
+    canonical = json.dumps(scene, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def load_graph(cache_dir, key):
+    """
+    Load a cached graph, memory-mapping its arrays, and mark it as recently used.
+
+    Parameters:
+    - cache_dir (str): The path to the cache directory.
+    - key (str): The cache key of the graph.
+
+    Returns:
+    - CompactGraph: The cached graph, or None if it is not cached or unreadable.
+    """
+    entry = os.path.join(cache_dir, key)
+    if not os.path.isdir(entry):
+        return None
+
+    try:
+        arrays = [np.load(os.path.join(entry, f'{name}.npy'), mmap_mode='r')
+                  for name in GRAPH_ARRAYS]
+        with open(os.path.join(entry, 'graph.json'), 'r') as f:
+            attributes = json.load(f)
+    except (OSError, ValueError) as e:
+        LOGGER.warning(f"Ignoring the unreadable cached graph '{entry}'. {e}")
+        return None
+
+    os.utime(entry)
+    coordinates, indptr, indices, weights, corners = arrays
+    return CompactGraph(coordinates, indptr, indices, weights, attributes, corners)
+
+
+def store_graph(cache_dir, key, graph, max_size=DEFAULT_CACHE_SIZE):
+    """
+    Store a graph in the cache, then evict the least recently used graphs until the
+    cache fits its size bound. The graph is written to a temporary directory that is
+    renamed into place, so concurrent readers never see a partial entry.
+
+    Parameters:
+    - cache_dir (str): The path to the cache directory.
+    - key (str): The cache key of the graph.
+    - graph (CompactGraph): The graph to store.
+    - max_size (int): The bound of the total size of the cache, in bytes.
+    """
+    temporary = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temporary = tempfile.mkdtemp(dir=cache_dir, prefix='.tmp-')
+        for name in GRAPH_ARRAYS:
+            np.save(os.path.join(temporary, f'{name}.npy'), getattr(graph, name))
+        with open(os.path.join(temporary, 'graph.json'), 'w') as f:
+            json.dump(graph.graph, f)
+        entry = os.path.join(cache_dir, key)
+        # Replace an unreadable entry left behind by an earlier run
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(temporary, entry)
+    except OSError as e:
+        LOGGER.warning(f"Failed to store the graph in the cache '{cache_dir}'. {e}")
+        if temporary is not None:
+            shutil.rmtree(temporary, ignore_errors=True)
+        return
+
+    evict_graphs(cache_dir, max_size)
+
+
+def landmarks_file(cache_dir, key, cost_key):
+    """
+    Return the path of the landmark distances of a cached graph for some travel costs.
+
+    Parameters:
+    - cache_dir (str): The path to the cache directory.
+    - key (str): The cache key of the graph.
+    - cost_key (tuple): The travel costs of the distances, see `PathStrategy.cost_key`.
+
+    Returns:
+    - str: The path to the .npy file.
+    """
+    digest = hashlib.sha256(json.dumps(list(cost_key)).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, key, f'landmarks-{digest}.npy')
+
+
+def load_landmarks(cache_dir, key, cost_key):
+    """
+    Load the landmark distances stored with a cached graph, memory-mapped.
+
+    Parameters:
+    - cache_dir (str): The path to the cache directory.
+    - key (str): The cache key of the graph.
+    - cost_key (tuple): The travel costs of the distances.
+
+    Returns:
+    - np.ndarray: The (L, N) landmark distances, or None if they are not cached or unreadable.
+    """
+    path = landmarks_file(cache_dir, key, cost_key)
+    if not os.path.isfile(path):
+        return None
+    try:
+        return np.load(path, mmap_mode='r')
+    except (OSError, ValueError) as e:
+        LOGGER.warning(f"Ignoring the unreadable cached landmarks '{path}'. {e}")
+        return None
+
+
+def store_landmarks(cache_dir, key, cost_key, distances):
+    """
+    Store landmark distances with a cached graph, which they are evicted with. Nothing
+    is stored if the graph is not cached.
+
+    Parameters:
+    - cache_dir (str): The path to the cache directory.
+    - key (str): The cache key of the graph.
+    - cost_key (tuple): The travel costs of the distances.
+    - distances (np.ndarray): The (L, N) landmark distances.
+    """
+    path = landmarks_file(cache_dir, key, cost_key)
+    if not os.path.isdir(os.path.dirname(path)):
+        return
+    temporary = f'{path}.tmp-{os.getpid()}'
+    try:
+        with open(temporary, 'wb') as f:
+            np.save(f, distances)
+        os.replace(temporary, path)
+    except OSError as e:
+        LOGGER.warning(f"Failed to store the landmarks in the cache '{cache_dir}'. {e}")
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def evict_graphs(cache_dir, max_size):
+    """
+    Remove the least recently used graphs until the total size of the cache is within
+    the bound.
+
+    Parameters:
+    - cache_dir (str): The path to the cache directory.
+    - max_size (int): The bound of the total size of the cache, in bytes.
+    """
+    entries = []
+    for name in os.listdir(cache_dir):
+        entry = os.path.join(cache_dir, name)
+        if name.startswith('.') or not os.path.isdir(entry):
+            continue
+        try:
+            size = sum(file.stat().st_size for file in os.scandir(entry))
+            entries.append((os.stat(entry).st_mtime, size, entry))
+        except FileNotFoundError:
+            # Evicted by another process meanwhile
+            continue
+
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries):
+        if total_size <= max_size:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total_size -= size
+        LOGGER.info(f"Evicted the cached graph '{entry}'.")
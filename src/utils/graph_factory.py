@@ -1,10 +1,23 @@
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
-import networkx as nx
 from shapely import Point
-from shapely.geometry import LineString
 
+from utils.compact_graph import CompactGraph
+from utils.obstacle_index import ObstacleIndex, is_line_crossing_obstacles
+
+LOGGER = logging.getLogger('graph_factory')
+
+# Approximate number of candidate edges tested per vectorized chunk
+EDGE_CHUNK_SIZE = 200_000
+# Minimum number of chunks per thread, so that threads finishing early find work left
+CHUNKS_PER_THREAD = 4
 
-def create_graph(start, goal, obstacles, x_space_size, y_space_size):
+
+def create_graph(start, goal, obstacles, x_space_size, y_space_size, reduced=False):
     """
     Create a graph where nodes are points and edges are valid paths between points.
 
@@ -12,46 +25,941 @@ def create_graph(start, goal, obstacles, x_space_size, y_space_size):
     - start (tuple): The starting point coordinates.
     - goal (tuple): The goal point coordinates.
     - obstacles (list): A list of shapely Polygon objects.
+    - reduced (bool): If True, build the reduced visibility graph, see `reduce_nodes`.
+
+    Returns:
+    - nx.Graph: The created graph with nodes and edges.
+    """
+    return build_graph(start, goal, obstacles, x_space_size, y_space_size,
+                       'brute_force', reduced).to_networkx()
+
+
+def create_indexed_graph(start, goal, obstacles, x_space_size, y_space_size, reduced=False):
+    """
+    Create the same graph as `create_graph`, but test each candidate edge only against
+    the obstacles whose bounding boxes it overlaps, using a shapely STRtree.
+
+    Parameters:
+    - start (tuple): The starting point coordinates.
+    - goal (tuple): The goal point coordinates.
+    - obstacles (list): A list of shapely Polygon objects.
+    - x_space_size (int): The width of the space.
+    - y_space_size (int): The height of the space.
+    - reduced (bool): If True, build the reduced visibility graph, see `reduce_nodes`.
+
+    Returns:
+    - nx.Graph: The created graph with nodes and edges.
+    """
+    return build_graph(start, goal, obstacles, x_space_size, y_space_size,
+                       'strtree', reduced).to_networkx()
+
+
+def create_vectorized_graph(start, goal, obstacles, x_space_size, y_space_size, reduced=False):
+    """
+    Create the same graph as `create_graph`, testing the candidate edges in bulk with
+    the shapely array functions instead of one predicate call per node pair.
+
+    Parameters:
+    - start (tuple): The starting point coordinates.
+    - goal (tuple): The goal point coordinates.
+    - obstacles (list): A list of shapely Polygon objects.
+    - x_space_size (int): The width of the space.
+    - y_space_size (int): The height of the space.
+    - reduced (bool): If True, build the reduced visibility graph, see `reduce_nodes`.
+
+    Returns:
+    - nx.Graph: The created graph with nodes and edges.
+    """
+    return build_graph(start, goal, obstacles, x_space_size, y_space_size,
+                       'vectorized', reduced).to_networkx()
+
+
+def create_sweep_graph(start, goal, obstacles, x_space_size, y_space_size, reduced=False):
+    """
+    Create the same graph as `create_graph` with a rotational plane sweep around each
+    node (Lee's algorithm), in O(V² log V) time for V nodes plus the O(V²·E) worst
+    case of keeping the E obstacle edges crossing the sweep ray in a list.
+
+    Parameters:
+    - start (tuple): The starting point coordinates.
+    - goal (tuple): The goal point coordinates.
+    - obstacles (list): A list of shapely Polygon objects.
+    - x_space_size (int): The width of the space.
+    - y_space_size (int): The height of the space.
+    - reduced (bool): If True, build the reduced visibility graph, see `reduce_nodes`.
 
     Returns:
     - nx.Graph: The created graph with nodes and edges.
     """
-    G = nx.Graph()
-    G.add_node(tuple(start))
-    G.add_node(tuple(goal))
+    return build_graph(start, goal, obstacles, x_space_size, y_space_size,
+                       'sweep', reduced).to_networkx()
+
+
+GRAPH_BUILDERS = {
+    'brute_force': create_graph,
+    'strtree': create_indexed_graph,
+    'vectorized': create_vectorized_graph,
+    'sweep': create_sweep_graph,
+}
+
+
+def get_graph_builder(name):
+    """
+    Look up a graph builder by name.
+
+    Parameters:
+    - name (str): The name of the builder, one of `GRAPH_BUILDERS`.
+
+    Returns:
+    - callable: The builder, with the same signature as `create_graph`.
+
+    Raises:
+    - ValueError: If no builder is registered under the given name.
+    """
+    try:
+        return GRAPH_BUILDERS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown graph builder '{name}'. Choose one of: {', '.join(GRAPH_BUILDERS)}.")
+
+
+def build_graph(start, goal, obstacles, x_space_size, y_space_size, builder='brute_force',
+                reduced=False, threads=1, index=None):
+    """
+    Build the visibility graph as a `CompactGraph`, the representation used by the
+    search. The networkx builders above export this graph.
+
+    Parameters:
+    - start (tuple): The starting point coordinates.
+    - goal (tuple): The goal point coordinates.
+    - obstacles (list): A list of shapely Polygon objects.
+    - x_space_size (int): The width of the space.
+    - y_space_size (int): The height of the space.
+    - builder (str): The name of the builder, one of `GRAPH_BUILDERS`.
+    - reduced (bool): If True, build the reduced visibility graph, see `reduce_nodes`.
+    - threads (int): The number of threads testing the candidate edges of the
+      vectorized builder, see `find_visible_edges`.
+    - index (ObstacleIndex): An optional line-crossing index over `obstacles`.
+
+    Returns:
+    - CompactGraph: The created graph.
+
+    Raises:
+    - ValueError: If no builder is registered under the given name.
+    """
+    return build_visibility_graph([start, goal], obstacles, x_space_size, y_space_size,
+                                  builder, reduced, threads, index)
+
+
+def build_obstacle_graph(obstacles, x_space_size, y_space_size, builder='brute_force',
+                         reduced=False, threads=1, index=None):
+    """
+    Build the visibility graph between the obstacle vertices only. It does not depend on
+    the start and goal points, so it can be built once per scene and reused by every
+    query through `link_endpoints`.
+
+    Parameters:
+    - obstacles (list): A list of shapely Polygon objects.
+    - x_space_size (int): The width of the space.
+    - y_space_size (int): The height of the space.
+    - builder (str): The name of the builder, one of `GRAPH_BUILDERS`.
+    - reduced (bool): If True, build the reduced visibility graph, see `reduce_nodes`.
+    - threads (int): The number of threads testing the candidate edges of the
+      vectorized builder, see `find_visible_edges`.
+    - index (ObstacleIndex): An optional line-crossing index over `obstacles`, to
+      reuse across builds.
+
+    Returns:
+    - CompactGraph: The created graph.
+
+    Raises:
+    - ValueError: If no builder is registered under the given name.
+    """
+    return build_visibility_graph([], obstacles, x_space_size, y_space_size, builder, reduced,
+                                  threads, index)
+
+
+def build_visibility_graph(endpoints, obstacles, x_space_size, y_space_size, builder, reduced,
+                           threads=1, index=None):
+    """
+    Build the visibility graph between the given free points and the obstacle vertices.
+
+    Parameters:
+    - endpoints (list): The free points, such as the start and goal.
+    - obstacles (list): A list of shapely Polygon objects.
+    - x_space_size (int): The width of the space.
+    - y_space_size (int): The height of the space.
+    - builder (str): The name of the builder, one of `GRAPH_BUILDERS`.
+    - reduced (bool): If True, build the reduced visibility graph, see `reduce_nodes`.
+    - threads (int): The number of threads testing the candidate edges of the
+      vectorized builder. The other builders test them one by one or sweep, and
+      ignore it.
+    - index (ObstacleIndex): An optional line-crossing index over `obstacles`.
+
+    Returns:
+    - CompactGraph: The created graph. Except for the sweep builder, its
+      `visibility_tests` attribute counts the lines of sight tested.
+
+    Raises:
+    - ValueError: If no builder is registered under the given name.
+    """
+    # Validates the builder name
+    get_graph_builder(builder)
+    find_pairs = VISIBILITY_FINDERS[builder]
+    if index is None:
+        index = ObstacleIndex(obstacles)
+
+    attributes = {}
+    nodes, corners = collect_graph_nodes(
+        attributes, endpoints, obstacles, x_space_size, y_space_size, reduced)
+    points = np.asarray(nodes, dtype=float).reshape(-1, 2)
+    neighbours = corner_array(corners)
+    # The sweep finds the visible pairs without testing them one line of sight at a
+    # time and only filters its result, so it counts no visibility tests
+    counted = find_pairs is not find_visible_pairs_swept
+    if counted:
+        attributes['visibility_tests'] = 0
+
+    def pair_filter(sources, targets):
+        if reduced:
+            candidates = find_tangent_pairs(points, neighbours, sources, targets)
+            attributes['pruned_edges'] += int(np.count_nonzero(~candidates))
+        else:
+            candidates = np.ones(len(sources), dtype=bool)
+        if counted:
+            attributes['visibility_tests'] += int(np.count_nonzero(candidates))
+        return candidates
+    if find_pairs is find_visible_pairs_vectorized:
+        sources, targets = find_pairs(nodes, index, pair_filter, threads)
+    else:
+        sources, targets = find_pairs(nodes, index, pair_filter)
+    G = CompactGraph.from_edges(
+        points, sources, targets, attributes, corners=neighbours)
+
+    log_pruning(G)
+    return G
+
+
+def link_endpoints(graph, points, obstacles, reduced=False, index=None):
+    """
+    Link free points, typically the start and goal, into a graph built by
+    `build_obstacle_graph`.
+
+    Each point is tested for visibility against every node in a few bulk shapely calls,
+    so linking costs O(V) visibility tests instead of the O(V²) of a full build. A point
+    at the coordinates of an existing node reuses that node. The cached graph is left
+    unchanged.
+
+    Parameters:
+    - graph (CompactGraph): The visibility graph of the obstacle vertices.
+    - points (list): The points to link.
+    - obstacles (list): A list of shapely Polygon objects.
+    - reduced (bool): If True, only link along edges tangent at the obstacle vertex, as
+      in the reduced visibility graph.
+    - index (ObstacleIndex): An optional line-crossing index over `obstacles`, to reuse
+      across calls.
+
+    Returns:
+    - CompactGraph: The graph with the points linked in. Its `link_visibility_tests`
+      attribute counts the lines of sight tested to link them.
+    """
+    if index is None:
+        index = ObstacleIndex(obstacles)
+    node_count = graph.number_of_nodes()
+    coordinates = graph.coordinates
+    neighbours = graph.corners
+    new_nodes = {}
+    endpoint_nodes = []
+    for point in points:
+        point = tuple(map(float, point))
+        try:
+            node = graph.node_id(point)
+        except KeyError:
+            if point in new_nodes:
+                continue
+            node = new_nodes[point] = node_count + len(new_nodes)
+            coordinates = np.concatenate((coordinates, [point]))
+            neighbours = np.concatenate((neighbours, np.full((1, 2, 2), np.nan)))
+        if node not in endpoint_nodes:
+            endpoint_nodes.append(node)
+    if reduced:
+        # The points are free, like the merged endpoints of a full build, so only the
+        # other end of an edge must be tangent, also for an endpoint at a vertex
+        neighbours = neighbours.copy()
+        neighbours[endpoint_nodes] = np.nan
+
+    sources = []
+    targets = []
+    visibility_tests = 0
+    linked_nodes = []
+    for node in endpoint_nodes:
+        # An existing node already has all its visible edges to the other existing
+        # nodes, except the ones the reduced graph dropped for not being tangent at the
+        # node itself
+        if node < node_count and not reduced:
+            continue
+        others = np.delete(np.arange(len(coordinates)), [node] + linked_nodes)
+        if node < node_count:
+            others = np.setdiff1d(others, graph.neighbors(node))
+        if reduced:
+            others = others[find_tangent_pairs(coordinates, neighbours,
+                                               np.full(len(others), node), others)]
+        blocked = index.find_blocked_segments(
+            np.broadcast_to(coordinates[node], (len(others), 2)), coordinates[others])
+        visibility_tests += len(others)
+        sources.append(np.full(np.count_nonzero(~blocked), node))
+        targets.append(others[~blocked])
+        linked_nodes.append(node)
+
+    if sources:
+        sources, targets = np.concatenate(sources), np.concatenate(targets)
+    G = graph.link(coordinates[node_count:], sources, targets)
+    G.graph['link_visibility_tests'] = visibility_tests
+    return G
+
+
+def add_obstacle_to_graph(graph, polygon, obstacles, x_space_size, y_space_size, reduced=False,
+                          index=None):
+    """
+    Update a graph built by `build_obstacle_graph` for a new obstacle, without a full
+    rebuild: only the existing edges are tested against the new polygon, and only the
+    new vertices are tested against every node and obstacle.
+
+    A new vertex at the coordinates of an existing node is merged into it and, like the
+    merged nodes of a full build, has no corner. The pruning statistics of the graph
+    describe its original construction.
+
+    Parameters:
+    - graph (CompactGraph): The visibility graph of the obstacle vertices.
+    - polygon (Polygon): The new obstacle.
+    - obstacles (list): All obstacles, including the new one.
+    - x_space_size (int): The width of the space.
+    - y_space_size (int): The height of the space.
+    - reduced (bool): Whether the graph is the reduced visibility graph.
+    - index (ObstacleIndex): An optional line-crossing index over `obstacles`.
+
+    Returns:
+    - CompactGraph: The updated graph.
+    """
+    if index is None:
+        index = ObstacleIndex(obstacles)
+    coordinates = graph.coordinates
+    sources, targets = graph.edge_arrays()
+    blocked = find_segments_blocked_by(
+        coordinates[sources], coordinates[targets], polygon)
+    sources, targets = sources[~blocked], targets[~blocked]
+
+    vertices = collect_vertices([polygon], x_space_size, y_space_size)
+    corners = collect_corners([polygon], x_space_size, y_space_size)
+    if reduced:
+        vertices, corners, _ = reduce_nodes(vertices, corners)
+
+    node_count = graph.number_of_nodes()
+    new_points = []
+    neighbours = np.array(graph.corners, dtype=float)
+    linked_nodes = []
+    for vertex, corner in zip(vertices, corner_array(corners)):
+        vertex = tuple(map(float, vertex))
+        try:
+            node = graph.node_id(vertex)
+            neighbours[node] = np.nan
+        except KeyError:
+            if vertex in new_points:
+                continue
+            node = node_count + len(new_points)
+            new_points.append(vertex)
+            neighbours = np.concatenate((neighbours, [corner]))
+        linked_nodes.append(node)
+    coordinates = np.concatenate(
+        (coordinates, np.array(new_points, dtype=float).reshape(-1, 2)))
+
+    new_sources = []
+    new_targets = []
+    for node in linked_nodes:
+        others = np.delete(np.arange(len(coordinates)), node)
+        if node < node_count:
+            # A merged node keeps its edges that the new polygon does not block
+            others = np.setdiff1d(others, targets[sources == node])
+            others = np.setdiff1d(others, sources[targets == node])
+        new_sources.append(np.full(len(others), node))
+        new_targets.append(others)
+    if linked_nodes:
+        pairs = np.unique(np.sort(np.stack((np.concatenate(new_sources),
+                                            np.concatenate(new_targets)), axis=1), axis=1), axis=0)
+        new_sources, new_targets = pairs[:, 0], pairs[:, 1]
+        if reduced:
+            tangent = find_tangent_pairs(coordinates, neighbours, new_sources, new_targets)
+            new_sources, new_targets = new_sources[tangent], new_targets[tangent]
+        blocked = index.find_blocked_segments(coordinates[new_sources], coordinates[new_targets])
+        sources = np.concatenate((sources, new_sources[~blocked]))
+        targets = np.concatenate((targets, new_targets[~blocked]))
+
+    return CompactGraph.from_unique_edges(coordinates, sources, targets, dict(graph.graph),
+                                          neighbours)
+
+
+def remove_obstacle_from_graph(graph, polygon, obstacles, x_space_size, y_space_size,
+                               reduced=False, index=None):
+    """
+    Update a graph built by `build_obstacle_graph` for a removed obstacle, without a
+    full rebuild: the vertices of the polygon are dropped and only the node pairs whose
+    line of sight crossed the polygon are tested again, against the other obstacles.
+
+    Nodes the polygon shared with remaining obstacles are kept, without a corner. The
+    pruning statistics of the graph describe its original construction.
+
+    Parameters:
+    - graph (CompactGraph): The visibility graph of the obstacle vertices.
+    - polygon (Polygon): The removed obstacle.
+    - obstacles (list): The remaining obstacles.
+    - x_space_size (int): The width of the space.
+    - y_space_size (int): The height of the space.
+    - reduced (bool): Whether the graph is the reduced visibility graph.
+    - index (ObstacleIndex): An optional line-crossing index over `obstacles`.
+
+    Returns:
+    - CompactGraph: The updated graph.
+    """
+    if index is None:
+        index = ObstacleIndex(obstacles)
+    remaining_vertices = {tuple(map(float, vertex)) for vertex in
+                          collect_vertices(obstacles, x_space_size, y_space_size)}
+    kept = np.ones(graph.number_of_nodes(), dtype=bool)
+    neighbours = np.array(graph.corners, dtype=float)
+    for vertex in collect_vertices([polygon], x_space_size, y_space_size):
+        vertex = tuple(map(float, vertex))
+        try:
+            node = graph.node_id(vertex)
+        except KeyError:
+            continue
+        if vertex in remaining_vertices:
+            neighbours[node] = np.nan
+        else:
+            kept[node] = False
+
+    new_ids = np.cumsum(kept) - 1
+    coordinates = graph.coordinates[kept]
+    neighbours = neighbours[kept]
+    sources, targets = graph.edge_arrays()
+    kept_edges = kept[sources] & kept[targets]
+    sources, targets = new_ids[sources[kept_edges]], new_ids[targets[kept_edges]]
+
+    retested_sources = []
+    retested_targets = []
+    for pair_sources, pair_targets in iterate_node_pairs(len(coordinates)):
+        crossed = find_segments_blocked_by(
+            coordinates[pair_sources], coordinates[pair_targets], polygon)
+        pair_sources, pair_targets = pair_sources[crossed], pair_targets[crossed]
+        if reduced:
+            tangent = find_tangent_pairs(coordinates, neighbours, pair_sources, pair_targets)
+            pair_sources, pair_targets = pair_sources[tangent], pair_targets[tangent]
+        blocked = index.find_blocked_segments(coordinates[pair_sources], coordinates[pair_targets])
+        retested_sources.append(pair_sources[~blocked])
+        retested_targets.append(pair_targets[~blocked])
+
+    sources = np.concatenate([sources] + retested_sources)
+    targets = np.concatenate([targets] + retested_targets)
+    return CompactGraph.from_unique_edges(coordinates, sources, targets, dict(graph.graph),
+                                          neighbours)
+
+
+def find_visible_pairs_brute_force(nodes, index, pair_filter=None):
+    """
+    Find all pairs of mutually visible nodes by testing every pair against every
+    obstacle whose bounding box it overlaps, compared all at once.
+
+    Parameters:
+    - nodes (list): The candidate nodes as a list of points.
+    - index (ObstacleIndex): The line-crossing index of the obstacles.
+    - pair_filter (callable): An optional function mapping arrays (sources, targets)
+      of node pairs to a mask of the pairs worth testing.
 
-    nodes = [start, goal]
+    Returns:
+    - tuple: The arrays (sources, targets) of the visible pairs, indexing into `nodes`.
+    """
+    return find_visible_pairs_one_by_one(nodes, pair_filter, index.is_line_crossing)
+
+
+def find_visible_pairs_indexed(nodes, index, pair_filter=None):
+    """
+    Find all pairs of mutually visible nodes, testing each pair only against the
+    obstacles whose bounding boxes it overlaps, using a shapely STRtree.
+
+    Parameters:
+    - nodes (list): The candidate nodes as a list of points.
+    - index (ObstacleIndex): The line-crossing index of the obstacles.
+    - pair_filter (callable): An optional function mapping arrays (sources, targets)
+      of node pairs to a mask of the pairs worth testing.
+
+    Returns:
+    - tuple: The arrays (sources, targets) of the visible pairs, indexing into `nodes`.
+    """
+    return find_visible_pairs_one_by_one(
+        nodes, pair_filter, lambda line_points: index.is_line_crossing(line_points, indexed=True))
+
+
+def find_visible_pairs_one_by_one(nodes, pair_filter, is_blocked):
+    """
+    Find all pairs of mutually visible nodes with one blocking test per pair.
+
+    Parameters:
+    - nodes (list): The candidate nodes as a list of points.
+    - pair_filter (callable): An optional function mapping arrays (sources, targets)
+      of node pairs to a mask of the pairs worth testing.
+    - is_blocked (callable): A function checking if the line between two points
+      crosses an obstacle.
+
+    Returns:
+    - tuple: The arrays (sources, targets) of the visible pairs, indexing into `nodes`.
+    """
+    visible_sources = []
+    visible_targets = []
+    for sources, targets in iterate_node_pairs(len(nodes), chunk_size=1):
+        if pair_filter is not None:
+            candidates = pair_filter(sources, targets)
+            sources, targets = sources[candidates], targets[candidates]
+        for i, j in zip(sources.tolist(), targets.tolist()):
+            if not is_blocked([nodes[i], nodes[j]]):
+                visible_sources.append(i)
+                visible_targets.append(j)
+
+    return np.array(visible_sources, dtype=np.intp), np.array(visible_targets, dtype=np.intp)
+
+
+def find_visible_pairs_vectorized(nodes, index, pair_filter=None, threads=1):
+    """
+    Find all pairs of mutually visible nodes in bulk, see `find_visible_edges`.
+
+    Parameters:
+    - nodes (list): The candidate nodes as a list of points.
+    - index (ObstacleIndex): The line-crossing index of the obstacles.
+    - pair_filter (callable): An optional function mapping arrays (sources, targets)
+      of node pairs to a mask of the pairs worth testing.
+    - threads (int): The number of threads testing the chunks of node pairs.
+
+    Returns:
+    - tuple: The arrays (sources, targets) of the visible pairs, indexing into `nodes`.
+    """
+    sources, targets, _ = find_visible_edges(
+        nodes, index.obstacles, pair_filter=pair_filter, threads=threads, index=index)
+    return sources, targets
+
+
+def find_visible_pairs_swept(nodes, index, pair_filter=None):
+    """
+    Find all pairs of mutually visible nodes with a rotational plane sweep around each
+    node (Lee's algorithm), in O(V² log V) time for V nodes plus the O(V²·E) worst
+    case of keeping the E obstacle edges crossing the sweep ray in a list.
+
+    Nodes sharing coordinates are swept once, through their first occurrence, since
+    the graph merges them into a single node anyway.
+
+    Parameters:
+    - nodes (list): The candidate nodes as a list of points.
+    - index (ObstacleIndex): The line-crossing index of the obstacles.
+    - pair_filter (callable): An optional function mapping arrays (sources, targets)
+      of node pairs to a mask of the pairs to keep.
+
+    Returns:
+    - tuple: The arrays (sources, targets) of the visible pairs, indexing into `nodes`.
+    """
+    from utils.visibility_sweep import find_visible_pairs as sweep_visible_pairs
+
+    point_nodes = {}
+    for position, node in enumerate(nodes):
+        point_nodes.setdefault(tuple(map(float, node)), position)
+    sources, targets = sweep_visible_pairs(list(point_nodes), index.obstacles)
+    first_nodes = np.fromiter(point_nodes.values(), dtype=np.intp,
+                              count=len(point_nodes))
+    sources, targets = first_nodes[sources], first_nodes[targets]
+    if pair_filter is not None:
+        candidates = pair_filter(sources, targets)
+        sources, targets = sources[candidates], targets[candidates]
+
+    return sources, targets
+
+
+VISIBILITY_FINDERS = {
+    'brute_force': find_visible_pairs_brute_force,
+    'strtree': find_visible_pairs_indexed,
+    'vectorized': find_visible_pairs_vectorized,
+    'sweep': find_visible_pairs_swept,
+}
+
+
+def collect_nodes(start, goal, obstacles, x_space_size, y_space_size):
+    """
+    Collect the candidate graph nodes: the start and goal points followed by the
+    obstacle vertices that lie within the space.
+
+    Parameters:
+    - start (tuple): The starting point coordinates.
+    - goal (tuple): The goal point coordinates.
+    - obstacles (list): A list of shapely Polygon objects.
+    - x_space_size (int): The width of the space.
+    - y_space_size (int): The height of the space.
+
+    Returns:
+    - list: The candidate nodes as a list of points.
+    """
+    return [start, goal] + collect_vertices(obstacles, x_space_size, y_space_size)
+
+
+def collect_vertices(obstacles, x_space_size, y_space_size):
+    """
+    Collect the obstacle vertices that lie within the space.
+
+    Parameters:
+    - obstacles (list): A list of shapely Polygon objects.
+    - x_space_size (int): The width of the space.
+    - y_space_size (int): The height of the space.
+
+    Returns:
+    - list: The vertices as a list of points.
+    """
+    vertices = []
     for polygon in obstacles:
         polygon_points = polygon.exterior.coords[:-1]
         within_space_polygon_points = list(filter(
             lambda p: p[0] < x_space_size and p[1] < y_space_size, polygon_points))
-        nodes.extend(within_space_polygon_points)
+        vertices.extend(within_space_polygon_points)
 
-    for i in range(len(nodes)):
-        for j in range(i + 1, len(nodes)):
-            node1 = nodes[i]
-            node2 = nodes[j]
-            if not is_line_crossing_obstacles([node1, node2], obstacles):
-                distance = np.linalg.norm(np.array(node1) - np.array(node2))
-                G.add_edge(tuple(node1), tuple(node2), weight=distance)
-
-    return G
+    return vertices
 
 
-def is_line_crossing_obstacles(line_points, obstacles):
+def collect_corners(obstacles, x_space_size, y_space_size):
     """
-    Check if a given line crosses any obstacle.
+    Collect the obstacle corner at each obstacle vertex returned by `collect_vertices`.
 
     Parameters:
-    - line_points (list): A list of two points defining the line.
     - obstacles (list): A list of shapely Polygon objects.
+    - x_space_size (int): The width of the space.
+    - y_space_size (int): The height of the space.
 
     Returns:
-    - bool: True if the line crosses any obstacle, False otherwise.
+    - list: The (previous, next) neighbours of each vertex along the polygon boundary,
+      in counterclockwise order, aligned with the vertices returned by `collect_vertices`.
     """
-    line = LineString(line_points)
+    corners = []
     for polygon in obstacles:
-        if line.intersects(polygon) and not line.touches(polygon):
-            return True
+        polygon_points = polygon.exterior.coords[:-1]
+        counterclockwise = polygon.exterior.is_ccw
+        for k, point in enumerate(polygon_points):
+            if point[0] < x_space_size and point[1] < y_space_size:
+                previous = polygon_points[k - 1]
+                following = polygon_points[(k + 1) % len(polygon_points)]
+                corners.append((previous, following) if counterclockwise
+                               else (following, previous))
+
+    return corners
+
+
+def collect_graph_nodes(attributes, endpoints, obstacles, x_space_size, y_space_size, reduced):
+    """
+    Collect the candidate nodes of a graph along with their obstacle corners, and drop
+    the concave obstacle vertices when building the reduced graph.
+
+    Parameters:
+    - attributes (dict): The graph level attributes, which receive the pruning statistics.
+    - endpoints (list): The free points, such as the start and goal, put first.
+    - obstacles (list): A list of shapely Polygon objects.
+    - x_space_size (int): The width of the space.
+    - y_space_size (int): The height of the space.
+    - reduced (bool): If True, drop the concave obstacle vertices.
+
+    Returns:
+    - tuple: The candidate nodes and their corners, None for the free points.
+    """
+    nodes = list(endpoints) + \
+        collect_vertices(obstacles, x_space_size, y_space_size)
+    corners = [None] * len(endpoints) + \
+        collect_corners(obstacles, x_space_size, y_space_size)
+    if reduced:
+        nodes, corners, attributes['pruned_nodes'] = reduce_nodes(nodes, corners)
+        attributes['pruned_edges'] = 0
+
+    return nodes, corners
+
+
+def reduce_nodes(nodes, corners):
+    """
+    Drop the concave (reflex) obstacle vertices from the candidate nodes.
+
+    Shortest paths among polygonal obstacles only bend at convex obstacle vertices and
+    only follow edges that are tangent to the obstacles at both ends, so the reduced
+    visibility graph keeps those and drops everything else. This only holds for the
+    Euclidean length: the travel time of `FastestPathStrategy` stops at every node and
+    grows slower than the distance, so a faster path may bend at a vertex where it is
+    not tangent.
+
+    Parameters:
+    - nodes (list): The candidate nodes as a list of points.
+    - corners (list): The corner of each node, None for the start and goal.
+
+    Returns:
+    - tuple: The kept nodes, their corners and the number of dropped nodes.
+    """
+    kept_nodes = []
+    kept_corners = []
+    for node, corner in zip(nodes, corners):
+        if corner is None or not is_concave_corner(node, corner):
+            kept_nodes.append(node)
+            kept_corners.append(corner)
+
+    return kept_nodes, kept_corners, len(nodes) - len(kept_nodes)
+
+
+def is_concave_corner(node, corner):
+    """
+    Check if an obstacle vertex is concave, i.e. its interior angle exceeds 180 degrees.
+
+    Parameters:
+    - node (tuple): The vertex coordinates.
+    - corner (tuple): The (previous, next) neighbours of the vertex in counterclockwise order.
+
+    Returns:
+    - bool: True if the vertex is concave, False otherwise.
+    """
+    previous, following = corner
+    return ((following[0] - node[0]) * (previous[1] - node[1]) -
+            (following[1] - node[1]) * (previous[0] - node[0])) < 0
+
+
+def is_tangent_edge(node1, corner1, node2, corner2):
+    """
+    Check if an edge is tangent to the obstacles at both of its ends, i.e. the line
+    through the edge does not separate the boundary neighbours of either end vertex.
+
+    Parameters:
+    - node1 (tuple): The first end of the edge.
+    - corner1 (tuple): The corner of the first end, None for the start and goal.
+    - node2 (tuple): The second end of the edge.
+    - corner2 (tuple): The corner of the second end, None for the start and goal.
+
+    Returns:
+    - bool: True if the edge is tangent at both ends, False otherwise.
+    """
+    for node, corner, other in ((node1, corner1, node2), (node2, corner2, node1)):
+        if corner is None:
+            continue
+        dx, dy = other[0] - node[0], other[1] - node[1]
+        sides = [dx * (neighbour[1] - node[1]) - dy * (neighbour[0] - node[0])
+                 for neighbour in corner]
+        if sides[0] * sides[1] < 0:
+            return False
+
+    return True
+
+
+def corner_array(corners):
+    """
+    Convert a list of corners to an array for `find_tangent_pairs`.
+
+    Parameters:
+    - corners (list): The corner of each node, None for the free points.
+
+    Returns:
+    - np.ndarray: The (N, 2, 2) previous and next neighbours of each node, NaN for the
+      free points.
+    """
+    return np.array([corner if corner is not None else np.full((2, 2), np.nan)
+                     for corner in corners], dtype=float).reshape(-1, 2, 2)
+
+
+def find_tangent_pairs(points, neighbours, sources, targets):
+    """
+    Vectorized `is_tangent_edge` over arrays of node pairs.
+
+    Parameters:
+    - points (np.ndarray): The (N, 2) node coordinates.
+    - neighbours (np.ndarray): The (N, 2, 2) corners of the nodes, see `corner_array`.
+    - sources (np.ndarray): The indices of the first ends of the edges.
+    - targets (np.ndarray): The indices of the second ends of the edges.
+
+    Returns:
+    - np.ndarray: A mask of the edges that are tangent at both ends.
+    """
+    tangent = np.ones(len(sources), dtype=bool)
+    for ends, others in ((sources, targets), (targets, sources)):
+        direction = points[others] - points[ends]
+        offsets = neighbours[ends] - points[ends][:, np.newaxis, :]
+        sides = direction[:, np.newaxis, 0] * offsets[:, :, 1] - \
+            direction[:, np.newaxis, 1] * offsets[:, :, 0]
+        # Free points have no corner, so their NaN sides never compare below zero
+        tangent &= ~(sides[:, 0] * sides[:, 1] < 0)
+
+    return tangent
+
+
+def log_pruning(G):
+    """
+    Log how many nodes and candidate edges the reduced graph construction pruned.
+
+    Parameters:
+    - G (CompactGraph): The built graph.
+    """
+    if 'pruned_nodes' in G.graph:
+        LOGGER.info(
+            f"Reduced graph pruned {G.graph['pruned_nodes']} concave vertices and "
+            f"{G.graph['pruned_edges']} non-tangent candidate edges.")
+
+
+def find_visible_edges(nodes, obstacles, chunk_size=EDGE_CHUNK_SIZE, pair_filter=None,
+                       threads=1, index=None):
+    """
+    Find all pairs of mutually visible nodes with bulk shapely predicates.
+
+    The candidate edges are built as NumPy coordinate arrays one chunk of node pairs
+    at a time, so memory stays bounded for large node counts. Each chunk is tested in
+    a few vectorized calls, see `ObstacleIndex.find_blocked_segments`.
+
+    The shapely calls release the GIL, so with several threads the chunks are tested
+    concurrently without copying the obstacles to other processes. Prepared geometries
+    are not thread-safe, so each thread tests against its own copy of the index. The
+    visible pairs of the chunks are merged in chunk order, so the result does not
+    depend on the number of threads.
+
+    Parameters:
+    - nodes (list): The candidate nodes as a list of points.
+    - obstacles (list): A list of shapely Polygon objects.
+    - chunk_size (int): The approximate number of node pairs tested per chunk. With
+      several threads, smaller chunks are used if needed to give every thread a few.
+    - pair_filter (callable): An optional function mapping the arrays (sources,
+      targets) of a chunk to a mask of the pairs worth testing. It is always called
+      from the calling thread.
+    - threads (int): The number of threads testing the chunks.
+    - index (ObstacleIndex): An optional line-crossing index over `obstacles`.
+
+    Returns:
+    - tuple: The arrays (sources, targets, distances) of the visible edges, where
+      sources and targets index into `nodes`, in the same order as `create_graph`.
+    """
+    points = np.asarray(nodes, dtype=float).reshape(-1, 2)
+    if index is None:
+        index = ObstacleIndex(obstacles)
+    if threads > 1:
+        pair_count = len(points) * (len(points) - 1) // 2
+        chunk_size = max(1, min(chunk_size, pair_count // (threads * CHUNKS_PER_THREAD)))
+
+    def candidate_chunks():
+        for sources, targets in iterate_node_pairs(len(points), chunk_size):
+            if pair_filter is not None:
+                candidates = pair_filter(sources, targets)
+                sources, targets = sources[candidates], targets[candidates]
+            yield sources, targets
+
+    worker = threading.local()
+
+    def find_visible(chunk):
+        sources, targets = chunk
+        if not hasattr(worker, 'index'):
+            worker.index = index.copy() if threads > 1 else index
+        blocked = worker.index.find_blocked_segments(points[sources], points[targets])
+        return sources[~blocked], targets[~blocked]
+
+    visible = map_in_threads(find_visible, candidate_chunks(), threads)
+    sources = np.concatenate([np.empty(0, dtype=np.intp)] + [chunk[0] for chunk in visible])
+    targets = np.concatenate([np.empty(0, dtype=np.intp)] + [chunk[1] for chunk in visible])
+    distances = np.linalg.norm(points[sources] - points[targets], axis=1)
+    return sources, targets, distances
+
+
+def map_in_threads(function, items, threads):
+    """
+    Apply a function to every item in a pool of threads, keeping the results in item
+    order. Only a few items per thread are taken from the iterable ahead of their
+    results, so lazily generated items stay bounded in memory.
+
+    Parameters:
+    - function (callable): The function to apply, releasing the GIL for the pool to
+      run in parallel.
+    - items (iterable): The items.
+    - threads (int): The number of threads, 1 to apply the function in the calling
+      thread.
+
+    Returns:
+    - list: The result of each item.
+    """
+    if threads <= 1:
+        return [function(item) for item in items]
+
+    results = []
+    with ThreadPoolExecutor(threads) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(function, item))
+            if len(pending) >= 2 * threads:
+                results.append(pending.popleft().result())
+        results.extend(future.result() for future in pending)
+    return results
+
+
+def find_segments_blocked_by(segment_starts, segment_ends, polygon):
+    """
+    Check which straight segments cross a single obstacle. A vectorized slab test
+    against the bounding box of the polygon discards most segments before the exact
+    shapely test, so even large numbers of segments are checked quickly.
+
+    Parameters:
+    - segment_starts (np.ndarray): The (M, 2) first ends of the segments.
+    - segment_ends (np.ndarray): The (M, 2) second ends of the segments.
+    - polygon (Polygon): The obstacle.
+
+    Returns:
+    - np.ndarray: A mask of the segments crossing the obstacle.
+    """
+    min_x, min_y, max_x, max_y = polygon.bounds
+    t_low = np.zeros(len(segment_starts))
+    t_high = np.ones(len(segment_starts))
+    for axis, low, high in ((0, min_x, max_x), (1, min_y, max_y)):
+        start = segment_starts[:, axis]
+        delta = segment_ends[:, axis] - start
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t1 = (low - start) / delta
+            t2 = (high - start) / delta
+        # Segments parallel to the slab either stay within it or never enter it
+        inside = (start >= low) & (start <= high)
+        parallel = delta == 0
+        t_low = np.maximum(t_low, np.where(
+            parallel, np.where(inside, -np.inf, np.inf), np.minimum(t1, t2)))
+        t_high = np.minimum(t_high, np.where(
+            parallel, np.where(inside, np.inf, -np.inf), np.maximum(t1, t2)))
+
+    blocked = np.zeros(len(segment_starts), dtype=bool)
+    candidates = np.flatnonzero(t_low <= t_high)
+    if len(candidates) > 0:
+        blocked[candidates] = ObstacleIndex([polygon]).find_blocked_segments(
+            segment_starts[candidates], segment_ends[candidates])
+
+    return blocked
+
+
+def iterate_node_pairs(node_count, chunk_size=EDGE_CHUNK_SIZE):
+    """
+    Iterate over all node index pairs (i, j) with i < j in row-major order, in chunks
+    of whole rows holding roughly `chunk_size` pairs each.
+
+    Parameters:
+    - node_count (int): The number of nodes.
+    - chunk_size (int): The approximate number of pairs per chunk.
+
+    Yields:
+    - tuple: The arrays (sources, targets) of one chunk of node pairs.
+    """
+    row = 0
+    while row < node_count - 1:
+        end_row = row
+        pair_count = 0
+        while end_row < node_count - 1 and pair_count < chunk_size:
+            pair_count += node_count - 1 - end_row
+            end_row += 1
 
-    return False
+        rows = np.arange(row, end_row)
+        row_lengths = node_count - 1 - rows
+        sources = np.repeat(rows, row_lengths)
+        # Targets run from row + 1 up to the last node within each row
+        offsets = np.arange(len(sources)) - \
+            np.repeat(np.cumsum(row_lengths) - row_lengths, row_lengths)
+        targets = sources + 1 + offsets
+        yield sources, targets
+        row = end_row
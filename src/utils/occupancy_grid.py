@@ -0,0 +1,181 @@
+import math
+
+import numpy as np
+import shapely
+
+# The (row, column) steps to the 8 neighbours of a cell, orthogonal neighbours first;
+# `OccupancyGrid.neighbor_offsets` turns them into flat index offsets
+NEIGHBOR_STEPS = np.array([(0, 1), (1, 0), (0, -1), (-1, 0),
+                           (1, 1), (1, -1), (-1, -1), (-1, 1)])
+
+
+class OccupancyGrid:
+    def __init__(self, blocked, resolution):
+        """
+        Initialize an occupancy grid over the space, as built by `rasterize_obstacles`.
+
+        The cells are stored with a border of blocked cells, so that the neighbours of
+        every cell exist and a cell is addressed by one flat index into `free`.
+
+        Parameters:
+        - blocked (np.ndarray): The (rows, columns) mask of the cells meeting an
+          obstacle, row 0 at y = 0.
+        - resolution (float): The width and height of a cell.
+        """
+        self.resolution = resolution
+        self.shape = blocked.shape
+        self.width = blocked.shape[1] + 2
+        padded = np.ones((blocked.shape[0] + 2, self.width), dtype=bool)
+        padded[1:-1, 1:-1] = blocked
+        self.free = ~padded.reshape(-1)
+        self.neighbor_offsets = NEIGHBOR_STEPS[:, 0] * self.width + NEIGHBOR_STEPS[:, 1]
+        self.neighbor_mask = self.find_neighbor_mask()
+        # The center of every cell, padding included, indexed by flat index
+        self.points = self.centers(np.arange(len(self.free)))
+
+    def find_neighbor_mask(self):
+        """
+        Find the neighbours each cell can move to: the free ones, diagonal ones only if
+        both orthogonal neighbours sharing their corner are free, so that moves do not
+        cut the corners of obstacles.
+
+        Returns:
+        - np.ndarray: The (cells, 8) mask of the reachable neighbours of each cell.
+        """
+        cells = np.flatnonzero(self.free)
+        mask = np.zeros((len(self.free), len(self.neighbor_offsets)), dtype=bool)
+        neighbors = self.free[cells[:, None] + self.neighbor_offsets]
+        mask[cells, :4] = neighbors[:, :4]
+        # Each diagonal lies between the orthogonal neighbours k - 4 and k - 3 (mod 4)
+        for k in range(4, 8):
+            mask[cells, k] = neighbors[:, k] & neighbors[:, k - 4] & neighbors[:, (k - 3) % 4]
+        return mask
+
+    def cell_of(self, point):
+        """
+        Return the cell of a point. Points on the far edges of the space belong to the
+        last row or column.
+
+        Parameters:
+        - point (tuple): The point coordinates.
+
+        Returns:
+        - int: The flat index of the cell.
+        """
+        column = min(int(point[0] // self.resolution), self.shape[1] - 1)
+        row = min(int(point[1] // self.resolution), self.shape[0] - 1)
+        return (row + 1) * self.width + column + 1
+
+    def centers(self, cells):
+        """
+        Return the centers of cells.
+
+        Parameters:
+        - cells (np.ndarray): The flat indexes of the cells.
+
+        Returns:
+        - np.ndarray: The (N, 2) center coordinates.
+        """
+        rows, columns = np.divmod(cells, self.width)
+        return np.stack(((columns - 0.5) * self.resolution, (rows - 0.5) * self.resolution),
+                        axis=-1)
+
+    def is_segment_free(self, start, end):
+        """
+        Check if a segment only passes through free cells. Cells the segment only
+        touches at a corner or along an edge do not count, as a segment touching an
+        obstacle does not cross it.
+
+        Parameters:
+        - start (np.ndarray): The first end of the segment.
+        - end (np.ndarray): The second end of the segment.
+
+        Returns:
+        - bool: True if every cell the segment passes through is free.
+        """
+        x0, y0 = start[0] / self.resolution, start[1] / self.resolution
+        dx, dy = end[0] / self.resolution - x0, end[1] / self.resolution - y0
+        # The segment changes cells where it crosses the grid lines, so the middles of
+        # the pieces between crossings lie in the interiors of the cells it passes
+        crossings = [np.array([0.0, 1.0])]
+        if dx != 0:
+            lines = np.arange(math.floor(min(x0, x0 + dx)) + 1, math.ceil(max(x0, x0 + dx)))
+            crossings.append((lines - x0) / dx)
+        if dy != 0:
+            lines = np.arange(math.floor(min(y0, y0 + dy)) + 1, math.ceil(max(y0, y0 + dy)))
+            crossings.append((lines - y0) / dy)
+        t = np.unique(np.concatenate(crossings))
+        middles = (t[:-1] + t[1:]) / 2
+        columns = np.floor(x0 + middles * dx).astype(np.intp)
+        rows = np.floor(y0 + middles * dy).astype(np.intp)
+        cells = (rows + 1) * self.width + columns + 1
+        free = self.free[cells]
+        # A segment running along a grid line lies between two cells, and an obstacle
+        # crossing the line blocks both, so one free cell lets it pass
+        if dy == 0 and y0 == math.floor(y0):
+            free |= self.free[cells - self.width]
+        elif dx == 0 and x0 == math.floor(x0):
+            free |= self.free[cells - 1]
+        return bool(free.all())
+
+
+def rasterize_obstacles(obstacles, x_space_size, y_space_size, resolution):
+    """
+    Rasterize obstacles into an occupancy grid. A cell is blocked if its interior meets
+    the interior of an obstacle, so a segment through free cells never crosses an
+    obstacle, while cells only touching an obstacle stay free.
+
+    All cells within the bounding boxes of the obstacles are tested at once: the cells
+    whose center lies inside the obstacle are blocked outright, and the others are
+    tested with the prepared `intersects` and then the DE-9IM pattern of meeting
+    interiors.
+
+    Parameters:
+    - obstacles (list): A list of shapely Polygon objects.
+    - x_space_size (int): The width of the space.
+    - y_space_size (int): The height of the space.
+    - resolution (float): The width and height of a cell.
+
+    Returns:
+    - OccupancyGrid: The occupancy grid.
+
+    Raises:
+    - ValueError: If the resolution is not positive.
+    """
+    if resolution <= 0:
+        raise ValueError("The grid resolution must be positive.")
+    shape = (max(1, math.ceil(y_space_size / resolution)),
+             max(1, math.ceil(x_space_size / resolution)))
+    blocked = np.zeros(shape, dtype=bool)
+    if len(obstacles) == 0:
+        return OccupancyGrid(blocked, resolution)
+
+    geometries = np.array(obstacles, dtype=object).reshape(-1)
+    shapely.prepare(geometries)
+    min_x, min_y, max_x, max_y = shapely.bounds(geometries).T
+    first_columns = np.clip(np.floor(min_x / resolution), 0, shape[1] - 1).astype(np.intp)
+    last_columns = np.clip(np.floor(max_x / resolution), 0, shape[1] - 1).astype(np.intp)
+    first_rows = np.clip(np.floor(min_y / resolution), 0, shape[0] - 1).astype(np.intp)
+    last_rows = np.clip(np.floor(max_y / resolution), 0, shape[0] - 1).astype(np.intp)
+
+    # Enumerate the cells of the bounding box of each obstacle
+    widths = last_columns - first_columns + 1
+    counts = widths * (last_rows - first_rows + 1)
+    owners = np.repeat(np.arange(len(geometries)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    rows = first_rows[owners] + offsets // widths[owners]
+    columns = first_columns[owners] + offsets % widths[owners]
+
+    owner_geometries = geometries[owners]
+    inside = shapely.contains_xy(owner_geometries, (columns + 0.5) * resolution,
+                                 (rows + 0.5) * resolution)
+    blocked[rows[inside], columns[inside]] = True
+
+    edge = np.flatnonzero(~inside)
+    cells = shapely.box(columns[edge] * resolution, rows[edge] * resolution,
+                        (columns[edge] + 1) * resolution, (rows[edge] + 1) * resolution)
+    meeting = shapely.intersects(owner_geometries[edge], cells)
+    edge, cells = edge[meeting], cells[meeting]
+    crossing = shapely.relate_pattern(owner_geometries[edge], cells, 'T********')
+    blocked[rows[edge[crossing]], columns[edge[crossing]]] = True
+    return OccupancyGrid(blocked, resolution)
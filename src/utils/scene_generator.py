@@ -0,0 +1,132 @@
+import math
+import random
+
+import yaml
+from shapely.geometry import Polygon
+
+
+def generate_scene(obstacle_count, vertices_per_obstacle=4, space_size=100, seed=0,
+                   concave_fraction=0.0, vertex_count=None):
+    """
+    Generate a scene of non-overlapping random obstacles, one per cell of a square grid
+    covering the space, for benchmarks and scaling tests. The same arguments always
+    generate the same scene.
+
+    Convex obstacles have their vertices at random angles on a circle. Concave obstacles
+    are star shaped, alternating vertices on an outer and an inner circle, and need at
+    least 4 vertices.
+
+    Parameters:
+    - obstacle_count (int): The number of obstacles.
+    - vertices_per_obstacle (int): The number of vertices of each obstacle, unless
+      `vertex_count` is given.
+    - space_size (int): The width and height of the space.
+    - seed (int): The random seed.
+    - concave_fraction (float): The probability of each obstacle being concave.
+    - vertex_count (int): An optional total number of vertices, spread as evenly as
+      possible over the obstacles.
+
+    Returns:
+    - tuple: The start point, goal point and list of shapely Polygon obstacles.
+
+    Raises:
+    - ValueError: If the obstacles would have too few vertices, or the concave fraction
+      is not between 0 and 1.
+    """
+    if not 0 <= concave_fraction <= 1:
+        raise ValueError("The concave fraction must be between 0 and 1.")
+    if vertex_count is None:
+        vertex_counts = [vertices_per_obstacle] * obstacle_count
+    else:
+        vertex_counts = [vertex_count // obstacle_count + (index < vertex_count % obstacle_count)
+                         for index in range(obstacle_count)] if obstacle_count else []
+    minimum = 4 if concave_fraction > 0 else 3
+    if any(count < minimum for count in vertex_counts):
+        raise ValueError(f"Each obstacle needs at least {minimum} vertices.")
+
+    rng = random.Random(seed)
+    cells_per_side = math.ceil(math.sqrt(obstacle_count))
+    cell_size = space_size / cells_per_side if cells_per_side else space_size
+    obstacles = []
+    for cell, count in zip(rng.sample(range(cells_per_side ** 2), obstacle_count), vertex_counts):
+        center = ((cell % cells_per_side + 0.5) * cell_size,
+                  (cell // cells_per_side + 0.5) * cell_size)
+        # Only draw for the shape when concave obstacles are asked for, so convex scenes
+        # stay the same as before concave ones were supported
+        if concave_fraction > 0 and rng.random() < concave_fraction:
+            obstacles.append(concave_polygon(rng, center, cell_size, count))
+        else:
+            obstacles.append(convex_polygon(rng, center, cell_size, count))
+
+    start = [cell_size * 0.05, cell_size * 0.05]
+    goal = [space_size - cell_size * 0.05, space_size - cell_size * 0.05]
+    return start, goal, obstacles
+
+
+def convex_polygon(rng, center, cell_size, vertex_count):
+    """
+    Generate a convex polygon inscribed in a random circle of a grid cell.
+
+    Parameters:
+    - rng (random.Random): The random generator.
+    - center (tuple): The center of the cell.
+    - cell_size (float): The width and height of the cell.
+    - vertex_count (int): The number of vertices.
+
+    Returns:
+    - Polygon: The generated polygon.
+    """
+    angles = sorted(rng.uniform(0, 2 * math.pi) for _ in range(vertex_count))
+    radius = cell_size * rng.uniform(0.2, 0.4)
+    return Polygon([(center[0] + radius * math.cos(angle), center[1] + radius * math.sin(angle))
+                    for angle in angles])
+
+
+def concave_polygon(rng, center, cell_size, vertex_count):
+    """
+    Generate a star-shaped polygon in a grid cell, with its odd vertices pulled towards
+    the center so that they are concave.
+
+    Parameters:
+    - rng (random.Random): The random generator.
+    - center (tuple): The center of the cell.
+    - cell_size (float): The width and height of the cell.
+    - vertex_count (int): The number of vertices, at least 4.
+
+    Returns:
+    - Polygon: The generated polygon.
+    """
+    # Jittered angles keep the vertices apart, so the polygon stays simple
+    angles = [2 * math.pi * (index + rng.uniform(-0.3, 0.3)) / vertex_count
+              for index in range(vertex_count)]
+    radius = cell_size * rng.uniform(0.2, 0.4)
+    points = []
+    for index, angle in enumerate(angles):
+        distance = radius * (rng.uniform(0.3, 0.6) if index % 2 else 1.0)
+        points.append((center[0] + distance * math.cos(angle),
+                       center[1] + distance * math.sin(angle)))
+    return Polygon(points)
+
+
+def write_scene_config(path, start, goal, obstacles, space_size=100, **settings):
+    """
+    Write a scene as a YAML configuration file, as read by `Configuration`.
+
+    Parameters:
+    - path (str): The path to the YAML file.
+    - start (list): The starting point coordinates.
+    - goal (list): The goal point coordinates.
+    - obstacles (list): A list of shapely Polygon obstacles.
+    - space_size (int): The width and height of the space.
+    - settings: Further configuration keys, such as `graph_builder` or `mass`.
+    """
+    config = {
+        'x_start': float(start[0]), 'y_start': float(start[1]),
+        'x_goal': float(goal[0]), 'y_goal': float(goal[1]),
+        'x_space_size': space_size, 'y_space_size': space_size,
+        'list_obstacles': [[list(point) for point in obstacle.exterior.coords[:-1]]
+                           for obstacle in obstacles],
+    }
+    config.update(settings)
+    with open(path, 'w') as f:
+        yaml.safe_dump(config, f)
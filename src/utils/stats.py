@@ -0,0 +1,109 @@
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class RunStats:
+    def __init__(self):
+        """
+        Initialize an empty collection of run statistics: the wall time spent in each
+        phase of a run and counters of the work done, such as visibility tests.
+        """
+        self.phases = {}
+        self.counters = {}
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a phase of the run. A phase entered several times, such as the search of a
+        batch of queries, adds up its wall times.
+
+        Parameters:
+        - name (str): The name of the phase.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def count(self, name, amount=1):
+        """
+        Add to a counter.
+
+        Parameters:
+        - name (str): The name of the counter.
+        - amount (int): The amount to add.
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def to_dict(self):
+        """
+        Return the statistics as a JSON-serializable dictionary.
+
+        Returns:
+        - dict: The wall time of each phase in seconds, in the order the phases were
+          first entered, the counters and the peak memory of the process in bytes.
+        """
+        return {
+            'phases': {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            'counters': dict(self.counters),
+            'peak_memory_bytes': peak_memory(),
+        }
+
+
+def timed(stats, name):
+    """
+    Time a phase in the given statistics, if any.
+
+    Parameters:
+    - stats (RunStats): The run statistics, or None to time nothing.
+    - name (str): The name of the phase.
+
+    Returns:
+    - contextmanager: The context timing the phase.
+    """
+    return nullcontext() if stats is None else stats.phase(name)
+
+
+def timed_iter(stats, name, iterable):
+    """
+    Time the reading of each item of an iterable in the given statistics, if any, so
+    that a lazily read input adds up its reading time without being read at once.
+
+    Parameters:
+    - stats (RunStats): The run statistics, or None to time nothing.
+    - name (str): The name of the phase.
+    - iterable (iterable): The items to read.
+
+    Yields:
+    - object: The items of the iterable.
+    """
+    iterator = iter(iterable)
+    while True:
+        with timed(stats, name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+def peak_memory():
+    """
+    Return the peak resident memory of the process.
+
+    Returns:
+    - int: The peak resident set size in bytes, or None where the platform does not
+      report it.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
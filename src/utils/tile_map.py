@@ -0,0 +1,317 @@
+import logging
+import math
+from collections import OrderedDict
+
+import numpy as np
+import shapely
+from shapely.geometry import LineString
+
+from utils.compact_graph import CompactGraph
+from utils.graph_factory import find_visible_edges, link_endpoints
+from utils.obstacle_index import ObstacleIndex
+
+LOGGER = logging.getLogger('tile_map')
+
+# Each free interval of a tile border gets portals at its ends and at most this many
+# tile sizes apart, so paths cross the borders close to where they would without tiles
+PORTALS_PER_BORDER = 4
+
+
+class Tile:
+    def __init__(self, key, graph, portals, obstacles, index):
+        """
+        Initialize a built tile: the local visibility graph of the tile and what its
+        queries share.
+
+        Parameters:
+        - key (tuple): The (row, column) of the tile.
+        - graph (CompactGraph): The visibility graph between the portals of the tile and
+          the obstacle vertices within it.
+        - portals (np.ndarray): The (P, 2) portals on the borders of the tile.
+        - obstacles (list): The obstacles meeting the tile.
+        - index (ObstacleIndex): The line-crossing index of these obstacles.
+        """
+        self.key = key
+        self.graph = graph
+        self.portals = portals
+        self.obstacles = obstacles
+        self.index = index
+        # The travel costs between the portals per strategy and parameters
+        self.portal_costs = {}
+
+    def find_portal_costs(self, pathfinder, mass, max_acceleration):
+        """
+        Return the travel costs between the portals of the tile within the tile, found
+        with one search per portal on first use.
+
+        Parameters:
+        - pathfinder (Pathfinder): The pathfinder running the searches.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+
+        Returns:
+        - np.ndarray: The (P, P) matrix of the travel costs, infinite between portals
+          not connected within the tile.
+        """
+        key = pathfinder.pathStrategy.cost_key(mass, max_acceleration)
+        if key not in self.portal_costs:
+            portals = [tuple(portal) for portal in self.portals.tolist()]
+            matrix = np.zeros((len(portals), len(portals)))
+            for index, portal in enumerate(portals):
+                costs = pathfinder.find_costs_from(
+                    self.graph, portal, portals[index:], mass, max_acceleration)
+                matrix[index, index:] = costs
+                matrix[index:, index] = costs
+            self.portal_costs[key] = matrix
+        return self.portal_costs[key]
+
+    def find_costs_from(self, point, targets, pathfinder, mass, max_acceleration):
+        """
+        Find the travel costs within the tile from a point of the tile, such as the
+        start of a query, to the given nodes of the tile graph.
+
+        Parameters:
+        - point (tuple): The point coordinates.
+        - targets (list): The target points, portals or the other query point.
+        - pathfinder (Pathfinder): The pathfinder running the search.
+        - mass (float): The mass of the robot.
+        - max_acceleration (float): The maximum acceleration of the robot.
+
+        Returns:
+        - np.ndarray: The travel cost to each target, infinite for targets not
+          connected within the tile.
+        """
+        graph = link_endpoints(self.graph, [point] + list(targets), self.obstacles,
+                               index=self.index)
+        return pathfinder.find_costs_from(graph, point, targets, mass, max_acceleration)
+
+
+class TileMap:
+    def __init__(self, obstacles, x_space_size, y_space_size, tile_size, index=None, max_tiles=None):
+        """
+        Initialize the tiling of a space into square tiles, whose local visibility
+        graphs are built on first use and cached, see `pathfind.tiled_planner`.
+
+        Adjacent tiles meet on a border. The free intervals of a border, where no
+        obstacle lies on it, hold the portals through which paths cross from one tile to
+        the other. The portals of a tile are the nodes of a coarse graph, whose edges
+        connect the portals of each tile.
+
+        Parameters:
+        - obstacles (list): A list of shapely Polygon objects.
+        - x_space_size (int): The width of the space.
+        - y_space_size (int): The height of the space.
+        - tile_size (float): The width and height of a tile.
+        - index (ObstacleIndex): An optional line-crossing index over `obstacles`, whose
+          spatial index finds the obstacles of each tile and border.
+        - max_tiles (int): The number of built tiles kept in memory, None for no limit.
+
+        Raises:
+        - ValueError: If the tile size is not positive or fewer than one tile is kept.
+        """
+        if tile_size <= 0:
+            raise ValueError("The tile size must be positive.")
+        if max_tiles is not None and max_tiles < 1:
+            raise ValueError("At least one tile must be kept in memory.")
+        self.obstacles = obstacles
+        self.x_space_size = x_space_size
+        self.y_space_size = y_space_size
+        self.tile_size = tile_size
+        self.index = index if index is not None else ObstacleIndex(obstacles)
+        self.max_tiles = max_tiles
+        self.shape = (max(1, math.ceil(y_space_size / tile_size)),
+                      max(1, math.ceil(x_space_size / tile_size)))
+        # The built tiles, least recently used first
+        self.tiles = OrderedDict()
+        # The portals of each border and of each tile, found on first use
+        self.border_portals = {}
+        self.tile_portals = {}
+        # Number of tiles built so far
+        self.tiles_built = 0
+
+    def tile_of(self, point):
+        """
+        Return the tile of a point. Points on a border belong to the tile above or
+        right of it, points on the far edges of the space to the last row or column.
+
+        Parameters:
+        - point (tuple): The point coordinates.
+
+        Returns:
+        - tuple: The (row, column) of the tile.
+        """
+        return (min(int(point[1] // self.tile_size), self.shape[0] - 1),
+                min(int(point[0] // self.tile_size), self.shape[1] - 1))
+
+    def tiles_of_portal(self, point):
+        """
+        Return the tiles a portal belongs to: the two tiles of its border, or up to four
+        tiles for a portal at a tile corner.
+
+        Parameters:
+        - point (tuple): The portal coordinates.
+
+        Returns:
+        - list: The (row, column) of the tiles.
+        """
+        row, column = self.tile_of(point)
+        return [tile for tile in ((row, column), (row - 1, column), (row, column - 1),
+                                  (row - 1, column - 1))
+                if tile[0] >= 0 and tile[1] >= 0 and point in self.get_portals(tile)[1]]
+
+    def tile_box(self, tile):
+        """
+        Return the bounds of a tile, clipped to the space.
+
+        Parameters:
+        - tile (tuple): The (row, column) of the tile.
+
+        Returns:
+        - tuple: The (min_x, min_y, max_x, max_y) bounds.
+        """
+        row, column = tile
+        return (column * self.tile_size, row * self.tile_size,
+                min((column + 1) * self.tile_size, self.x_space_size),
+                min((row + 1) * self.tile_size, self.y_space_size))
+
+    def find_border_portals(self, border):
+        """
+        Return the portals of a border between two tiles, found on first use: the ends
+        of its free intervals and points spread along them.
+
+        Parameters:
+        - border (tuple): ('v', row, column) for the border between the tile (row,
+          column) and the tile right of it, ('h', row, column) for the border between
+          the tile (row, column) and the tile above it.
+
+        Returns:
+        - np.ndarray: The (P, 2) portals.
+        """
+        if border not in self.border_portals:
+            orientation, row, column = border
+            min_x, min_y, max_x, max_y = self.tile_box((row, column))
+            if orientation == 'v':
+                line = LineString([(max_x, min_y), (max_x, max_y)])
+            else:
+                line = LineString([(min_x, max_y), (max_x, max_y)])
+            if self.index.tree is not None:
+                hits = self.index.tree.query(line, predicate='intersects')
+                if len(hits) > 0:
+                    line = line.difference(shapely.union_all(self.index.geometries[hits]))
+
+            spacing = self.tile_size / PORTALS_PER_BORDER
+            portals = []
+            for interval in shapely.get_parts(line):
+                if not isinstance(interval, LineString) or interval.is_empty:
+                    continue
+                first, last = np.array(interval.coords[0]), np.array(interval.coords[-1])
+                pieces = max(1, math.ceil(interval.length / spacing))
+                portals.extend(first + (last - first) * np.linspace(0, 1, pieces + 1)[:, None])
+            self.border_portals[border] = np.array(portals, dtype=float).reshape(-1, 2)
+        return self.border_portals[border]
+
+    def get_portals(self, tile):
+        """
+        Return the portals on the borders of a tile with the other tiles.
+
+        Parameters:
+        - tile (tuple): The (row, column) of the tile.
+
+        Returns:
+        - tuple: The (P, 2) portals and the position of each portal point among them.
+        """
+        if tile not in self.tile_portals:
+            row, column = tile
+            borders = []
+            if column > 0:
+                borders.append(('v', row, column - 1))
+            if column < self.shape[1] - 1:
+                borders.append(('v', row, column))
+            if row > 0:
+                borders.append(('h', row - 1, column))
+            if row < self.shape[0] - 1:
+                borders.append(('h', row, column))
+            # Tile corners end two borders
+            points = dict.fromkeys(tuple(point) for border in borders
+                                   for point in self.find_border_portals(border).tolist())
+            portals = np.array(list(points), dtype=float).reshape(-1, 2)
+            self.tile_portals[tile] = (portals, {point: k for k, point in enumerate(points)})
+        return self.tile_portals[tile]
+
+    def get_tile(self, tile):
+        """
+        Return a tile, building it if it is not cached.
+
+        Parameters:
+        - tile (tuple): The (row, column) of the tile.
+
+        Returns:
+        - Tile: The built tile.
+        """
+        if tile in self.tiles:
+            self.tiles.move_to_end(tile)
+        else:
+            self.tiles[tile] = self.build_tile(tile)
+            self.tiles_built += 1
+        return self.tiles[tile]
+
+    def build_tile(self, tile):
+        """
+        Build the visibility graph of a tile between its portals and the obstacle
+        vertices within it. The tile is convex, so its lines of sight stay within it and
+        are only tested against the obstacles meeting it.
+
+        Parameters:
+        - tile (tuple): The (row, column) of the tile.
+
+        Returns:
+        - Tile: The built tile.
+        """
+        min_x, min_y, max_x, max_y = bounds = self.tile_box(tile)
+        obstacles = []
+        if self.index.tree is not None:
+            hits = self.index.tree.query(shapely.box(*bounds), predicate='intersects')
+            obstacles = [self.obstacles[k] for k in sorted(hits.tolist())]
+        vertices = [point for obstacle in obstacles for point in obstacle.exterior.coords[:-1]
+                    if min_x <= point[0] <= max_x and min_y <= point[1] <= max_y]
+        portals, _ = self.get_portals(tile)
+        nodes = portals.tolist() + vertices
+        index = ObstacleIndex(obstacles)
+        sources, targets, _ = find_visible_edges(nodes, obstacles, index=index)
+        graph = CompactGraph.from_edges(
+            nodes, sources, targets, {'visibility_tests': len(nodes) * (len(nodes) - 1) // 2})
+        LOGGER.debug(f"Built the tile {tile} with {graph.number_of_nodes()} nodes and "
+                     f"{graph.number_of_edges()} edges.")
+        return Tile(tile, graph, portals, obstacles, index)
+
+    def trim(self):
+        """
+        Evict the least recently used tiles beyond the number of tiles kept in memory.
+        """
+        while self.max_tiles is not None and len(self.tiles) > self.max_tiles:
+            evicted, _ = self.tiles.popitem(last=False)
+            LOGGER.debug(f"Evicted the tile {evicted}.")
+
+    def corridor_graph(self, tiles):
+        """
+        Merge the graphs of tiles into one graph, joined at their shared portals.
+
+        Parameters:
+        - tiles (list): The (row, column) of the tiles.
+
+        Returns:
+        - CompactGraph: The merged graph.
+        """
+        points = []
+        sources = []
+        targets = []
+        offset = 0
+        for tile in tiles:
+            graph = self.get_tile(tile).graph
+            tile_sources, tile_targets = graph.edge_arrays()
+            points.append(graph.coordinates)
+            sources.append(tile_sources + offset)
+            targets.append(tile_targets + offset)
+            offset += graph.number_of_nodes()
+        return CompactGraph.from_edges(np.concatenate(points), np.concatenate(sources),
+                                       np.concatenate(targets))
@@ -1,8 +1,18 @@
 import logging
+
+import numpy as np
+import shapely
+from shapely import STRtree
 from shapely.validation import explain_validity
 
 LOGGER = logging.getLogger('validation')
 
+# Validation modes: check all obstacles, a random sample of them, or none
+VALIDATION_MODES = ('full', 'sample', 'skip')
+
+# Number of obstacles checked in the 'sample' validation mode
+VALIDATION_SAMPLE_SIZE = 1000
+
 def is_point_in_bounds(point, x_space_size, y_space_size):
     """
     Check if a point is within the defined space bounds.
@@ -27,30 +37,76 @@ def validate_obstacles(obstacles):
     Raises:
     - ValueError: If any obstacle is not a valid polygon.
     """
-    for polygon in obstacles:
-        if not polygon.is_valid:
-            raise ValueError(f"Invalid obstacle: {explain_validity(polygon)}")
+    valid = shapely.is_valid(np.asarray(obstacles, dtype=object).reshape(-1))
+    if not valid.all():
+        polygon = obstacles[int(np.argmin(valid))]
+        raise ValueError(f"Invalid obstacle: {explain_validity(polygon)}")
+
+
+def select_obstacles_to_validate(obstacle_count, mode='full', sample_size=VALIDATION_SAMPLE_SIZE, seed=0):
+    """
+    Select the obstacles to validate: all of them, a random sample for large trusted
+    scenes, or none for pre-validated scenes.
+
+    Parameters:
+    - obstacle_count (int): The number of obstacles.
+    - mode (str): The validation mode, one of `VALIDATION_MODES`.
+    - sample_size (int): The number of obstacles validated in the 'sample' mode.
+    - seed (int): The random seed of the sample.
+
+    Returns:
+    - np.ndarray: The sorted indices of the obstacles to validate.
+
+    Raises:
+    - ValueError: If the validation mode is unknown.
+    """
+    if mode not in VALIDATION_MODES:
+        raise ValueError(
+            f"Unknown validation mode '{mode}'. Choose one of: {', '.join(VALIDATION_MODES)}.")
+    if mode == 'skip':
+        return np.arange(0)
+    if mode == 'sample' and obstacle_count > sample_size:
+        rng = np.random.default_rng(seed)
+        return np.sort(rng.choice(obstacle_count, sample_size, replace=False))
+    return np.arange(obstacle_count)
 
 
-def check_for_overlaps_and_exceeding_bounds(obstacles, x_space_size, y_space_size):
+def check_for_overlaps_and_exceeding_bounds(obstacles, x_space_size, y_space_size, indices=None):
     """
     Check for overlapping obstacles and obstacles exceeding the defined space bounds.
 
+    The overlap candidates are found with a spatial index, so only pairs of obstacles
+    with intersecting bounding boxes are tested, and the bounds of all obstacles are
+    checked in one vectorized pass.
+
     Parameters:
     - obstacles (list): A list of shapely Polygon objects.
     - x_space_size (int): The width of the space.
     - y_space_size (int): The height of the space.
+    - indices (np.ndarray): The indices of the obstacles to check against all others,
+      None for all obstacles.
     """
-    for i in range(len(obstacles)):
-        for j in range(i + 1, len(obstacles)):
-            if obstacles[i].intersects(obstacles[j]):
-                LOGGER.warning(
-                    f"Obstacle {obstacles[i]} overlaps with {obstacles[j]}.")
-
-        # Check if the obstacle exceeds the bounds
-        if not obstacles[i].bounds[0] >= 0 or not obstacles[i].bounds[2] <= x_space_size:
-            LOGGER.warning(
-                f"Obstacle {obstacles[i]} exceeds horizontal bounds.")
-        if not obstacles[i].bounds[1] >= 0 or not obstacles[i].bounds[3] <= y_space_size:
-            LOGGER.warning(
-                f"Obstacle {obstacles[i]} exceeds vertical bounds.")
\ No newline at end of file
+    if indices is None:
+        indices = np.arange(len(obstacles))
+    if len(indices) == 0:
+        return
+    polygons = np.asarray(obstacles, dtype=object).reshape(-1)
+
+    checked, others = STRtree(polygons).query(polygons[indices], predicate='intersects')
+    checked = indices[checked]
+    # Report each overlapping pair once, from its first obstacle when both are checked
+    is_checked = np.zeros(len(polygons), dtype=bool)
+    is_checked[indices] = True
+    report = (checked < others) | ((checked > others) & ~is_checked[others])
+    pairs = np.stack((checked[report], others[report]), axis=1)
+    pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+    for i, j in pairs.tolist():
+        LOGGER.warning(f"Obstacle {i} overlaps with obstacle {j}.")
+
+    bounds = shapely.bounds(polygons[indices])
+    exceeds_horizontal = (bounds[:, 0] < 0) | (bounds[:, 2] > x_space_size)
+    exceeds_vertical = (bounds[:, 1] < 0) | (bounds[:, 3] > y_space_size)
+    for i in indices[exceeds_horizontal].tolist():
+        LOGGER.warning(f"Obstacle {i} exceeds horizontal bounds.")
+    for i in indices[exceeds_vertical].tolist():
+        LOGGER.warning(f"Obstacle {i} exceeds vertical bounds.")
@@ -0,0 +1,395 @@
+import math
+from fractions import Fraction
+from functools import cmp_to_key
+
+import numpy as np
+import shapely
+from shapely import STRtree
+from shapely.geometry.polygon import orient
+
+# Relative tolerance under which two active edges are considered to cross the sweep
+# ray at the same point, in which case they are ordered by their direction instead
+TIE_TOLERANCE = 1e-9
+# Relative error bound of a floating point orientation test, below which the sign is
+# recomputed exactly (Shewchuk's ccwerrboundA with some slack)
+ORIENTATION_ERROR_BOUND = 1e-15
+
+
+def find_visible_pairs(points, obstacles):
+    """
+    Find all pairs of mutually visible points with a rotational plane sweep (Lee's
+    algorithm) around each point.
+
+    For every point, the other points and the obstacle vertices are visited in angular
+    order while the obstacle edges cut by the sweep ray are kept ordered by their
+    distance along the ray, so each visibility test only inspects the nearest edge.
+    The sort and the binary searches take O(V² log V) time for V points and obstacle
+    vertices. The active edges are kept in a Python list, so inserting or removing one
+    moves up to E references and the sweep is O(V²·E) in the worst case. The moves are
+    block copies, far cheaper than testing every pair of points against every obstacle,
+    and the list is short unless many edges cross the sweep ray at once.
+
+    A segment is blocked exactly when it passes through the interior of an obstacle,
+    matching `is_line_crossing_obstacles`. Orientation tests fall back to exact
+    arithmetic when floating point cannot decide them, so collinear points are always
+    recognized; segments grazing a vertex within rounding error of the coordinates may
+    still be classified differently than GEOS does. Obstacle boundaries are assumed not
+    to cross each other, which `check_for_overlaps_and_exceeding_bounds` warns about.
+
+    Parameters:
+    - points (list): The distinct points to connect.
+    - obstacles (list): A list of shapely Polygon objects.
+
+    Returns:
+    - tuple: The arrays (sources, targets) of the visible pairs, indexing into
+      `points`, with sources < targets and sorted in row-major order.
+    """
+    sweep = _VisibilitySweep(points, obstacles)
+    sources = []
+    targets = []
+    for source in range(len(points)):
+        visible = sweep.visible_from(source)
+        for target in range(source + 1, len(points)):
+            if visible[target]:
+                sources.append(source)
+                targets.append(target)
+
+    return np.array(sources, dtype=np.intp), np.array(targets, dtype=np.intp)
+
+
+class _VisibilitySweep:
+    def __init__(self, points, obstacles):
+        """
+        Index the sweep events and the obstacle edges.
+
+        Parameters:
+        - points (list): The distinct points to connect.
+        - obstacles (list): A list of shapely Polygon objects.
+        """
+        self.events = [tuple(map(float, point)) for point in points]
+        event_index = {event: index for index, event in enumerate(self.events)}
+
+        # Edges are directed so that the obstacle interior lies on their left, and
+        # each obstacle corner is kept as a (vertex, previous, next) triple
+        edges = []
+        corners = []
+        for polygon in obstacles:
+            if polygon.is_empty:
+                continue
+            polygon = orient(polygon, sign=1.0)
+            for ring in [polygon.exterior, *polygon.interiors]:
+                ring_points = _without_repeated_points(ring.coords[:-1])
+                if len(ring_points) < 2:
+                    continue
+                for k, vertex in enumerate(ring_points):
+                    following = ring_points[(k + 1) % len(ring_points)]
+                    edges.append((vertex, following))
+                    corners.append((vertex, ring_points[k - 1], following))
+
+        # Obstacle vertices are sweep events too, as edges start and end there
+        for edge in edges:
+            for vertex in edge:
+                if vertex not in event_index:
+                    event_index[vertex] = len(self.events)
+                    self.events.append(vertex)
+
+        self.edges = edges
+        self.incident_edges = [[] for _ in self.events]
+        for edge_id, (a, b) in enumerate(edges):
+            self.incident_edges[event_index[a]].append(edge_id)
+            self.incident_edges[event_index[b]].append(edge_id)
+        # The obstacle corners at each event, as (previous, next) boundary points
+        self.corners = [[] for _ in self.events]
+        for vertex, previous, following in corners:
+            self.corners[event_index[vertex]].append((previous, following))
+        # The edges passing through each event without ending there
+        self.through_edges = [set() for _ in self.events]
+
+        self.event_array = np.array(self.events, dtype=float).reshape(-1, 2)
+        self.inside = np.zeros(len(self.events), dtype=bool)
+        if len(edges) > 0:
+            # Events lying strictly inside an obstacle see nothing
+            event_points = shapely.points(self.event_array)
+            event_ids, _ = STRtree(obstacles).query(
+                event_points, predicate='within')
+            self.inside[event_ids] = True
+
+            # Events lying inside an edge get a straight corner on that edge
+            edge_lines = shapely.linestrings(np.array(edges, dtype=float))
+            event_ids, edge_ids = STRtree(edge_lines).query(
+                event_points, predicate='intersects')
+            for event_id, edge_id in zip(event_ids.tolist(), edge_ids.tolist()):
+                a, b = edges[edge_id]
+                if self.events[event_id] not in (a, b):
+                    self.corners[event_id].append((a, b))
+                    self.through_edges[event_id].add(edge_id)
+
+    def visible_from(self, source):
+        """
+        Sweep a ray around a point and find the events visible from it.
+
+        Parameters:
+        - source (int): The index of the point to sweep around.
+
+        Returns:
+        - list: A flag per event telling whether it is visible from the point.
+        """
+        visible = [False] * len(self.events)
+        if self.inside[source]:
+            return visible
+
+        origin = self.events[source]
+        order = self._angular_order(source)
+        active = self._initial_active_edges(source)
+        active_ids = set(active)
+
+        previous = None
+        previous_visible = False
+        for target in order:
+            point = self.events[target]
+
+            # Edges ending at the target on the clockwise side leave the sweep
+            incoming = []
+            for edge_id in self.incident_edges[target]:
+                if edge_id in self.through_edges[source]:
+                    continue
+                other = self._far_endpoint(edge_id, target)
+                side = _orientation(origin, point, other)
+                if side < 0 and edge_id in active_ids:
+                    active.remove(edge_id)
+                    active_ids.discard(edge_id)
+                elif side > 0 and edge_id not in active_ids:
+                    incoming.append(edge_id)
+
+            if self.inside[target]:
+                is_visible = False
+            elif previous is not None and _is_on_ray(origin, self.events[previous], point):
+                # Collinear with the previous event: the target is visible only if the
+                # previous event is and the segment between them is free
+                is_visible = previous_visible and self._is_segment_clear(
+                    previous, target, active)
+            else:
+                is_visible = not active or not _segments_cross(
+                    origin, point, *self.edges[active[0]])
+
+            if is_visible:
+                is_visible = not self._enters_obstacle(source, point) and \
+                    not self._enters_obstacle(target, origin)
+            visible[target] = is_visible
+
+            # Edges starting at the target on the counterclockwise side join the sweep
+            for edge_id in incoming:
+                self._insert(active, edge_id, source, target)
+                active_ids.add(edge_id)
+
+            previous = target
+            previous_visible = is_visible
+
+        return visible
+
+    def _angular_order(self, source):
+        """
+        Order the other events by angle around the source, counterclockwise from the
+        positive x axis, and by distance for events on the same ray.
+
+        The events are sorted by the half plane and the ratio -dx/dy in floating point,
+        then runs of nearly equal ratios are sorted again with exact orientation tests
+        so that collinear events always end up next to each other.
+        """
+        deltas = self.event_array - self.event_array[source]
+        dx = deltas[:, 0]
+        dy = deltas[:, 1]
+        upper = (dy > 0) | ((dy == 0) & (dx > 0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(dy == 0, -np.inf, -dx / dy)
+        order = np.lexsort((dx * dx + dy * dy, ratio, ~upper))
+        order = order[order != source]
+
+        sorted_ratio = ratio[order]
+        sorted_upper = upper[order]
+        with np.errstate(invalid='ignore'):
+            close = (sorted_upper[1:] == sorted_upper[:-1]) & (
+                (sorted_ratio[1:] == sorted_ratio[:-1]) |
+                (np.abs(sorted_ratio[1:] - sorted_ratio[:-1]) <=
+                 TIE_TOLERANCE * np.maximum(1, np.abs(sorted_ratio[1:]))))
+        order = order.tolist()
+        if not close.any():
+            return order
+
+        origin = self.events[source]
+        compare = cmp_to_key(lambda a, b: self._compare_angles(origin, a, b))
+        run_start = 0
+        for k in range(1, len(order) + 1):
+            if k == len(order) or not close[k - 1]:
+                if k - run_start > 1:
+                    order[run_start:k] = sorted(order[run_start:k], key=compare)
+                run_start = k
+        return order
+
+    def _compare_angles(self, origin, first, second):
+        """
+        Compare two events in the same half plane around the origin by angle, then by
+        distance, exactly.
+        """
+        a = self.events[first]
+        b = self.events[second]
+        side = _orientation(origin, a, b)
+        if side != 0:
+            return -side
+        distance_a = (Fraction(a[0]) - Fraction(origin[0])) ** 2 + \
+            (Fraction(a[1]) - Fraction(origin[1])) ** 2
+        distance_b = (Fraction(b[0]) - Fraction(origin[0])) ** 2 + \
+            (Fraction(b[1]) - Fraction(origin[1])) ** 2
+        return (distance_a > distance_b) - (distance_a < distance_b)
+
+    def _initial_active_edges(self, source):
+        """
+        Find the edges crossing the initial sweep ray, pointing along the positive x
+        axis, ordered by their distance from the source.
+        """
+        origin = self.events[source]
+        px, py = origin
+        crossings = []
+        for edge_id, (a, b) in enumerate(self.edges):
+            (ax, ay), (bx, by) = a, b
+            if (ay > py) == (by > py) or ay == py or by == py:
+                continue
+            if edge_id in self.through_edges[source]:
+                continue
+            # An upward edge crosses the ray if the source lies on its left side
+            if _orientation(a, b, origin) == (1 if by > ay else -1):
+                x = ax + (py - ay) * (bx - ax) / (by - ay)
+                crossings.append((x, edge_id))
+        crossings.sort()
+        return [edge_id for _, edge_id in crossings]
+
+    def _far_endpoint(self, edge_id, event):
+        """
+        Return the endpoint of an edge other than the given event.
+        """
+        a, b = self.edges[edge_id]
+        return b if a == self.events[event] else a
+
+    def _insert(self, active, edge_id, source, target):
+        """
+        Insert an edge starting at the target into the active edges, keeping them
+        ordered by distance along the ray from the source through the target. The
+        position is found in O(log E) comparisons, the insertion itself takes O(E).
+        """
+        key = self._ray_key(edge_id, source, target)
+        low, high = 0, len(active)
+        while low < high:
+            middle = (low + high) // 2
+            if self._ray_key(active[middle], source, target) < key:
+                low = middle + 1
+            else:
+                high = middle
+        active.insert(low, edge_id)
+
+    def _ray_key(self, edge_id, source, target):
+        """
+        Compute the sort key of an edge along the ray from the source through the
+        target: the distance to the crossing point in units of the target distance,
+        rounded so that ties are ordered by the angle between the edge and the ray.
+        """
+        px, py = self.events[source]
+        wx, wy = self.events[target]
+        dx, dy = wx - px, wy - py
+        (ax, ay), (bx, by) = self.edges[edge_id]
+        ex, ey = bx - ax, by - ay
+        denominator = dx * ey - dy * ex
+        distance = ((ax - px) * ey - (ay - py) * ex) / denominator
+        if abs(distance - 1) > TIE_TOLERANCE:
+            return (distance, 0.0)
+
+        # The edge passes through the target: the smaller the angle its
+        # counterclockwise part makes with the way back to the source, the closer
+        # it is to the source once the ray moves on
+        if dx * (ay - py) - dy * (ax - px) > 0:
+            ox, oy = ax, ay
+        else:
+            ox, oy = bx, by
+        ux, uy = px - wx, py - wy
+        vx, vy = ox - wx, oy - wy
+        return (1.0, math.atan2(abs(ux * vy - uy * vx), ux * vx + uy * vy))
+
+    def _is_segment_clear(self, start, end, active):
+        """
+        Check that no obstacle edge crosses the segment between two events on the
+        sweep ray and that the segment does not leave the start into an obstacle.
+        """
+        a = self.events[start]
+        b = self.events[end]
+        for edge_id in active:
+            if _segments_cross(a, b, *self.edges[edge_id]):
+                return False
+        return not self._enters_obstacle(start, b)
+
+    def _enters_obstacle(self, event, toward):
+        """
+        Check whether a segment leaving an event toward the given point immediately
+        enters the interior of an obstacle at one of the event's corners.
+        """
+        vertex = self.events[event]
+        for previous, following in self.corners[event]:
+            corner = _orientation(vertex, following, previous)
+            after_next = _orientation(vertex, following, toward) > 0
+            before_previous = _orientation(vertex, toward, previous) > 0
+            if corner > 0 and after_next and before_previous:
+                return True
+            if corner < 0 and (after_next or before_previous):
+                return True
+            if corner == 0 and after_next and \
+                    (following[0] - vertex[0]) * (previous[0] - vertex[0]) + \
+                    (following[1] - vertex[1]) * (previous[1] - vertex[1]) < 0:
+                return True
+
+        return False
+
+
+def _without_repeated_points(points):
+    """
+    Drop consecutive duplicates from the points of a closed ring.
+    """
+    points = [tuple(map(float, point)) for point in points]
+    unique = [point for k, point in enumerate(points)
+              if point != points[k - 1]]
+    return unique or points[:1]
+
+
+def _orientation(origin, a, b):
+    """
+    Return the sign of the cross product (a - origin) x (b - origin): 1 if b lies to
+    the left of the line from the origin through a, -1 if it lies to the right and 0 if
+    the three points are collinear. The sign is exact for any floating point input.
+    """
+    left = (a[0] - origin[0]) * (b[1] - origin[1])
+    right = (a[1] - origin[1]) * (b[0] - origin[0])
+    determinant = left - right
+    bound = ORIENTATION_ERROR_BOUND * (abs(left) + abs(right))
+    if determinant > bound:
+        return 1
+    if determinant < -bound:
+        return -1
+
+    ox, oy = Fraction(origin[0]), Fraction(origin[1])
+    determinant = (Fraction(a[0]) - ox) * (Fraction(b[1]) - oy) - \
+        (Fraction(a[1]) - oy) * (Fraction(b[0]) - ox)
+    return (determinant > 0) - (determinant < 0)
+
+
+def _is_on_ray(origin, first, second):
+    """
+    Check whether the first point lies on the segment from the origin to the second.
+    """
+    return _orientation(origin, first, second) == 0 and \
+        (first[0] - origin[0]) * (second[0] - origin[0]) + \
+        (first[1] - origin[1]) * (second[1] - origin[1]) > 0
+
+
+def _segments_cross(p, q, a, b):
+    """
+    Check whether the segments pq and ab cross at a single point interior to both.
+    """
+    return _orientation(p, q, a) * _orientation(p, q, b) < 0 and \
+        _orientation(a, b, p) * _orientation(a, b, q) < 0
@@ -0,0 +1,117 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from pathfind.batch import read_queries, run_batch
+from pathfind.configuration import Configuration
+from pathfind.obstacle_course import ObstacleCourse
+from pathfind.parallel import find_paths_for_courses
+from utils.stats import RunStats, timed_iter
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        with open('tests/config.yaml', 'w') as f:
+            f.write("""
+x_start: 2
+y_start: 2
+x_goal: 98
+y_goal: 98
+x_space_size: 100
+y_space_size: 100
+list_obstacles: [
+    [[20,20], [60,20], [60,60], [20,60]]
+]
+        """)
+        with open('tests/queries.csv', 'w') as f:
+            f.write("x_start,y_start,x_goal,y_goal\n2,2,98,98\n10,50,70.5,50\n")
+        with open('tests/queries.jsonl', 'w') as f:
+            f.write('{"x_start": 2, "y_start": 2, "x_goal": 98, "y_goal": 98}\n\n'
+                    '{"x_start": 10, "y_start": 50, "x_goal": 70.5, "y_goal": 50}\n')
+
+    def test_read_queries(self):
+        expected = [([2.0, 2.0], [98.0, 98.0]), ([10.0, 50.0], [70.5, 50.0])]
+        self.assertEqual(list(read_queries('tests/queries.csv')), expected)
+        self.assertEqual(list(read_queries('tests/queries.jsonl')), expected)
+
+        with open('tests/queries.jsonl', 'w') as f:
+            f.write('{"x_start": 2, "y_start": 2, "x_goal": 98}\n')
+        with self.assertRaises(ValueError):
+            list(read_queries('tests/queries.jsonl'))
+        with self.assertRaises(ValueError):
+            list(read_queries('tests/config.yaml'))
+
+    def test_timed_read_queries(self):
+        stats = RunStats()
+        queries = timed_iter(stats, 'read_queries', read_queries('tests/queries.csv'))
+        # Nothing is read before the queries are consumed
+        self.assertEqual(stats.phases, {})
+        self.assertEqual(next(queries), ([2.0, 2.0], [98.0, 98.0]))
+        first_read = stats.phases['read_queries']
+        self.assertGreater(first_read, 0)
+        self.assertEqual(list(queries), [([10.0, 50.0], [70.5, 50.0])])
+        self.assertGreater(stats.phases['read_queries'], first_read)
+        self.assertEqual(list(timed_iter(None, 'read_queries', [1, 2])), [1, 2])
+
+    def test_run_batch(self):
+        obstacle_course = ObstacleCourse(Configuration('tests/config.yaml'))
+        queries = [([2, 2], [98, 98]), ([40, 40], [98, 98]), ([2, 2], [120, 2])]
+        output = io.StringIO()
+        self.assertEqual(run_batch(obstacle_course, queries, output), (1, 2))
+
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([result['index'] for result in results], [0, 1, 2])
+        self.assertEqual(results[0]['path'][0], [2.0, 2.0])
+        self.assertEqual(results[0]['path'][-1], [98.0, 98.0])
+        # The start of the second query lies inside the obstacle
+        self.assertEqual(results[1]['error'], 'No valid path found')
+        self.assertEqual(results[2]['error'], 'Goal point is out of bounds.')
+
+    def test_parallel_batch_matches_serial_batch(self):
+        obstacle_course = ObstacleCourse(Configuration('tests/config.yaml'))
+        queries = [([2, 2], [98, 98]), ([40, 40], [98, 98])] + \
+            [([x, 2], [98 - x, 98]) for x in range(0, 100, 5)]
+        expected = io.StringIO()
+        run_batch(obstacle_course, queries, expected)
+        actual = io.StringIO()
+        run_batch(obstacle_course, iter(queries), actual, workers=3)
+        self.assertEqual(actual.getvalue(), expected.getvalue())
+
+    def test_find_paths_for_courses(self):
+        obstacle_courses = [ObstacleCourse(Configuration('tests/config.yaml'))
+                            for _ in range(3)]
+        obstacle_courses[1].goal = [40, 40]
+        results = find_paths_for_courses(obstacle_courses, 2)
+        self.assertEqual([result['index'] for result in results], [0, 1, 2])
+        self.assertEqual(results[0]['path'], results[2]['path'])
+        self.assertEqual(results[1]['error'], 'No valid path found')
+
+    def test_batch_mode(self):
+        result = subprocess.run(
+            [sys.executable, './src/pathfind/main.py', 'tests/config.yaml', 'tests/results.jsonl',
+             '--queries', 'tests/queries.csv', '--workers', '2', '--no-cache'],
+            capture_output=True,
+            text=True
+        )
+        self.assertEqual(result.returncode, 0,
+                         msg=f"Program failed with error: {result.stderr}")
+
+        with open('tests/results.jsonl', 'r') as f:
+            results = [json.loads(line) for line in f]
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[1]['start'], [10.0, 50.0])
+        self.assertEqual(results[1]['path'][-1], [70.5, 50.0])
+
+    def tearDown(self):
+        for path in ('tests/config.yaml', 'tests/queries.csv', 'tests/queries.jsonl',
+                     'tests/results.jsonl'):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+import networkx as nx
+from shapely.geometry import Polygon
+
+from pathfind.path_strategy import FastestPathStrategy, ShortestPathStrategy
+from pathfind.pathfinder import Pathfinder
+from utils.compact_graph import CompactGraph
+from utils.graph_factory import build_graph, create_graph
+
+
+class TestCompactGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.start = (2, 2)
+        self.goal = (55, 35)
+        self.obstacles = [
+            Polygon([(20, 20), (20, 80), (80, 80), (80, 20), (40, 20), (40, 60),
+                     (50, 60), (50, 30), (60, 30), (60, 70), (30, 70), (30, 20)]),
+        ]
+
+    def test_from_edges_builds_csr_arrays(self):
+        points = [(0, 0), (3, 4), (3, 0), (0, 0)]
+        graph = CompactGraph.from_edges(points, [0, 0, 1, 3, 3], [1, 2, 2, 0, 1])
+
+        # The duplicate point is merged and the edge to itself dropped
+        self.assertEqual(graph.coordinates.tolist(),
+                         [[0.0, 0.0], [3.0, 4.0], [3.0, 0.0]])
+        self.assertEqual(graph.indptr.tolist(), [0, 2, 4, 6])
+        self.assertEqual(graph.indices.tolist(), [1, 2, 0, 2, 0, 1])
+        self.assertEqual(graph.weights.tolist(), [5.0, 3.0, 5.0, 4.0, 3.0, 4.0])
+        self.assertEqual(graph.number_of_edges(), 3)
+        self.assertEqual(graph.node_id((3, 4)), 1)
+        self.assertEqual(graph.neighbors(2).tolist(), [0, 1])
+        with self.assertRaises(KeyError):
+            graph.node_id((1, 1))
+
+    def test_networkx_round_trip(self):
+        expected = create_graph(self.start, self.goal, self.obstacles, 100, 100)
+        graph = CompactGraph.from_networkx(expected)
+        actual = graph.to_networkx()
+
+        self.assertEqual(set(actual.nodes), set(expected.nodes))
+        self.assertEqual({frozenset(edge) for edge in actual.edges},
+                         {frozenset(edge) for edge in expected.edges})
+        for u, v, weight in expected.edges(data='weight'):
+            self.assertAlmostEqual(actual[u][v]['weight'], weight)
+
+    def test_search_matches_networkx(self):
+        graph = build_graph(self.start, self.goal, self.obstacles, 100, 100, 'vectorized')
+        exported = graph.to_networkx()
+        expected_length = nx.dijkstra_path_length(exported, self.start, self.goal)
+        for strategy in (ShortestPathStrategy(), FastestPathStrategy()):
+            for algorithm in ('dijkstra', 'astar'):
+                pathfinder = Pathfinder(strategy, algorithm)
+                path = pathfinder.find_path(graph, self.start, self.goal, 1.0, 2.0)
+                self.assertEqual(path, pathfinder.find_path(
+                    exported, self.start, self.goal, 1.0, 2.0))
+                self.assertEqual(path[0], list(map(float, self.start)))
+                self.assertEqual(path[-1], list(map(float, self.goal)))
+                if isinstance(strategy, ShortestPathStrategy):
+                    length = sum(exported[tuple(u)][tuple(v)]['weight']
+                                 for u, v in nx.utils.pairwise(path))
+                    self.assertAlmostEqual(length, expected_length)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import argparse
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from shapely.geometry import Polygon
+
+from pathfind.configuration import Configuration
+from pathfind.main import add_scene_arguments, apply_scene_arguments
+from pathfind.obstacle_course import ObstacleCourse
+from utils.graph_cache import (default_cache_dir, evict_graphs, load_graph, load_landmarks,
+                               scene_key, store_graph, store_landmarks)
+from utils.graph_factory import build_obstacle_graph
+
+
+class TestGraphCache(unittest.TestCase):
+
+    def setUp(self):
+        self.obstacles = [
+            Polygon([(5, 5), (10, 5), (8, 12)]),
+            Polygon([(50, 60), (70, 40), (80, 90), (60, 80)]),
+        ]
+        self.cache = tempfile.TemporaryDirectory()
+
+    def test_scene_key(self):
+        key = scene_key(self.obstacles, 100, 100, 'sweep', False)
+        self.assertEqual(key, scene_key(
+            [Polygon(polygon.exterior.coords) for polygon in self.obstacles],
+            100.0, 100, 'sweep', False))
+        self.assertNotEqual(key, scene_key(self.obstacles[:1], 100, 100, 'sweep', False))
+        self.assertNotEqual(key, scene_key(self.obstacles, 100, 90, 'sweep', False))
+        self.assertNotEqual(key, scene_key(self.obstacles, 100, 100, 'strtree', False))
+        self.assertNotEqual(key, scene_key(self.obstacles, 100, 100, 'sweep', True))
+
+    def test_store_and_load_graph(self):
+        graph = build_obstacle_graph(self.obstacles, 100, 100, reduced=True)
+        self.assertIsNone(load_graph(self.cache.name, 'key'))
+        store_graph(self.cache.name, 'key', graph)
+
+        cached = load_graph(self.cache.name, 'key')
+        for name in ('coordinates', 'indptr', 'indices', 'weights', 'corners'):
+            self.assertIsInstance(getattr(cached, name), np.memmap)
+            np.testing.assert_array_equal(getattr(cached, name), getattr(graph, name))
+        self.assertEqual(cached.graph, graph.graph)
+
+        # An unreadable entry is ignored and replaced by the next store
+        os.remove(os.path.join(self.cache.name, 'key', 'weights.npy'))
+        with self.assertLogs('graph_cache', level='WARNING'):
+            self.assertIsNone(load_graph(self.cache.name, 'key'))
+        store_graph(self.cache.name, 'key', graph)
+        self.assertIsNotNone(load_graph(self.cache.name, 'key'))
+
+    def test_store_and_load_landmarks(self):
+        distances = np.arange(12, dtype=float).reshape(3, 4)
+        store_landmarks(self.cache.name, 'key', ('weight',), distances)
+        self.assertIsNone(load_landmarks(self.cache.name, 'key', ('weight',)))
+
+        store_graph(self.cache.name, 'key', build_obstacle_graph(self.obstacles, 100, 100))
+        store_landmarks(self.cache.name, 'key', ('weight',), distances)
+        np.testing.assert_array_equal(load_landmarks(self.cache.name, 'key', ('weight',)), distances)
+        self.assertIsNone(load_landmarks(self.cache.name, 'key', ('travel_time', 1.0, 2.0)))
+
+    def test_evicts_least_recently_used_graphs(self):
+        graph = build_obstacle_graph(self.obstacles, 100, 100)
+        for age, key in enumerate(('newest', 'middle', 'oldest')):
+            store_graph(self.cache.name, key, graph)
+            os.utime(os.path.join(self.cache.name, key), (1000 - age, 1000 - age))
+        entry_size = sum(file.stat().st_size for file in
+                         os.scandir(os.path.join(self.cache.name, 'newest')))
+
+        # Loading a graph marks it as recently used
+        load_graph(self.cache.name, 'oldest')
+        evict_graphs(self.cache.name, 2 * entry_size)
+        self.assertEqual(sorted(os.listdir(self.cache.name)), ['newest', 'oldest'])
+        evict_graphs(self.cache.name, entry_size)
+        self.assertEqual(os.listdir(self.cache.name), ['oldest'])
+
+    def test_obstacle_course_uses_cache(self):
+        with open('tests/config.yaml', 'w') as f:
+            f.write(f"""
+x_start: 2
+y_start: 2
+x_goal: 98
+y_goal: 98
+x_space_size: 100
+y_space_size: 100
+list_obstacles: [
+    [[5,5], [10,5], [8,12]],
+    [[50,60], [70,40], [80,90], [60,80]]
+]
+cache_dir: {self.cache.name}
+        """)
+        config = Configuration('tests/config.yaml')
+        os.remove('tests/config.yaml')
+        expected = ObstacleCourse(config).find_path()
+        self.assertEqual(len(os.listdir(self.cache.name)), 1)
+
+        obstacle_course = ObstacleCourse(config)
+        self.assertEqual(obstacle_course.find_path(), expected)
+        self.assertIsInstance(obstacle_course.obstacle_graph.indices, np.memmap)
+
+        # The landmark index of ALT searches is stored with the cached graph
+        config.search_algorithm = 'alt'
+        self.assertEqual(ObstacleCourse(config).find_path(), expected)
+        obstacle_course = ObstacleCourse(config)
+        self.assertEqual(obstacle_course.find_path(), expected)
+        self.assertIsInstance(obstacle_course.pathfinder.landmark_index.distances, np.memmap)
+
+    def test_cache_dir_defaults(self):
+        scene = "x_start: 2\ny_start: 2\nx_goal: 98\ny_goal: 98\nx_space_size: 100\n" \
+                "y_space_size: 100\nlist_obstacles: [[[5,5], [10,5], [8,12]]]\n"
+        parser = argparse.ArgumentParser()
+        add_scene_arguments(parser)
+        # The library only caches when asked to, the command line in the user cache directory
+        cases = [
+            ('', [], None, default_cache_dir()),
+            (f'cache_dir: {self.cache.name}\n', [], self.cache.name, self.cache.name),
+            ('', ['--cache-dir', self.cache.name], None, self.cache.name),
+            (f'cache_dir: {self.cache.name}\n', ['--no-cache'], self.cache.name, None),
+        ]
+        for extra, argv, expected_library, expected_command in cases:
+            with open('tests/config.yaml', 'w') as f:
+                f.write(scene + extra)
+            config = Configuration('tests/config.yaml')
+            os.remove('tests/config.yaml')
+            self.assertEqual(config.cache_dir, expected_library)
+            apply_scene_arguments(config, parser.parse_args(argv))
+            self.assertEqual(config.cache_dir, expected_command)
+
+    def tearDown(self):
+        self.cache.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+import unittest
+
+import networkx as nx
+from shapely.geometry import Polygon
+
+from utils.graph_factory import (GRAPH_BUILDERS, add_obstacle_to_graph, build_graph,
+                                 build_obstacle_graph, collect_nodes, create_graph,
+                                 create_indexed_graph, create_sweep_graph, create_vectorized_graph,
+                                 find_visible_edges, get_graph_builder, link_endpoints,
+                                 remove_obstacle_from_graph)
+
+
+def edge_set(graph):
+    return {frozenset(edge) for edge in graph.edges}
+
+
+class TestGraphFactory(unittest.TestCase):
+
+    def setUp(self):
+        self.start = [2, 2]
+        self.goal = [98, 98]
+        self.obstacles = [
+            Polygon([(5, 5), (10, 5), (8, 12)]),
+            Polygon([(50, 60), (70, 40), (80, 90), (60, 80)]),
+            Polygon([(20, 20), (20, 80), (80, 80), (80, 20), (40, 20), (40, 60),
+                     (50, 60), (50, 30), (60, 30), (60, 70), (30, 70), (30, 20)]),
+        ]
+
+    def test_indexed_graph_matches_brute_force(self):
+        for obstacles in (self.obstacles[:2], self.obstacles[2:]):
+            expected = create_graph(
+                self.start, self.goal, obstacles, 100, 100)
+            actual = create_indexed_graph(
+                self.start, self.goal, obstacles, 100, 100)
+            self.assertEqual(set(actual.nodes), set(expected.nodes))
+            self.assertEqual(edge_set(actual), edge_set(expected))
+
+    def test_vectorized_graph_matches_brute_force(self):
+        for obstacles in (self.obstacles[:2], self.obstacles[2:], []):
+            expected = create_graph(
+                self.start, self.goal, obstacles, 100, 100)
+            actual = create_vectorized_graph(
+                self.start, self.goal, obstacles, 100, 100)
+            self.assertEqual(list(actual.edges), list(expected.edges))
+            for u, v, weight in expected.edges(data='weight'):
+                self.assertAlmostEqual(actual[u][v]['weight'], weight)
+
+    def test_sweep_graph_matches_brute_force(self):
+        touching = [
+            Polygon([(10, 10), (20, 10), (20, 20), (10, 20)]),
+            Polygon([(20, 10), (30, 10), (30, 20), (20, 20)]),
+            Polygon([(40, 40), (60, 40), (60, 60), (40, 60)]),
+        ]
+        scenes = [
+            (self.start, self.goal, self.obstacles[:2]),
+            ([2, 2], [55, 35], self.obstacles[2:]),
+            ([0, 0], [100, 100], touching),
+            # Start on an obstacle edge and goal on an obstacle vertex
+            ([10, 15], [60, 60], touching),
+            ([2, 2], [98, 98], [Polygon([(0, 0), (100, 0), (100, 100), (0, 100)])]),
+        ]
+        for start, goal, obstacles in scenes:
+            expected = create_graph(start, goal, obstacles, 100, 100)
+            actual = create_sweep_graph(start, goal, obstacles, 100, 100)
+            self.assertEqual(set(actual.nodes), set(expected.nodes))
+            self.assertEqual(edge_set(actual), edge_set(expected))
+
+    def test_reduced_graph_keeps_shortest_path(self):
+        scenes = [
+            (self.start, self.goal, self.obstacles[:2]),
+            ([2, 2], [55, 35], self.obstacles[2:]),
+        ]
+        for start, goal, obstacles in scenes:
+            full = create_graph(start, goal, obstacles, 100, 100)
+            expected_length = nx.dijkstra_path_length(
+                full, tuple(start), tuple(goal))
+            for name, builder in GRAPH_BUILDERS.items():
+                reduced = builder(start, goal, obstacles,
+                                  100, 100, reduced=True)
+                self.assertLess(reduced.number_of_edges(),
+                                full.number_of_edges(), name)
+                self.assertAlmostEqual(nx.dijkstra_path_length(
+                    reduced, tuple(start), tuple(goal)), expected_length, msg=name)
+
+    def test_reduced_graph_reports_pruning(self):
+        graph = create_graph([2, 2], [55, 35], self.obstacles[2:],
+                             100, 100, reduced=True)
+        # The concave obstacle has four reflex vertices
+        self.assertEqual(graph.graph['pruned_nodes'], 4)
+        self.assertGreater(graph.graph['pruned_edges'], 0)
+        for vertex in [(50.0, 30.0), (60.0, 30.0), (60.0, 70.0), (30.0, 70.0)]:
+            self.assertNotIn(vertex, graph.nodes)
+
+    def test_linked_obstacle_graph_matches_full_graph(self):
+        queries = [
+            (self.start, self.goal),
+            ([2, 2], [55, 35]),
+            # Endpoints on obstacle vertices, convex and concave, and equal endpoints
+            ([20, 20], [50, 30]),
+            ([45, 65], [45, 65]),
+        ]
+        for reduced in (False, True):
+            for name in GRAPH_BUILDERS:
+                obstacle_graph = build_obstacle_graph(
+                    self.obstacles, 100, 100, name, reduced)
+                edge_count = obstacle_graph.number_of_edges()
+                for start, goal in queries:
+                    expected = build_graph(start, goal, self.obstacles,
+                                           100, 100, name, reduced).to_networkx()
+                    actual = link_endpoints(obstacle_graph, [start, goal], self.obstacles,
+                                            reduced).to_networkx()
+                    self.assertEqual(set(actual.nodes), set(expected.nodes))
+                    self.assertEqual(edge_set(actual), edge_set(expected),
+                                     (name, reduced, start, goal))
+                # The cached graph is left unchanged
+                self.assertEqual(obstacle_graph.number_of_edges(), edge_count)
+
+    def test_reduced_link_from_obstacle_vertex(self):
+        square = [Polygon([(10, 10), (20, 10), (20, 20), (10, 20)])]
+        # The direct edge runs between the neighbours of the start's corner, so it is not
+        # tangent there, but the start is a free endpoint like in a full build
+        start, goal = (20.0, 10.0), (25.0, 5.0)
+        obstacle_graph = build_obstacle_graph(square, 100, 100, 'vectorized', True)
+        for points in ([start, goal], [goal, start]):
+            expected = build_graph(start, goal, square, 100, 100, 'vectorized', True).to_networkx()
+            actual = link_endpoints(obstacle_graph, points, square, True).to_networkx()
+            self.assertEqual(edge_set(actual), edge_set(expected))
+            self.assertIn(frozenset((start, goal)), edge_set(actual))
+
+    def test_updated_obstacle_graph_matches_rebuild(self):
+        extra = [
+            Polygon([(85, 10), (95, 10), (95, 30), (85, 30)]),
+            # Blocks lines of sight between the other obstacles
+            Polygon([(30, 85), (45, 82), (40, 95)]),
+            Polygon([(2, 40), (12, 40), (12, 50), (2, 50)]),
+        ]
+        obstacles = self.obstacles + extra
+        for reduced in (False, True):
+            graph = build_obstacle_graph(self.obstacles, 100, 100, 'vectorized', reduced)
+            for count in range(1, len(extra) + 1):
+                graph = add_obstacle_to_graph(graph, extra[count - 1], obstacles[:3 + count],
+                                              100, 100, reduced)
+                expected = build_obstacle_graph(obstacles[:3 + count], 100, 100,
+                                                'vectorized', reduced)
+                self.assertEqual(set(graph.to_networkx().nodes),
+                                 set(expected.to_networkx().nodes))
+                self.assertEqual(edge_set(graph.to_networkx()),
+                                 edge_set(expected.to_networkx()), (reduced, count))
+
+            for index in (4, 0, 2):
+                polygon = obstacles.pop(index)
+                graph = remove_obstacle_from_graph(graph, polygon, obstacles, 100, 100, reduced)
+                expected = build_obstacle_graph(obstacles, 100, 100, 'vectorized', reduced)
+                self.assertEqual(set(graph.to_networkx().nodes),
+                                 set(expected.to_networkx().nodes))
+                self.assertEqual(edge_set(graph.to_networkx()),
+                                 edge_set(expected.to_networkx()), (reduced, index))
+            obstacles = self.obstacles + extra
+
+    def test_find_visible_edges_is_independent_of_chunk_size(self):
+        nodes = collect_nodes(self.start, self.goal,
+                              self.obstacles[2:], 100, 100)
+        expected = find_visible_edges(nodes, self.obstacles[2:])
+        for chunk_size in (1, 7, 50):
+            actual = find_visible_edges(
+                nodes, self.obstacles[2:], chunk_size=chunk_size)
+            for expected_array, actual_array in zip(expected, actual):
+                self.assertEqual(actual_array.tolist(),
+                                 expected_array.tolist())
+
+    def test_threaded_build_is_deterministic(self):
+        for reduced in (False, True):
+            expected = build_obstacle_graph(self.obstacles, 100, 100, 'vectorized', reduced)
+            for threads in (2, 3, 8):
+                actual = build_obstacle_graph(self.obstacles, 100, 100, 'vectorized', reduced,
+                                              threads)
+                self.assertEqual(actual.coordinates.tolist(), expected.coordinates.tolist())
+                self.assertEqual(actual.indptr.tolist(), expected.indptr.tolist())
+                self.assertEqual(actual.indices.tolist(), expected.indices.tolist())
+                self.assertEqual(actual.graph, expected.graph)
+
+    def test_get_graph_builder(self):
+        self.assertIs(get_graph_builder('brute_force'), create_graph)
+        self.assertIs(get_graph_builder('strtree'), create_indexed_graph)
+        self.assertIs(get_graph_builder('vectorized'),
+                      create_vectorized_graph)
+        self.assertIs(get_graph_builder('sweep'), create_sweep_graph)
+        with self.assertRaises(ValueError):
+            get_graph_builder('unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
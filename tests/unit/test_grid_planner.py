@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+from shapely.geometry import Polygon
+
+from pathfind.grid_planner import GridPlanner
+from pathfind.path_strategy import FastestPathStrategy, ShortestPathStrategy
+from pathfind.pathfinder import Pathfinder
+from utils.graph_factory import build_graph
+from utils.obstacle_index import is_line_crossing_obstacles
+from utils.occupancy_grid import rasterize_obstacles
+from utils.scene_generator import generate_scene
+
+
+def path_cost(strategy, path):
+    return sum(strategy.calculate_travel_cost(a, b, 1.0, 12.0) for a, b in zip(path, path[1:]))
+
+
+class TestGridPlanner(unittest.TestCase):
+
+    def test_paths_avoid_obstacles_and_are_near_optimal(self):
+        start, goal, obstacles = generate_scene(20, 6, concave_fraction=0.25, seed=1)
+        grid = rasterize_obstacles(obstacles, 100, 100, 1.0)
+        graph = build_graph(start, goal, obstacles, 100, 100, 'vectorized')
+        for strategy in (ShortestPathStrategy(), FastestPathStrategy()):
+            planner = GridPlanner(strategy)
+            path = planner.find_path(grid, tuple(start), tuple(goal), 1.0, 12.0)
+            self.assertEqual(path[0], list(map(float, start)))
+            self.assertEqual(path[-1], list(map(float, goal)))
+            for a, b in zip(path, path[1:]):
+                self.assertFalse(is_line_crossing_obstacles([a, b], obstacles))
+
+            optimal = Pathfinder(strategy).find_path(graph, tuple(start), tuple(goal), 1.0, 12.0)
+            cost = path_cost(strategy, path)
+            self.assertGreaterEqual(cost, path_cost(strategy, optimal) - 1e-9)
+            self.assertLess(cost, path_cost(strategy, optimal) * 1.15)
+            self.assertGreaterEqual(planner.nodes_pushed, planner.nodes_popped)
+            self.assertGreaterEqual(planner.nodes_popped, planner.nodes_expanded)
+
+    def test_any_angle_path(self):
+        grid = rasterize_obstacles([Polygon([(20, 20), (60, 20), (60, 60), (20, 60)])], 100, 100, 1.0)
+        planner = GridPlanner(ShortestPathStrategy())
+        # Without obstacles between them, the path is the straight segment
+        self.assertEqual(planner.find_path(grid, (2, 2), (98, 10), None, None),
+                         [[2.0, 2.0], [98.0, 10.0]])
+        self.assertEqual(planner.find_path(grid, (2.2, 2.7), (2.5, 2.1), None, None),
+                         [[2.2, 2.7], [2.5, 2.1]])
+        path = planner.find_path(grid, (2, 2), (98, 98), None, None)
+        # The path turns once, next to a corner of the obstacle
+        self.assertEqual(len(path), 3)
+        self.assertTrue(np.allclose(path[1], [60.5, 19.5]) or np.allclose(path[1], [19.5, 60.5]))
+
+    def test_no_path(self):
+        walled = rasterize_obstacles([Polygon([(40, 0), (60, 0), (60, 100), (40, 100)])], 100, 100, 1.0)
+        planner = GridPlanner(ShortestPathStrategy())
+        with self.assertRaises(Exception):
+            planner.find_path(walled, (2, 2), (98, 98), None, None)
+        # The goal lies inside a blocked cell
+        with self.assertRaises(Exception):
+            planner.find_path(walled, (2, 2), (50, 50), None, None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+import unittest
+
+# Bound of the cumulative import time of the CLI entry point, as a multiple of the time of
+# importing the dependencies every run needs, measured alongside it so that the bound
+# scales with the machine. Importing matplotlib up front alone exceeds it.
+IMPORT_TIME_FACTOR = 2.5
+
+# Modules that every run imports, making up the baseline import time
+BASELINE_MODULES = ('numpy', 'shapely', 'yaml')
+
+# Modules that only some runs use and that must not load on startup
+LAZY_MODULES = ('matplotlib', 'networkx', 'utils.plotter', 'utils.visibility_sweep',
+                'pathfind.parallel', 'pathfind.server', 'pathfind.grid_planner',
+                'pathfind.tiled_planner', 'utils.occupancy_grid', 'utils.tile_map')
+
+
+def import_times(modules):
+    """
+    Import modules in a fresh interpreter with `-X importtime`.
+
+    Parameters:
+    - modules (tuple): The names of the modules to import.
+
+    Returns:
+    - dict: The cumulative import time in microseconds of every module imported.
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, ('src', env.get('PYTHONPATH'))))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {", ".join(modules)}'],
+        capture_output=True, text=True, env=env, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_optional_modules_load_lazily(self):
+        times = import_times(('pathfind.main',))
+        self.assertIn('pathfind.obstacle_course', times)
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, times)
+
+    def test_import_time_budget(self):
+        # The best of a few interleaved runs, so that a busy moment does not fail the test
+        baselines = []
+        imports = []
+        for _ in range(3):
+            times = import_times(BASELINE_MODULES)
+            baselines.append(sum(times[module] for module in BASELINE_MODULES))
+            imports.append(import_times(('pathfind.main',))['pathfind.main'])
+        baseline, best = min(baselines), min(imports)
+        self.assertLess(best, IMPORT_TIME_FACTOR * baseline,
+                        msg=f"Importing pathfind.main took {best / 1000:.0f} ms, importing "
+                            f"{', '.join(BASELINE_MODULES)} {baseline / 1000:.0f} ms.")
+
+
+if __name__ == '__main__':
+    unittest.main()
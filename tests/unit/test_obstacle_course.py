@@ -1,12 +1,17 @@
+import math
 import os
 import unittest
 
+import numpy as np
 from shapely.geometry import Polygon
 from pathfind.configuration import Configuration
 
 from pathfind.obstacle_course import ObstacleCourse
+from pathfind.path_strategy import ShortestPathStrategy
 from utils.graph_factory import create_graph, is_line_crossing_obstacles
-from utils.validation import check_for_overlaps_and_exceeding_bounds, validate_obstacles
+from utils.stats import RunStats
+from utils.validation import (check_for_overlaps_and_exceeding_bounds, select_obstacles_to_validate,
+                              validate_obstacles)
 
 
 class TestObstacleCourse(unittest.TestCase):
@@ -60,6 +65,46 @@ list_obstacles: [
             check_for_overlaps_and_exceeding_bounds(
                 valid_obstacles, self.config.x_space_size, self.config.y_space_size)
 
+    def test_overlaps_are_reported_once(self):
+        obstacles = [Polygon(obstacle) for obstacle in (
+            [(5, 5), (10, 5), (8, 12)],
+            [(60, 60), (60, 80), (80, 80), (80, 60)],
+            [(50, 60), (70, 40), (80, 90), (60, 80)],
+            [(75, 75), (95, 75), (95, 95)],
+        )]
+        with self.assertLogs('validation', level='WARNING') as logs:
+            check_for_overlaps_and_exceeding_bounds(obstacles, 100, 100)
+        self.assertEqual(logs.output, [
+            'WARNING:validation:Obstacle 1 overlaps with obstacle 2.',
+            'WARNING:validation:Obstacle 1 overlaps with obstacle 3.',
+            'WARNING:validation:Obstacle 2 overlaps with obstacle 3.',
+        ])
+
+        # Only pairs with a checked obstacle are reported
+        with self.assertLogs('validation', level='WARNING') as logs:
+            check_for_overlaps_and_exceeding_bounds(obstacles, 100, 100, np.array([3]))
+        self.assertEqual(logs.output, [
+            'WARNING:validation:Obstacle 3 overlaps with obstacle 1.',
+            'WARNING:validation:Obstacle 3 overlaps with obstacle 2.',
+        ])
+
+    def test_select_obstacles_to_validate(self):
+        np.testing.assert_array_equal(select_obstacles_to_validate(5), np.arange(5))
+        self.assertEqual(len(select_obstacles_to_validate(5, 'skip')), 0)
+        np.testing.assert_array_equal(select_obstacles_to_validate(5, 'sample', 10), np.arange(5))
+        sample = select_obstacles_to_validate(100, 'sample', 10)
+        self.assertEqual(len(np.unique(sample)), 10)
+        np.testing.assert_array_equal(sample, select_obstacles_to_validate(100, 'sample', 10))
+        with self.assertRaises(ValueError):
+            select_obstacles_to_validate(5, 'partial')
+
+    def test_skip_validation(self):
+        self.config.obstacles = [[(0, 0), (1, 1), (1, 0), (0, 1)]]
+        with self.assertRaises(ValueError):
+            ObstacleCourse(self.config)
+        self.config.validation = 'skip'
+        ObstacleCourse(self.config)
+
     def test_check_for_exceeding_bounds(self):
         # Test exceeding bounds
         exceeding_obstacles = [
@@ -74,6 +119,186 @@ list_obstacles: [
         self.assertIn(tuple(self.config.start), graph.nodes)
         self.assertIn(tuple(self.config.goal), graph.nodes)
 
+    def test_find_paths(self):
+        obstacle_course = ObstacleCourse(self.config)
+        obstacle_course.obstacles = [Polygon([(20, 20), (60, 20), (60, 60), (20, 60)])]
+        queries = [([2, 2], [98, 98]), ([10, 50], [70, 50]), ([98, 98], [2, 2])]
+        paths = obstacle_course.find_paths(queries)
+
+        for (start, goal), path in zip(queries, paths):
+            self.assertEqual(path[0], list(map(float, start)))
+            self.assertEqual(path[-1], list(map(float, goal)))
+        self.assertIn(paths[0][1:-1], [[[60.0, 20.0]], [[20.0, 60.0]]])
+        self.assertIn(paths[1][1:-1], [[[20.0, 20.0], [60.0, 20.0]],
+                                       [[20.0, 60.0], [60.0, 60.0]]])
+        self.assertEqual(paths[2], paths[0][::-1])
+        # The obstacle graph is built once and reused by every query
+        obstacle_graph = obstacle_course.obstacle_graph
+        obstacle_course.find_path_between([10, 50], [70, 50])
+        self.assertIs(obstacle_course.obstacle_graph, obstacle_graph)
+
+        with self.assertRaises(ValueError):
+            obstacle_course.find_path_between([2, 2], [120, 50])
+
+    def test_find_paths_from(self):
+        obstacle_course = ObstacleCourse(self.config)
+        obstacle_course.obstacles = [Polygon([(20, 20), (60, 20), (60, 60), (20, 60)])]
+        goals = [[98, 98], [70, 50], [2, 2]]
+        costs, paths = obstacle_course.find_paths_from([10, 50], goals)
+
+        for goal, cost, path in zip(goals, costs, paths):
+            expected = obstacle_course.find_path_between([10, 50], goal)
+            self.assertEqual(path, expected)
+            self.assertAlmostEqual(cost, sum(
+                math.dist(a, b) for a, b in zip(path, path[1:])))
+        with self.assertRaises(ValueError):
+            obstacle_course.find_paths_from([10, 50], [[120, 50]])
+
+    def test_cost_matrix(self):
+        obstacle_course = ObstacleCourse(self.config)
+        obstacle_course.obstacles = [Polygon([(20, 20), (60, 20), (60, 60), (20, 60)])]
+        points = [[2, 2], [98, 98], [10, 50], [70, 50]]
+        matrix = obstacle_course.cost_matrix(points)
+
+        self.assertEqual(matrix.shape, (4, 4))
+        np.testing.assert_allclose(matrix, matrix.T)
+        np.testing.assert_array_equal(np.diag(matrix), 0)
+        costs, _ = obstacle_course.find_paths_from(points[2], points)
+        np.testing.assert_allclose(matrix[2], costs)
+        np.testing.assert_allclose(obstacle_course.cost_matrix(points, workers=2), matrix)
+
+    def test_run_stats(self):
+        stats = RunStats()
+        obstacle_course = ObstacleCourse(self.config, stats)
+        obstacle_course.obstacles = [Polygon([(20, 20), (60, 20), (60, 60), (20, 60)])]
+        obstacle_course.find_path_between([2, 2], [98, 98])
+        obstacle_course.find_path_between([10, 50], [70, 50])
+
+        self.assertEqual(list(stats.phases), ['validate', 'graph', 'link', 'search'])
+        counters = stats.counters
+        self.assertEqual(counters['searches'], 2)
+        self.assertEqual(counters['graph_edges'], obstacle_course.obstacle_graph.number_of_edges())
+        # Every pair of the 4 vertices is tested once
+        self.assertEqual(counters['visibility_tests'], 6)
+        self.assertGreater(counters['link_visibility_tests'], 0)
+        self.assertGreaterEqual(counters['nodes_pushed'], counters['nodes_popped'])
+        self.assertGreaterEqual(counters['nodes_popped'], counters['nodes_expanded'])
+        self.assertEqual(stats.to_dict()['counters'], counters)
+
+    def test_grid_engine(self):
+        self.config.engine = 'grid'
+        self.config.grid_resolution = 0.5
+        stats = RunStats()
+        obstacle_course = ObstacleCourse(self.config, stats)
+        obstacle_course.obstacles = [Polygon([(20, 20), (60, 20), (60, 60), (20, 60)])]
+        path = obstacle_course.find_path_between([2, 2], [98, 98])
+
+        self.assertEqual(path[0], [2.0, 2.0])
+        self.assertEqual(path[-1], [98.0, 98.0])
+        self.assertLess(sum(math.dist(a, b) for a, b in zip(path, path[1:])),
+                        math.dist((2, 2), (60, 20)) + math.dist((60, 20), (98, 98)) + 1)
+        self.assertIsNone(obstacle_course.obstacle_graph)
+        self.assertEqual(list(stats.phases), ['validate', 'grid', 'search'])
+        self.assertEqual(stats.counters['grid_cells'], 200 * 200)
+        self.assertEqual(stats.counters['nodes_expanded'], obstacle_course.grid_planner.nodes_expanded)
+
+        index = obstacle_course.add_obstacle([(70, 70), (90, 70), (90, 90), (70, 90)])
+        self.assertIsNone(obstacle_course.occupancy_grid)
+        obstacle_course.remove_obstacle(index)
+        with self.assertRaises(ValueError):
+            obstacle_course.find_path_between([2, 2], [120, 50])
+        with self.assertRaises(ValueError):
+            obstacle_course.cost_matrix([[2, 2], [98, 98]])
+
+        self.config.engine = 'raster'
+        with self.assertRaises(ValueError):
+            ObstacleCourse(self.config)
+        self.config.engine = 'grid'
+        self.config.grid_resolution = 0
+        with self.assertRaises(ValueError):
+            ObstacleCourse(self.config)
+
+    def test_tiled_engine(self):
+        self.config.engine = 'tiled'
+        self.config.tile_size = 25
+        stats = RunStats()
+        obstacle_course = ObstacleCourse(self.config, stats)
+        obstacle_course.obstacles = [Polygon([(20, 20), (60, 20), (60, 60), (20, 60)])]
+        path = obstacle_course.find_path_between([2, 2], [98, 98])
+
+        self.assertEqual(path[0], [2.0, 2.0])
+        self.assertEqual(path[-1], [98.0, 98.0])
+        self.assertAlmostEqual(sum(math.dist(a, b) for a, b in zip(path, path[1:])),
+                               math.dist((2, 2), (60, 20)) + math.dist((60, 20), (98, 98)))
+        self.assertIsNone(obstacle_course.obstacle_graph)
+        self.assertEqual(list(stats.phases), ['validate', 'search'])
+        self.assertEqual(stats.counters['tiles_built'], len(obstacle_course.tile_map.tiles))
+        self.assertEqual(stats.counters['nodes_expanded'], obstacle_course.tiled_planner.nodes_expanded)
+
+        index = obstacle_course.add_obstacle([(70, 70), (90, 70), (90, 90), (70, 90)])
+        self.assertIsNone(obstacle_course.tile_map)
+        obstacle_course.remove_obstacle(index)
+        with self.assertRaises(ValueError):
+            obstacle_course.find_path_between([2, 2], [120, 50])
+        with self.assertRaises(ValueError):
+            obstacle_course.cost_matrix([[2, 2], [98, 98]])
+
+        self.config.tile_size = 0
+        with self.assertRaises(ValueError):
+            ObstacleCourse(self.config)
+        self.config.tile_size = 25
+        self.config.max_tiles = 0
+        with self.assertRaises(ValueError):
+            ObstacleCourse(self.config)
+
+    def test_search_budget(self):
+        square = Polygon([(20, 20), (60, 20), (60, 60), (20, 60)])
+        self.config.expansion_budget = 1
+        obstacle_course = ObstacleCourse(self.config)
+        obstacle_course.obstacles = [square]
+        with self.assertRaises(Exception):
+            obstacle_course.find_path_between([2, 2], [98, 98])
+
+        self.config.expansion_budget = 1000
+        stats = RunStats()
+        obstacle_course = ObstacleCourse(self.config, stats)
+        obstacle_course.obstacles = [square]
+        path = obstacle_course.find_path_between([2, 2], [98, 98])
+        self.assertEqual(len(path), 3)
+        self.assertAlmostEqual(sum(math.dist(a, b) for a, b in zip(path, path[1:])),
+                               math.dist((2, 2), (60, 20)) + math.dist((60, 20), (98, 98)))
+        self.assertEqual(obstacle_course.suboptimality_bound, 1.0)
+        self.assertGreater(stats.counters['anytime_iterations'], 0)
+
+        self.config.time_budget = 0
+        with self.assertRaises(ValueError):
+            ObstacleCourse(self.config)
+        self.config.time_budget = 1.0
+        self.config.engine = 'grid'
+        with self.assertRaises(ValueError):
+            ObstacleCourse(self.config)
+
+    def test_reduced_graph_in_fastest_mode(self):
+        self.config.reduced_graph = True
+        self.assertIsInstance(ObstacleCourse(self.config).strategy, ShortestPathStrategy)
+        self.config.mass = 1.0
+        self.config.max_acceleration = 12.0
+        with self.assertRaises(ValueError):
+            ObstacleCourse(self.config)
+
+    def test_add_and_remove_obstacles(self):
+        obstacle_course = ObstacleCourse(self.config)
+        obstacle_course.obstacles = []
+        self.assertEqual(obstacle_course.find_path(), [[2.0, 2.0], [98.0, 98.0]])
+
+        index = obstacle_course.add_obstacle([(20, 20), (60, 20), (60, 60), (20, 60)])
+        self.assertEqual(len(obstacle_course.find_path()), 3)
+        with self.assertRaises(ValueError):
+            obstacle_course.add_obstacle([(0, 0), (1, 1), (1, 0), (0, 1)])
+
+        obstacle_course.remove_obstacle(index)
+        self.assertEqual(obstacle_course.find_path(), [[2.0, 2.0], [98.0, 98.0]])
+
     def find_optimal_path(self):
         path = self.obstacle_course.find_path()
         self.assertIsInstance(path, list)
@@ -0,0 +1,55 @@
+import random
+import unittest
+
+import numpy as np
+from shapely.geometry import Polygon
+
+from utils.obstacle_index import ObstacleIndex, is_line_crossing_obstacles
+from utils.scene_generator import generate_scene
+
+
+class TestObstacleIndex(unittest.TestCase):
+
+    def setUp(self):
+        _, _, self.obstacles = generate_scene(16, 6, concave_fraction=0.5, seed=2)
+        self.obstacles.append(Polygon([(0, 0), (10, 0), (10, 10), (0, 10)]))
+        self.index = ObstacleIndex(self.obstacles)
+        rng = random.Random(0)
+        vertices = [point for obstacle in self.obstacles for point in obstacle.exterior.coords]
+        # Lines between vertices touch obstacles at their ends and run along their edges
+        self.lines = [[rng.choice(vertices), rng.choice(vertices)] for _ in range(300)]
+        self.lines += [[(rng.uniform(0, 100), rng.uniform(0, 100)),
+                        (rng.uniform(0, 100), rng.uniform(0, 100))] for _ in range(300)]
+        self.lines += [[(0, 0), (10, 0)], [(0, 0), (10, 10)], [(5, 5), (5, 5)], [(0, 0), (0, 0)]]
+
+    def test_is_line_crossing_matches_predicates(self):
+        for line in self.lines:
+            expected = is_line_crossing_obstacles(line, self.obstacles)
+            self.assertEqual(self.index.is_line_crossing(line), expected, line)
+            self.assertEqual(self.index.is_line_crossing(line, indexed=True), expected, line)
+
+    def test_find_blocked_segments_matches_predicates(self):
+        starts = np.array([line[0] for line in self.lines], dtype=float)
+        ends = np.array([line[1] for line in self.lines], dtype=float)
+        expected = [is_line_crossing_obstacles(line, self.obstacles) for line in self.lines]
+        self.assertEqual(self.index.find_blocked_segments(starts, ends).tolist(), expected)
+
+    def test_copy_shares_no_geometries(self):
+        copy = self.index.copy()
+        self.assertTrue(all(a is not b for a, b in zip(copy.geometries, self.index.geometries)))
+        self.assertTrue(all(a.equals_exact(b, 0) for a, b in zip(copy.obstacles, self.obstacles)))
+        starts = np.array([line[0] for line in self.lines], dtype=float)
+        ends = np.array([line[1] for line in self.lines], dtype=float)
+        self.assertEqual(copy.find_blocked_segments(starts, ends).tolist(),
+                         self.index.find_blocked_segments(starts, ends).tolist())
+
+    def test_without_obstacles(self):
+        index = ObstacleIndex([])
+        self.assertFalse(index.is_line_crossing([(0, 0), (10, 10)]))
+        self.assertFalse(index.is_line_crossing([(0, 0), (10, 10)], indexed=True))
+        self.assertEqual(index.find_blocked_segments(np.zeros((2, 2)), np.ones((2, 2))).tolist(),
+                         [False, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
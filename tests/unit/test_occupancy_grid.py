@@ -0,0 +1,55 @@
+import random
+import unittest
+
+import numpy as np
+from shapely.geometry import Polygon, box
+
+from utils.obstacle_index import is_line_crossing_obstacles
+from utils.occupancy_grid import rasterize_obstacles
+from utils.scene_generator import generate_scene
+
+
+class TestOccupancyGrid(unittest.TestCase):
+
+    def setUp(self):
+        _, _, self.obstacles = generate_scene(12, 6, concave_fraction=0.5, seed=1)
+        self.grid = rasterize_obstacles(self.obstacles, 100, 100, 2.5)
+
+    def test_rasterize_obstacles(self):
+        self.assertEqual(self.grid.shape, (40, 40))
+        blocked = ~self.grid.free.reshape(42, 42)[1:-1, 1:-1]
+        for row in range(40):
+            for column in range(40):
+                cell = box(column * 2.5, row * 2.5, (column + 1) * 2.5, (row + 1) * 2.5)
+                expected = any(cell.relate_pattern(obstacle, 'T********')
+                               for obstacle in self.obstacles)
+                self.assertEqual(blocked[row, column], expected, (row, column))
+
+        # Cells only touching an obstacle stay free
+        grid = rasterize_obstacles([Polygon([(2, 2), (4, 2), (4, 4), (2, 4)])], 10, 5, 1.0)
+        self.assertEqual(grid.shape, (5, 10))
+        blocked = ~grid.free.reshape(7, 12)[1:-1, 1:-1]
+        self.assertEqual(np.argwhere(blocked).tolist(), [[2, 2], [2, 3], [3, 2], [3, 3]])
+        with self.assertRaises(ValueError):
+            rasterize_obstacles(self.obstacles, 100, 100, 0)
+
+    def test_free_segments_do_not_cross_obstacles(self):
+        rng = random.Random(0)
+        free = 0
+        for _ in range(500):
+            start = np.array([rng.uniform(0, 100), rng.uniform(0, 100)])
+            end = np.array([rng.uniform(0, 100), rng.uniform(0, 100)])
+            if self.grid.is_segment_free(start, end):
+                free += 1
+                self.assertFalse(is_line_crossing_obstacles([start, end], self.obstacles))
+        self.assertGreater(free, 0)
+
+        # Segments along an obstacle edge and grid line pass
+        grid = rasterize_obstacles([Polygon([(2, 2), (4, 2), (4, 4), (2, 4)])], 10, 10, 1.0)
+        self.assertTrue(grid.is_segment_free(np.array([0.0, 4.0]), np.array([10.0, 4.0])))
+        self.assertTrue(grid.is_segment_free(np.array([0.0, 2.0]), np.array([10.0, 2.0])))
+        self.assertFalse(grid.is_segment_free(np.array([0.0, 3.0]), np.array([10.0, 3.0])))
+
+
+if __name__ == '__main__':
+    unittest.main()
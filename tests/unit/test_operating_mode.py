@@ -52,6 +52,27 @@ max_acceleration: 12.0
             obstacle_course.strategy, FastestPathStrategy)
         os.remove('tests/config.yaml')
 
+    def test_operating_with_sweep_graph_builder(self):
+        with open('tests/config.yaml', 'w') as f:
+            f.write("""
+x_start: 2
+y_start: 2
+x_goal: 55
+y_goal: 35
+x_space_size: 100
+y_space_size: 100
+list_obstacles: [
+    [[20,20], [20,80], [80,80], [80,20], [40,20], [40,60], [50,60], [50,30], [60,30], [60,70], [30,70], [30,20]]
+]
+graph_builder: sweep
+        """)
+        config = Configuration('tests/config.yaml')
+        obstacle_course = ObstacleCourse(config)
+        self.assertEqual(obstacle_course.graph_builder, 'sweep')
+        self.assertEqual(obstacle_course.find_path(), [
+                         [2.0, 2.0], [30.0, 20.0], [40.0, 60.0], [50.0, 60.0], [55.0, 35.0]])
+        os.remove('tests/config.yaml')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+
+from pathfind.path_strategy import FastestPathStrategy, ShortestPathStrategy
+from utils.compact_graph import CompactGraph
+
+
+class TestPathStrategy(unittest.TestCase):
+
+    def test_vectorized_travel_costs_match_scalar_costs(self):
+        distances = np.array([0.0, 0.5, 1.0, 3.0, 42.0, 141.42])
+        for strategy in (ShortestPathStrategy(), FastestPathStrategy()):
+            costs = strategy.calculate_travel_costs(distances, 1.0, 12.0)
+            for distance, cost in zip(distances, costs):
+                self.assertAlmostEqual(cost, strategy.calculate_travel_cost(
+                    (0, 0), (distance, 0), 1.0, 12.0))
+
+    def test_prepare_graph_caches_costs(self):
+        graph = CompactGraph.from_edges([(0, 0), (3, 4), (3, 10)], [0, 1], [1, 2])
+        strategy = FastestPathStrategy()
+
+        costs = strategy.prepare_graph(graph, 1.0, 2.0)
+        self.assertEqual(costs.tolist(), strategy.calculate_travel_costs(
+            graph.weights, 1.0, 2.0).tolist())
+        self.assertAlmostEqual(costs[0], strategy.calculate_travel_cost(
+            (0, 0), (3, 4), 1.0, 2.0))
+
+        # The costs are only recomputed when the parameters change
+        self.assertIs(strategy.prepare_graph(graph, 1.0, 2.0), costs)
+        self.assertIsNot(strategy.prepare_graph(graph, 1.0, 3.0), costs)
+
+        self.assertIs(ShortestPathStrategy().prepare_graph(graph), graph.weights)
+
+    def test_vectorized_heuristics_match_scalar_heuristics(self):
+        points = np.array([[0.0, 0.0], [3.0, 4.0], [98.0, 98.0], [10.5, 70.25]])
+        goal = (98, 98)
+        for strategy in (ShortestPathStrategy(), FastestPathStrategy()):
+            estimates = strategy.heuristics(points, goal, 1.0, 12.0)
+            for point, estimate in zip(points.tolist(), estimates):
+                self.assertAlmostEqual(estimate, strategy.heuristic(point, goal, 1.0, 12.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+import unittest
+
+from shapely.geometry import Polygon
+
+from pathfind.path_strategy import FastestPathStrategy, ShortestPathStrategy
+from pathfind.pathfinder import Pathfinder
+from utils.graph_factory import build_obstacle_graph, create_graph, link_endpoints
+
+
+def path_cost(strategy, path, mass, max_acceleration):
+    return sum(strategy.calculate_travel_cost(tuple(a), tuple(b), mass, max_acceleration)
+               for a, b in zip(path, path[1:]))
+
+
+class TestPathfinder(unittest.TestCase):
+
+    def setUp(self):
+        self.start = (2, 2)
+        self.goal = (55, 35)
+        self.obstacles = obstacles = [
+            Polygon([(20, 20), (20, 80), (80, 80), (80, 20), (40, 20), (40, 60),
+                     (50, 60), (50, 30), (60, 30), (60, 70), (30, 70), (30, 20)]),
+            Polygon([(5, 5), (10, 5), (8, 12)]),
+        ]
+        self.graph = create_graph(
+            self.start, self.goal, obstacles, 100, 100)
+
+    def test_astar_finds_optimal_path_with_fewer_expansions(self):
+        for strategy in (ShortestPathStrategy(), FastestPathStrategy()):
+            dijkstra = Pathfinder(strategy, 'dijkstra')
+            astar = Pathfinder(strategy, 'astar')
+            expected = dijkstra.find_path(
+                self.graph, self.start, self.goal, 1.0, 12.0)
+            actual = astar.find_path(
+                self.graph, self.start, self.goal, 1.0, 12.0)
+            self.assertEqual(actual[0], list(map(float, self.start)))
+            self.assertEqual(actual[-1], list(map(float, self.goal)))
+            self.assertAlmostEqual(path_cost(strategy, actual, 1.0, 12.0),
+                                   path_cost(strategy, expected, 1.0, 12.0))
+            self.assertGreater(astar.nodes_expanded, 0)
+            self.assertLessEqual(astar.nodes_expanded,
+                                 dijkstra.nodes_expanded)
+
+    def test_bidirectional_search_finds_optimal_path(self):
+        for strategy in (ShortestPathStrategy(), FastestPathStrategy()):
+            expected = Pathfinder(strategy).find_path(
+                self.graph, self.start, self.goal, 1.0, 12.0)
+            for algorithm in ('bidirectional_dijkstra', 'bidirectional_astar'):
+                pathfinder = Pathfinder(strategy, algorithm)
+                actual = pathfinder.find_path(
+                    self.graph, self.start, self.goal, 1.0, 12.0)
+                self.assertEqual(actual[0], list(map(float, self.start)))
+                self.assertEqual(actual[-1], list(map(float, self.goal)))
+                self.assertAlmostEqual(path_cost(strategy, actual, 1.0, 12.0),
+                                       path_cost(strategy, expected, 1.0, 12.0))
+                self.assertGreater(pathfinder.nodes_expanded, 0)
+                # Searching backwards from the goal finds the reversed path
+                reverse = pathfinder.find_path(
+                    self.graph, self.goal, self.start, 1.0, 12.0)
+                self.assertAlmostEqual(path_cost(strategy, reverse, 1.0, 12.0),
+                                       path_cost(strategy, expected, 1.0, 12.0))
+
+    def test_bidirectional_search_without_path(self):
+        graph = create_graph((2, 2), (50, 50), [Polygon([(40, 40), (60, 40), (60, 60), (40, 60)])],
+                             100, 100)
+        pathfinder = Pathfinder(ShortestPathStrategy(), 'bidirectional_astar')
+        with self.assertRaises(Exception):
+            pathfinder.find_path(graph, (2, 2), (50, 50), 1.0, 12.0)
+        self.assertEqual(pathfinder.find_path(graph, (2, 2), (2, 2), 1.0, 12.0), [[2.0, 2.0]])
+
+    def test_alt_search_finds_optimal_path(self):
+        base = build_obstacle_graph(self.obstacles, 100, 100)
+        for strategy in (ShortestPathStrategy(), FastestPathStrategy()):
+            dijkstra = Pathfinder(strategy)
+            alt = Pathfinder(strategy, 'alt')
+            index = alt.prepare_landmarks(base, 1.0, 12.0, landmark_count=4)
+            self.assertEqual(index.distances.shape, (4, base.number_of_nodes()))
+            for start, goal in ((self.start, self.goal), (self.goal, (95, 5)), ((20, 20), (2, 2))):
+                graph = link_endpoints(base, [start, goal], self.obstacles)
+                expected = dijkstra.find_path(graph, start, goal, 1.0, 12.0)
+                actual = alt.find_path(graph, start, goal, 1.0, 12.0)
+                self.assertAlmostEqual(path_cost(strategy, actual, 1.0, 12.0),
+                                       path_cost(strategy, expected, 1.0, 12.0))
+                self.assertLessEqual(alt.nodes_expanded, dijkstra.nodes_expanded)
+                # The index is reused by every graph linked from the indexed one
+                self.assertIs(alt.landmark_index, index)
+
+            # A graph with more linked points gets no landmark bounds
+            graph = link_endpoints(base, [self.start, self.goal, (95, 5)], self.obstacles)
+            edge_costs = strategy.prepare_graph(graph, 1.0, 12.0)
+            self.assertIsNone(index.lower_bounds(graph, graph.node_id(self.start),
+                                                 graph.node_id(self.goal), edge_costs))
+
+    def test_heuristics_are_admissible(self):
+        for strategy in (ShortestPathStrategy(), FastestPathStrategy()):
+            path = Pathfinder(strategy).find_path(
+                self.graph, self.start, self.goal, 1.0, 12.0)
+            remaining = 0
+            for node, following in reversed(list(zip(path, path[1:]))):
+                remaining += strategy.calculate_travel_cost(
+                    tuple(node), tuple(following), 1.0, 12.0)
+                self.assertLessEqual(strategy.heuristic(
+                    tuple(node), self.goal, 1.0, 12.0), remaining + 1e-9)
+
+    def test_find_paths_from_matches_find_path(self):
+        goals = [self.goal, (80, 80), (8, 12), (200, 200)]
+        for strategy in (ShortestPathStrategy(), FastestPathStrategy()):
+            pathfinder = Pathfinder(strategy)
+            costs, paths = pathfinder.find_paths_from(
+                self.graph, self.start, goals, 1.0, 12.0)
+            self.assertEqual(len(paths), len(goals))
+            for goal, cost, path in zip(goals[:3], costs, paths):
+                expected = pathfinder.find_path(
+                    self.graph, self.start, goal, 1.0, 12.0)
+                self.assertAlmostEqual(cost, path_cost(strategy, expected, 1.0, 12.0))
+                self.assertAlmostEqual(path_cost(strategy, path, 1.0, 12.0), cost)
+            # A goal that is not a node of the graph is unreachable
+            self.assertEqual(costs[-1], float('inf'))
+            self.assertIsNone(paths[-1])
+            self.assertEqual(list(pathfinder.find_costs_from(
+                self.graph, self.start, goals, 1.0, 12.0)), list(costs))
+
+    def test_queue_counters(self):
+        for algorithm in ('dijkstra', 'astar', 'bidirectional_dijkstra', 'alt'):
+            pathfinder = Pathfinder(ShortestPathStrategy(), algorithm)
+            pathfinder.find_path(self.graph, self.start, self.goal, 1.0, 12.0)
+            self.assertGreater(pathfinder.nodes_expanded, 0)
+            self.assertGreaterEqual(pathfinder.nodes_popped, pathfinder.nodes_expanded)
+            self.assertGreaterEqual(pathfinder.nodes_pushed, pathfinder.nodes_popped)
+
+    def test_anytime_search_bounds_the_path_cost(self):
+        for strategy in (ShortestPathStrategy(), FastestPathStrategy()):
+            for algorithm in ('astar', 'alt'):
+                pathfinder = Pathfinder(strategy, algorithm)
+                optimal = path_cost(strategy, pathfinder.find_path(
+                    self.graph, self.start, self.goal, 1.0, 12.0), 1.0, 12.0)
+
+                path, bound = pathfinder.find_path_anytime(
+                    self.graph, self.start, self.goal, 1.0, 12.0, time_budget=10.0)
+                self.assertEqual(bound, 1.0)
+                self.assertAlmostEqual(path_cost(strategy, path, 1.0, 12.0), optimal)
+                self.assertGreater(pathfinder.anytime_iterations, 1)
+                self.assertGreaterEqual(pathfinder.nodes_popped, pathfinder.nodes_expanded)
+                self.assertGreaterEqual(pathfinder.nodes_pushed, pathfinder.nodes_popped)
+
+                # Every budget large enough for a first path bounds its cost
+                found = 0
+                for budget in range(1, pathfinder.nodes_expanded + 1):
+                    try:
+                        path, bound = pathfinder.find_path_anytime(
+                            self.graph, self.start, self.goal, 1.0, 12.0, expansion_budget=budget)
+                    except Exception:
+                        self.assertEqual(found, 0)
+                        continue
+                    found += 1
+                    self.assertLessEqual(pathfinder.nodes_expanded, budget)
+                    self.assertEqual(path[0], list(map(float, self.start)))
+                    self.assertEqual(path[-1], list(map(float, self.goal)))
+                    self.assertGreaterEqual(bound, 1.0)
+                    self.assertLessEqual(path_cost(strategy, path, 1.0, 12.0), optimal * bound + 1e-9)
+                self.assertGreater(found, 0)
+                self.assertEqual(bound, 1.0)
+
+    def test_anytime_search_without_path(self):
+        pathfinder = Pathfinder(ShortestPathStrategy(), 'astar')
+        with self.assertRaises(Exception):
+            pathfinder.find_path_anytime(self.graph, self.start, (120, 120), None, None)
+        with self.assertRaises(ValueError):
+            pathfinder.find_path_anytime(self.graph, self.start, self.goal, None, None, time_budget=0)
+        with self.assertRaises(ValueError):
+            pathfinder.find_path_anytime(self.graph, self.start, self.goal, None, None,
+                                         expansion_budget=0)
+        with self.assertRaises(ValueError):
+            pathfinder.find_path_anytime(self.graph, self.start, self.goal, None, None,
+                                         initial_weight=0.5)
+
+    def test_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            Pathfinder(ShortestPathStrategy(), 'unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import unittest
+
+from pathfind.configuration import Configuration
+from utils.scene_generator import generate_scene, write_scene_config
+
+
+class TestSceneGenerator(unittest.TestCase):
+
+    def tearDown(self):
+        if os.path.exists('tests/generated.yaml'):
+            os.remove('tests/generated.yaml')
+
+    def test_scenes_are_seeded(self):
+        _, _, obstacles = generate_scene(20, seed=3, concave_fraction=0.5)
+        _, _, same = generate_scene(20, seed=3, concave_fraction=0.5)
+        _, _, other = generate_scene(20, seed=4, concave_fraction=0.5)
+        self.assertEqual([o.wkt for o in obstacles], [o.wkt for o in same])
+        self.assertNotEqual([o.wkt for o in obstacles], [o.wkt for o in other])
+
+    def test_obstacles_are_valid_and_disjoint(self):
+        _, _, obstacles = generate_scene(50, 6, concave_fraction=0.5)
+        self.assertEqual(len(obstacles), 50)
+        for index, obstacle in enumerate(obstacles):
+            self.assertTrue(obstacle.is_valid)
+            for other in obstacles[index + 1:]:
+                self.assertFalse(obstacle.intersects(other))
+        concave = [obstacle for obstacle in obstacles
+                   if obstacle.convex_hull.area > obstacle.area + 1e-9]
+        self.assertGreater(len(concave), 0)
+        self.assertLess(len(concave), 50)
+
+    def test_vertex_count(self):
+        _, _, obstacles = generate_scene(7, vertex_count=30)
+        counts = [len(obstacle.exterior.coords) - 1 for obstacle in obstacles]
+        self.assertEqual(sum(counts), 30)
+        self.assertLessEqual(max(counts) - min(counts), 1)
+        with self.assertRaises(ValueError):
+            generate_scene(7, vertex_count=20)
+        with self.assertRaises(ValueError):
+            generate_scene(7, 3, concave_fraction=0.5)
+
+    def test_write_scene_config(self):
+        start, goal, obstacles = generate_scene(5, seed=1)
+        write_scene_config('tests/generated.yaml', start, goal, obstacles, graph_builder='indexed')
+        config = Configuration('tests/generated.yaml')
+        self.assertEqual(config.start, start)
+        self.assertEqual(len(config.obstacles), 5)
+        self.assertEqual(config.graph_builder, 'indexed')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import os
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+
+from pathfind.configuration import Configuration
+from pathfind.obstacle_course import ObstacleCourse
+from pathfind.server import PathServer, SceneCache
+
+
+async def request(reader, writer, method, target, payload=None):
+    body = b'' if payload is None else json.dumps(payload).encode()
+    writer.write(f"{method} {target} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) != b'\r\n':
+        name, _, value = line.decode().partition(':')
+        headers[name.lower()] = value.strip()
+    return status, json.loads(await reader.readexactly(int(headers['content-length'])))
+
+
+class TestServer(unittest.TestCase):
+
+    def setUp(self):
+        with open('tests/scene.yaml', 'w') as f:
+            f.write("""
+x_start: 2
+y_start: 2
+x_goal: 98
+y_goal: 98
+x_space_size: 100
+y_space_size: 100
+list_obstacles: [
+    [[20,20], [60,20], [60,60], [20,60]]
+]""")
+        self.scene_paths = {'scene': 'tests/scene.yaml'}
+
+    def test_scene_cache_evicts_least_recently_used(self):
+        scene_cache = SceneCache({'a': 'tests/scene.yaml', 'b': 'tests/scene.yaml',
+                                  'c': 'tests/scene.yaml'}, max_scenes=2)
+        first = scene_cache.get('a')
+        scene_cache.get('b')
+        self.assertIs(scene_cache.get('a'), first)
+        scene_cache.get('c')
+        self.assertEqual(list(scene_cache.obstacle_courses), ['a', 'c'])
+        self.assertIsNotNone(first.obstacle_graph)
+        with self.assertRaises(KeyError):
+            scene_cache.get('unknown')
+
+    def test_answers_queries(self):
+        expected = ObstacleCourse(Configuration('tests/scene.yaml')).find_path_between(
+            [10, 50], [70, 50])
+        self.assertEqual(asyncio.run(self.exchange()), [
+            (200, {'status': 'ok'}),
+            (200, {'scenes': ['scene']}),
+            (200, {'path': expected}),
+            (200, {'path': expected}),
+            (400, {'error': 'Goal point is out of bounds.'}),
+            (404, {'error': "Unknown scene 'other'."}),
+            (405, {'error': 'Use POST.'}),
+        ])
+
+    async def exchange(self):
+        server = PathServer(self.scene_paths, workers=1)
+        listener = await server.start('127.0.0.1', 0)
+        try:
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            query = {'start': [10, 50], 'goal': [70, 50]}
+            responses = [
+                await request(reader, writer, 'GET', '/health'),
+                await request(reader, writer, 'GET', '/scenes'),
+            ]
+            # Concurrent queries on separate connections
+            connections = [await asyncio.open_connection('127.0.0.1', port) for _ in range(2)]
+            responses += await asyncio.gather(*(
+                request(*connection, 'POST', '/scenes/scene/path', query)
+                for connection in connections))
+            responses += [
+                await request(reader, writer, 'POST', '/scenes/scene/path',
+                              {'start': [10, 50], 'goal': [170, 50]}),
+                await request(reader, writer, 'POST', '/scenes/other/path', query),
+                await request(reader, writer, 'GET', '/scenes/scene/path'),
+            ]
+            status, error = await request(reader, writer, 'POST', '/scenes/scene/path', {'start': 1})
+            self.assertEqual(status, 400)
+            for _, connection_writer in connections + [(reader, writer)]:
+                connection_writer.close()
+            return responses
+        finally:
+            listener.close()
+            await listener.wait_closed()
+            server.close()
+
+    def test_restarts_crashed_workers(self):
+        expected = ObstacleCourse(Configuration('tests/scene.yaml')).find_path_between(
+            [10, 50], [70, 50])
+        responses = asyncio.run(self.crash_worker())
+        self.assertEqual(responses[0][0], 503)
+        self.assertEqual(responses[1], (200, {'path': expected}))
+
+    async def crash_worker(self):
+        server = PathServer(self.scene_paths, workers=1)
+        listener = await server.start('127.0.0.1', 0)
+        try:
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            crashed = server.executor
+            with self.assertRaises(BrokenProcessPool):
+                await asyncio.wrap_future(crashed.submit(os._exit, 1))
+            query = {'start': [10, 50], 'goal': [70, 50]}
+            responses = [await request(reader, writer, 'POST', '/scenes/scene/path', query)
+                         for _ in range(2)]
+            self.assertIsNot(server.executor, crashed)
+            writer.close()
+            return responses
+        finally:
+            listener.close()
+            await listener.wait_closed()
+            server.close()
+
+    def tearDown(self):
+        if os.path.exists('tests/scene.yaml'):
+            os.remove('tests/scene.yaml')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+
+import numpy as np
+from shapely.geometry import Polygon
+
+from pathfind.path_strategy import FastestPathStrategy, ShortestPathStrategy
+from pathfind.pathfinder import Pathfinder
+from pathfind.tiled_planner import TiledPlanner
+from utils.graph_factory import build_graph
+from utils.obstacle_index import is_line_crossing_obstacles
+from utils.scene_generator import generate_scene
+from utils.tile_map import TileMap
+
+
+def path_cost(strategy, path):
+    return sum(strategy.calculate_travel_cost(a, b, 1.0, 12.0) for a, b in zip(path, path[1:]))
+
+
+class TestTileMap(unittest.TestCase):
+
+    def test_portals(self):
+        square = Polygon([(40, 10), (60, 10), (60, 30), (40, 30)])
+        tile_map = TileMap([square], 100, 100, 50)
+        self.assertEqual(tile_map.shape, (2, 2))
+        self.assertEqual(tile_map.tile_of((99.9, 20)), (0, 1))
+        self.assertEqual(tile_map.tile_of((100, 100)), (1, 1))
+
+        # The obstacle splits the border between the lower tiles into two free intervals
+        portals = tile_map.find_border_portals(('v', 0, 0))
+        self.assertTrue(np.allclose(portals[:, 0], 50))
+        self.assertEqual(sorted(set(portals[:, 1].tolist())),
+                         [0.0, 10.0, 30.0, 40.0, 50.0])
+        self.assertEqual(sorted(tile_map.tiles_of_portal((50.0, 50.0))),
+                         [(0, 0), (0, 1), (1, 0), (1, 1)])
+        self.assertEqual(sorted(tile_map.tiles_of_portal((50.0, 30.0))), [(0, 0), (0, 1)])
+
+    def test_lazy_build_and_eviction(self):
+        tile_map = TileMap([], 100, 100, 25, max_tiles=2)
+        planner = TiledPlanner(Pathfinder(ShortestPathStrategy()))
+        path = planner.find_path(tile_map, (2, 2), (20, 3), None, None)
+        self.assertEqual(path, [[2.0, 2.0], [20.0, 3.0]])
+        self.assertEqual(planner.tiles_built, 1)
+        self.assertEqual(list(tile_map.tiles), [(0, 0)])
+
+        # The path crosses the bottom row only, and the oldest tiles are evicted
+        path = planner.find_path(tile_map, (2, 2), (98, 3), None, None)
+        self.assertEqual(path, [[2.0, 2.0], [98.0, 3.0]])
+        self.assertEqual(planner.tiles_built, 3)
+        self.assertEqual(len(tile_map.tiles), 2)
+        self.assertTrue(all(row == 0 for row, _ in tile_map.tiles))
+
+        with self.assertRaises(ValueError):
+            TileMap([], 100, 100, 0)
+        with self.assertRaises(ValueError):
+            TileMap([], 100, 100, 25, max_tiles=0)
+
+
+class TestTiledPlanner(unittest.TestCase):
+
+    def test_paths_avoid_obstacles(self):
+        start, goal, obstacles = generate_scene(20, 6, concave_fraction=0.25, seed=1)
+        start, goal = tuple(start), tuple(goal)
+        graph = build_graph(start, goal, obstacles, 100, 100, 'vectorized')
+        for strategy in (ShortestPathStrategy(), FastestPathStrategy()):
+            tile_map = TileMap(obstacles, 100, 100, 25)
+            planner = TiledPlanner(Pathfinder(strategy, 'astar'))
+            path = planner.find_path(tile_map, start, goal, 1.0, 12.0)
+            self.assertEqual(path[0], list(map(float, start)))
+            self.assertEqual(path[-1], list(map(float, goal)))
+            for a, b in zip(path, path[1:]):
+                self.assertFalse(is_line_crossing_obstacles([a, b], obstacles))
+
+            optimal = Pathfinder(strategy).find_path(graph, start, goal, 1.0, 12.0)
+            self.assertGreaterEqual(path_cost(strategy, path), path_cost(strategy, optimal) - 1e-9)
+            if isinstance(strategy, ShortestPathStrategy):
+                self.assertLess(path_cost(strategy, path), path_cost(strategy, optimal) * 1.02)
+            self.assertLessEqual(planner.tiles_built, 16)
+            self.assertGreaterEqual(planner.coarse_searches, 1)
+            self.assertGreaterEqual(planner.nodes_pushed, planner.nodes_popped)
+
+            # The tiles are cached, so a second query builds none
+            self.assertEqual(planner.find_path(tile_map, start, goal, 1.0, 12.0), path)
+            self.assertEqual(planner.tiles_built, 0)
+
+    def test_no_path(self):
+        wall = Polygon([(40, 0), (60, 0), (60, 100), (40, 100)])
+        planner = TiledPlanner(Pathfinder(ShortestPathStrategy()))
+        with self.assertRaises(Exception):
+            planner.find_path(TileMap([wall], 100, 100, 25), (2, 2), (98, 98), None, None)